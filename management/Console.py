@@ -6,6 +6,9 @@ from PyQt6.QtWidgets import QPlainTextEdit, QLineEdit
 from Workers import WorkerThread
 from ScannerDriver import ScannerDriver
 from ZebraSerialConfig import ZebraSerialConfig
+from SerialCapture import CaptureReader, CaptureWriter
+from Metrics import Metrics
+from Profiling import ProfileSession
 import traceback
 
 logger = logging.getLogger(__name__)
@@ -167,26 +170,31 @@ class ConsoleCommandHandler(WorkerThread):
         
     def listen_handler(self, *args, **kwargs):
         """
-        Usage: listen <port> [dummy_data]
+        Usage: listen <port> [dummy_data] | listen <capture> [speed]
         Listens on the specified serial port and displays the received data.
         You may also speify a number to listen on a specific port with list_ports.
         Specify dummy_data to simulate data if no serial port is available.
+        Give a capture file (see record) instead to play it back at speed times real time
+        (default 1, 0 for no pacing).
         """
         if len(args) < 1:
-            return "Usage: listen <port> [dummy_data]"
+            return "Usage: listen <port> [dummy_data] | listen <capture> [speed]"
+        port = args[0]
         try:
-            if len(args) > 1:
+            if len(args) > 1 and not os.path.isfile(args[0]):
                 self.port = args[0]
                 while not self.stop_flag:
                     self.signals.result.emit(self.port + ":\t" + ' '.join(args[1:]))
                     time.sleep(1)
+                return
+            if args[0].startswith('$') and len(args[0]) > 1:
+                port = self._resolve_variable(args[0][1:])
+                if port is None:
+                    return f"Variable \"{args[0]}\" not found or is None."
+            self.port = port
+            if isinstance(port, str) and os.path.isfile(port):
+                return self._listen_capture(port, float(args[1]) if len(args) > 1 else 1.0)
             else:
-                port = args[0]
-                if args[0].startswith('$') and len(args[0]) > 1:
-                    port = self._resolve_variable(args[0][1:])
-                    if port is None:
-                        return f"Variable \"{args[0]}\" not found or is None."
-                self.port = port
                 if args[0].isdigit():
                     ports = serial.tools.list_ports.comports()
                     if int(port) > len(ports):
@@ -210,19 +218,74 @@ class ConsoleCommandHandler(WorkerThread):
                 return f"Serial port {port} closed"
         except Exception as e:
             return f"Failed to listen on port \"{port}\"\n" + str(e)
+
+    def _listen_capture(self, path, speed):
+        with CaptureReader(path) as capture:
+            self.signals.result.emit(f"Replaying {capture.protocol} capture \"{path}\"")
+            start = time.monotonic()
+            data = b''
+            for offset, chunk in capture:
+                if self.stop_flag:
+                    break
+                if speed:
+                    delay = start + offset / speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                if capture.protocol == "sr681":
+                    # Binary frames, shown as hex
+                    self.signals.result.emit(chunk.hex(' '))
+                    continue
+                data += chunk
+                *lines, data = data.split(b'\n')
+                for line in lines:
+                    if line.strip():
+                        self.signals.result.emit(line.decode('utf-8', errors="replace"))
+        return f"Capture {path} replayed"
+
+    def record_handler(self, *args, **kwargs):
+        """
+        Usage: record <file> [reader] [seconds]
+        Records the raw data of a scanner reader (default 0) to a capture file, compressed
+        if the name ends with .gz, until stopped with stop_listen or after the given seconds.
+        Captures play back with listen <capture> or a reader of model "replay".
+        """
+        if len(args) < 1:
+            return "Usage: record <file> [reader] [seconds]"
+        scanner = kwargs['application'].scanner
+        reader = int(args[1]) if len(args) > 1 else 0
+        if not 0 <= reader < len(scanner.drivers):
+            return f"Invalid reader: {reader}"
+        driver = scanner.drivers[reader]
+        if not driver.backend.can_record:
+            # Checked before the file is opened, it may be the very capture being replayed
+            return f"Reader {reader} ({driver.backend.protocol}) cannot be recorded"
+        self.port = driver.device
+        capture = CaptureWriter(args[0], driver.backend.protocol, driver.device)
+        try:
+            driver.backend.record(capture)
+        except ValueError as e:
+            capture.close()
+            return str(e)
+        self.signals.result.emit(f"Recording reader {reader} to \"{args[0]}\"")
+        deadline = time.monotonic() + float(args[2]) if len(args) > 2 else None
+        while not self.stop_flag and (deadline is None or time.monotonic() < deadline):
+            time.sleep(0.2)
+        if driver.backend.capture is capture:
+            driver.backend.record(None)
+        return f"Recorded {capture.chunks} chunks ({capture.bytes} bytes) to \"{args[0]}\""
         
     def stop_listen_handler(self, *args, **kwargs):
         """
         Usage: stop_listen [port]
-        Stops listening on the specified serial ports. If no port is provided, stops all listeners.
+        Stops listening (and recording) on the specified serial ports. If no port is provided, stops all listeners.
         """
         if len(args) < 1:
             for worker in kwargs['application'].console.workers:
-                if worker.command == "listen":
+                if worker.command in ("listen", "record"):
                     worker.stop()
             return "Stopped all serial listeners"
         for worker in kwargs['application'].console.workers:
-            if worker.command == "listen":
+            if worker.command in ("listen", "record"):
                 if worker.port in args:
                     worker.stop()
                     self.signals.result.emit(f"Stopped listening on port \"{worker.port}\"")
@@ -242,30 +305,92 @@ class ConsoleCommandHandler(WorkerThread):
         Usage: scan
         Scans the specified device for RFID tags.
         """
-        kwargs['application'].scanner.trigger()
-        return "Triggered scan"
+        triggered = kwargs['application'].scanner.trigger()
+        if not triggered:
+            return "No reader in trigger mode, continuous scanning is running"
+        return f"Triggered scan on {triggered} readers"
+
+    def stats_handler(self, *args, **kwargs):
+        """
+        Usage: stats [prefix]
+        Shows scan cycle and save metrics of the last minute: stage timings (window, parse,
+        filter, emit, signal delivery, result handling), lines (Zebra) or frames (SR681) per second, tags per antenna,
+        tracker table size and Google Sheets push latency. A prefix such as scanner_ or
+        sheets_ limits the output. The same metrics are written to the metrics file.
+        """
+        report = Metrics.instance().report(args[0] if args else "")
+        return report or "No metrics recorded yet"
+
+    def profile_handler(self, *args, **kwargs):
+        """
+        Usage: profile [--memory] <command...> | profile [--memory] scanner [seconds]
+        Runs a console command under cProfile in this command's thread, or profiles the
+        scanner threads of all readers for the given seconds (default 10) without
+        restarting them. Prints the functions with the highest cumulative time and writes
+        a .pstats file to the profiles directory. --memory also traces allocations and
+        writes a .tracemalloc snapshot. Nothing is profiled outside of this command.
+        """
+        memory = "--memory" in args
+        args = [arg for arg in args if arg != "--memory"]
+        if len(args) < 1:
+            return "Usage: profile [--memory] <command...> | profile [--memory] scanner [seconds]"
+        if args[0] == "scanner":
+            session = ProfileSession("scanner", memory)
+            scanner = kwargs['application'].scanner
+            if not scanner.drivers:
+                return "No scanner readers to profile"
+            seconds = float(args[1]) if len(args) > 1 else 10
+            try:
+                session.start()
+            except RuntimeError as e:
+                return str(e)
+            done = scanner.profile(session, seconds)
+            self.signals.result.emit(f"Profiling {len(done)} scanner threads for {seconds:g} s")
+            # Profiling starts with the next scan cycle and ends with the one running at the deadline
+            deadline = time.monotonic() + seconds + 2 * max(driver.scan_time for driver in scanner.drivers) + 5
+            for event in done:
+                event.wait(max(deadline - time.monotonic(), 0))
+            session.stop()
+            if not all(event.is_set() for event in done):
+                self.signals.result.emit("Some scanner threads did not run while profiling")
+        else:
+            if args[0] == "profile":
+                return "Cannot profile the profile command"
+            handler = getattr(self, f"{args[0]}_handler", None)
+            if not callable(handler):
+                return self.error_cmd(args[0])
+            session = ProfileSession(args[0], memory)
+            try:
+                result = session.run(handler, *args[1:], **kwargs)
+            except RuntimeError as e:
+                if session.started is not None:
+                    raise
+                return str(e)
+            if result:
+                self.signals.result.emit(str(result))
+        paths = session.save()
+        return (f"Profile of {' '.join(args)} ({session.elapsed:.2f} s):\n" + session.summary() +
+                "Written to " + ", ".join(paths))
 
     def zebra_conf_handler(self, *args, **kwargs):
         """
-        Usage: zebra_conf
+        Usage: zebra_conf [force]
         Configures the Zebra RFID reader using information specified in zebra.conf file.
+        Skipped while the reader feed is live, unless force is given.
         Will not work if the file is not present.
         """
+        feed_probe = kwargs['application'].scanner.feed_probe
+        if feed_probe is None:
+            return "No Zebra RFID reader configured"
+        if "force" not in args and feed_probe.is_live():
+            return "Zebra RFID reader feed is live, configuration skipped (use zebra_conf force)"
         retried = 0
         while True:
             try:
-                with open("zebra.conf", "r") as f:
-                    config = {}
-                    for line in f:
-                        key, value = line.strip().split('=', 1)
-                        config[key.strip()] = value.strip()
-                    chromedriver_path = config.get('chromedriver_path')
-                    url = config.get('url')
-                    password = config.get('password')
-                zebra_interface = ZebraSerialConfig(chromedriver_path, url, password)
-                self.signals.result.emit("Starting chromedriver...")
+                zebra_interface = ZebraSerialConfig.from_file("zebra.conf")
                 kwargs['application'].update_status("Configuring Zebra RFID reader...")
                 zebra_interface.connect()
+                feed_probe.invalidate()
                 kwargs['application'].update_status("Ready")
                 return "Zebra RFID reader successfully configured"
             except Exception as e:
@@ -284,23 +409,32 @@ class ConsoleCommandHandler(WorkerThread):
         If no drawer number is provided, queries all drawers.
         """
         info = ""
+        scanner = self.kwargs['application'].scanner
         if len(args) < 1:
-            for drawer, trackers in self.kwargs['application'].scanner.trackers.items():
+            for drawer in range(scanner.antenna_count):
                 info += f"Drawer {drawer}:\n"
-                for id, tracker in trackers.items():
-                    info += f"{id}:\t{tracker}\n"
+                info += self._drawer_tags(scanner, drawer)
 
         else:
             try:
                 drawer = int(args[0])
-                if drawer < 0 or drawer >= len(self.kwargs['application'].scanner.trackers):
+                if drawer < 0 or drawer >= scanner.antenna_count:
                     return f"Invalid drawer number: {drawer}"
                 info += f"Drawer {drawer}:\n"
-                for id, tracker in self.kwargs['application'].scanner.trackers[drawer].items():
-                    info += f"{id}:\t{tracker}\n"
+                info += self._drawer_tags(scanner, drawer)
             except ValueError:
                 return f"Invalid drawer number: {args[0]}"
         return info
+
+    def _drawer_tags(self, scanner, drawer):
+        # Trackers hold interned tag IDs, EPCs are only looked up here for display. The
+        # scanner thread keeps freeing and reusing IDs meanwhile, stale ones show as #id
+        lines = ""
+        for tag, tracker in scanner.trackers.items(drawer):
+            epc = scanner.trackers.epc(drawer, tag)
+            epc = f"#{tag}" if epc is None else epc.decode('ascii', errors='replace')
+            lines += f"{epc}:\t{tracker}\n"
+        return lines
             
 
 class Console(object):
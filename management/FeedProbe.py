@@ -0,0 +1,66 @@
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class FeedProbe(object):
+    """
+    Tells whether the reader is already streaming tag frames, so its configuration can
+    be skipped. A probe looks at what the backend received in the last `window` seconds
+    and, if that holds no valid frame, listens for up to `window` more.
+    Results are cached for `ttl` seconds; the scanner refreshes a live result whenever a
+    scan window contains frames, so the feed only counts as silent once nothing arrived
+    for a whole ttl.
+    Parameters:
+        backend (ReaderBackend): open backend of the reader
+        window (float): bounded listening time of a probe, in seconds
+        ttl (float): how long a probe result stays valid, in seconds
+    """
+    def __init__(self, backend, window = 1.5, ttl = 60):
+        self.backend = backend
+        self.window = window
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.result = None
+        self.checked = 0
+
+    def __str__(self):
+        age = time.monotonic() - self.checked
+        return f"FeedProbe(live={self.result}, age={age:.1f} s, ttl={self.ttl} s)"
+
+    def mark_live(self):
+        with self.lock:
+            self.result = True
+            self.checked = time.monotonic()
+
+    def invalidate(self):
+        with self.lock:
+            self.result = None
+
+    def is_live(self):
+        """
+        Returns True if tag frames arrived recently, probing the port if the cached result expired.
+        Blocks for at most `window` seconds.
+        """
+        with self.lock:
+            if self.result is not None and time.monotonic() - self.checked < self.ttl:
+                return self.result
+        live = self._probe()
+        with self.lock:
+            self.result = live
+            self.checked = time.monotonic()
+        logger.info(f"Reader feed {'live' if live else 'silent'}")
+        return live
+
+    def _probe(self):
+        start = time.monotonic()
+        since = start - self.window
+        deadline = start + self.window
+        while True:
+            if self.backend.recent(since):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self.backend.wait_for_data(remaining)
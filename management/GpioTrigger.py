@@ -0,0 +1,179 @@
+import time
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LgpioBackend(object):
+    """
+    GPIO access through lgpio on the Raspberry Pi. lgpio is only imported here,
+    so the rest of the application runs on machines without it.
+    Parameters:
+        chip (int): gpiochip number
+    """
+    def __init__(self, chip = 0):
+        import lgpio
+        self.lgpio = lgpio
+        self.handle = lgpio.gpiochip_open(chip)
+        self.callbacks = []
+
+    def claim_input(self, line, callback, debounce_ms = 0):
+        # callback(line, level) runs in lgpio's alert thread on both edges
+        self.lgpio.gpio_claim_alert(self.handle, line, self.lgpio.BOTH_EDGES)
+        if debounce_ms:
+            self.lgpio.gpio_set_debounce_micros(self.handle, line, int(debounce_ms * 1000))
+        self.callbacks.append(self.lgpio.callback(self.handle, line, self.lgpio.BOTH_EDGES,
+                                                  lambda chip, gpio, level, tick: callback(gpio, level)))
+
+    def claim_output(self, line):
+        self.lgpio.gpio_claim_output(self.handle, line)
+
+    def write(self, line, level):
+        self.lgpio.gpio_write(self.handle, line, level)
+
+    def close(self):
+        for callback in self.callbacks:
+            callback.cancel()
+        self.lgpio.gpiochip_close(self.handle)
+
+
+class MockGpioBackend(object):
+    """
+    In-memory GPIO backend for tests and machines without GPIO: inject() plays an
+    edge on an input line, writes to output lines are recorded with their time.
+    """
+    def __init__(self, chip = 0):
+        self.inputs = {}
+        self.levels = {}
+        self.writes = []        # (monotonic time, line, level)
+
+    def claim_input(self, line, callback, debounce_ms = 0):
+        self.inputs[line] = callback
+        self.levels[line] = 0
+
+    def claim_output(self, line):
+        self.levels[line] = 0
+
+    def write(self, line, level):
+        self.levels[line] = level
+        self.writes.append((time.monotonic(), line, level))
+
+    def inject(self, line, level):
+        if self.levels.get(line) != level:
+            self.levels[line] = level
+            self.inputs[line](line, level)
+
+    def close(self):
+        self.inputs.clear()
+
+
+BACKENDS = {"lgpio": LgpioBackend, "mock": MockGpioBackend}
+
+class GpioTrigger(object):
+    """
+    Decides when a reader scans in trigger mode. An edge on an input line (drawer switch,
+    weight platform) schedules a burst of burst_scans focused scans of the antennas wired
+    to that line; without edges a full background scan runs every background_interval
+    seconds as a fallback. Each scan starts with a pulse on the reader's trigger output.
+    Parameters:
+        backend: GPIO backend, LgpioBackend or MockGpioBackend
+        inputs (dict): input line -> list of antennas it concerns
+        trigger_line (int, optional): output line that starts a read on the reader
+        burst_scans (int): scans per burst, at least the filter window so it settles
+        background_interval (float): seconds between background scans when idle
+        debounce_ms (float): input debounce time
+        pulse_ms (float): length of the trigger pulse
+    """
+    def __init__(self, backend, inputs, trigger_line = 17, burst_scans = 3,
+                 background_interval = 60, debounce_ms = 20, pulse_ms = 1):
+        self.backend = backend
+        self.inputs = {int(line): list(antennas) for line, antennas in inputs.items()}
+        self.trigger_line = trigger_line
+        self.burst_scans = burst_scans
+        self.background_interval = background_interval
+        self.pulse_ms = pulse_ms
+
+        # antenna -> scans left in its burst, guarded by condition
+        self.bursts = {}
+        self.condition = threading.Condition()
+        self.stop_flag = False
+        self.last_scan = time.monotonic()
+        self.edges = 0
+        self.scans = 0
+
+        for line in self.inputs:
+            backend.claim_input(line, self._on_edge, debounce_ms)
+        if trigger_line is not None:
+            backend.claim_output(trigger_line)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Creates the trigger from a reader's "trigger" setting:
+        {"backend": "lgpio"|"mock", "chip": 0, "inputs": {"<line>": [antennas]}, "output": 17,
+         "burst_scans": 3, "background_interval": 60, "debounce_ms": 20}
+        """
+        backend = BACKENDS[config.get("backend", "lgpio")](config.get("chip", 0))
+        return cls(backend, config.get("inputs", {}),
+                   trigger_line = config.get("output", 17),
+                   burst_scans = config.get("burst_scans", 3),
+                   background_interval = config.get("background_interval", 60),
+                   debounce_ms = config.get("debounce_ms", 20))
+
+    def __str__(self):
+        return f"GpioTrigger(inputs={self.inputs}, edges={self.edges}, scans={self.scans}, bursts={self.bursts})"
+
+    def _on_edge(self, line, level):
+        # Opening and closing both matter: the burst follows the drawer until it settled
+        self.request(self.inputs.get(line, []))
+        self.edges += 1
+
+    def request(self, antennas = None):
+        """
+        Schedules a burst for the given antennas, all of them if None.
+        """
+        with self.condition:
+            for antenna in (antennas if antennas is not None else [None]):
+                self.bursts[antenna] = self.burst_scans
+            self.condition.notify_all()
+
+    def wait(self):
+        """
+        Blocks until the next scan is due and returns the antennas to scan,
+        None for a full scan, or an empty set once stopped.
+        """
+        with self.condition:
+            while not self.stop_flag:
+                if self.bursts:
+                    focus = set(self.bursts)
+                    for antenna in focus:
+                        self.bursts[antenna] -= 1
+                        if self.bursts[antenna] <= 0:
+                            del self.bursts[antenna]
+                    self.last_scan = time.monotonic()
+                    self.scans += 1
+                    return None if None in focus else focus
+                remaining = self.last_scan + self.background_interval - time.monotonic()
+                if remaining <= 0:
+                    self.last_scan = time.monotonic()
+                    self.scans += 1
+                    return None
+                self.condition.wait(remaining)
+            return set()
+
+    def pulse(self):
+        # Starts a read on the reader
+        if self.trigger_line is None:
+            return
+        self.backend.write(self.trigger_line, 1)
+        time.sleep(self.pulse_ms / 1000)
+        self.backend.write(self.trigger_line, 0)
+
+    def stop(self):
+        with self.condition:
+            self.stop_flag = True
+            self.condition.notify_all()
+
+    def close(self):
+        self.stop()
+        self.backend.close()
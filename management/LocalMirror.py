@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class LocalMirror(object):
+    """
+    Local persistent copy of a Google Sheet, stored in SQLite in WAL mode.
+    Two tables are kept per sheet:
+        cells:   last known remote content, in raw sheet coordinates (header row and column included)
+        journal: local edits not yet confirmed by Google Sheets, in table coordinates
+                 (row, column of table_current_state), one entry per cell holding its latest value
+    The application loads from the mirror at startup, so it does not need the network
+    to show the table, and replays the journal once Google Sheets is reachable again.
+    Parameters:
+        spreadsheet_id (str): Google Sheet document ID
+        sheet_name (str): sheet within the document
+        path (str): SQLite database file
+    """
+    def __init__(self, spreadsheet_id, sheet_name, path = "sheet_mirror.db"):
+        self.sheet = f"{spreadsheet_id}/{sheet_name}"
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS cells (
+                    sheet TEXT, row INTEGER, col INTEGER, value TEXT,
+                    PRIMARY KEY (sheet, row, col)) WITHOUT ROWID""")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS journal (
+                    sheet TEXT, row INTEGER, col INTEGER, value TEXT, modified REAL,
+                    PRIMARY KEY (sheet, row, col)) WITHOUT ROWID""")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS sync (
+                    sheet TEXT PRIMARY KEY, fetched REAL)""")
+
+    def __str__(self):
+        return f"LocalMirror({self.path}, {self.sheet})"
+
+    def load(self):
+        """
+        Returns the mirrored sheet as a list of rows like fetch_sheets, or None if it was never synced.
+        """
+        with self.lock:
+            fetched = self.connection.execute(
+                "SELECT fetched FROM sync WHERE sheet = ?", (self.sheet,)).fetchone()
+            if fetched is None:
+                return None
+            cells = self.connection.execute(
+                "SELECT row, col, value FROM cells WHERE sheet = ? ORDER BY row, col", (self.sheet,)).fetchall()
+        data = []
+        for row, col, value in cells:
+            while len(data) <= row:
+                data.append([])
+            data[row].extend([""] * (col + 1 - len(data[row])))
+            data[row][col] = value
+        return data
+
+    def last_synced(self):
+        with self.lock:
+            fetched = self.connection.execute(
+                "SELECT fetched FROM sync WHERE sheet = ?", (self.sheet,)).fetchone()
+        return fetched[0] if fetched else None
+
+    def store(self, data):
+        """
+        Replaces the mirrored remote content with freshly fetched sheet rows.
+        """
+        cells = [(self.sheet, r, c, value) for r, row in enumerate(data) for c, value in enumerate(row)]
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM cells WHERE sheet = ?", (self.sheet,))
+            self.connection.executemany("INSERT INTO cells VALUES (?, ?, ?, ?)", cells)
+            self.connection.execute("INSERT OR REPLACE INTO sync VALUES (?, ?)", (self.sheet, time.time()))
+
+    def journal(self, cells: dict):
+        """
+        Records local edits {(row, column): value} of table cells that still have to reach the sheet,
+        in a single database transaction.
+        """
+        modified = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO journal VALUES (?, ?, ?, ?, ?)",
+                                        [(self.sheet, row, column, value, modified) for (row, column), value in cells.items()])
+
+    def pending(self):
+        """
+        Returns the journaled edits as {(row, column): value}.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT row, col, value FROM journal WHERE sheet = ?", (self.sheet,)).fetchall()
+        return {(row, col): value for row, col, value in rows}
+
+    def acknowledge(self, deltas: dict):
+        """
+        Marks pushed edits as synced: the mirrored remote cells take the pushed values and
+        journal entries are removed unless the cell was edited again in the meantime.
+        """
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO cells VALUES (?, ?, ?, ?)",
+                [(self.sheet, row + 1, column + 1, value) for (row, column), value in deltas.items()])
+            self.connection.executemany(
+                "DELETE FROM journal WHERE sheet = ? AND row = ? AND col = ? AND value = ?",
+                [(self.sheet, row, column, value) for (row, column), value in deltas.items()])
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
@@ -0,0 +1,224 @@
+import os
+import bisect
+import threading
+import time
+
+def exponential_bounds(start, factor, count):
+    return [start * factor ** i for i in range(count)]
+
+# 10 us .. ~170 s, for durations in seconds
+SECONDS = exponential_bounds(1e-5, 2, 25)
+# 1 .. ~1M, for sizes and counts
+COUNTS = exponential_bounds(1, 2, 21)
+
+def _key(name, labels):
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _label_text(labels, extra = ()):
+    labels = tuple(labels) + tuple(extra)
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}" if labels else ""
+
+def _format(value):
+    return repr(float(value)) if value != int(value) or abs(value) >= 1e15 else str(int(value))
+
+
+class RollingHistogram(object):
+    """
+    Histogram over fixed bucket bounds, kept both cumulatively (for the exposition
+    file) and over a rolling window of `slots` x `slot_seconds` (for percentiles of
+    recent behavior). observe() is one bisect and a few additions under a lock, so
+    it can sit on every scan cycle.
+    Parameters:
+        bounds (list): increasing bucket upper bounds, values above the last one go to +Inf
+        slots (int): number of rolling slots
+        slot_seconds (float): length of a slot
+    """
+    def __init__(self, bounds = SECONDS, slots = 6, slot_seconds = 10):
+        self.bounds = list(bounds)
+        self.slot_seconds = slot_seconds
+        self.lock = threading.Lock()
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        # Per slot: [epoch, bucket counts, sum, count, max]
+        self.slots = [[-1, [0] * (len(self.bounds) + 1), 0.0, 0, 0.0] for _ in range(slots)]
+
+    def observe(self, value, now = None):
+        bucket = bisect.bisect_left(self.bounds, value)
+        epoch = int((time.monotonic() if now is None else now) / self.slot_seconds)
+        with self.lock:
+            self.counts[bucket] += 1
+            self.sum += value
+            self.count += 1
+            slot = self.slots[epoch % len(self.slots)]
+            if slot[0] != epoch:
+                slot[0], slot[1], slot[2], slot[3], slot[4] = epoch, [0] * len(self.counts), 0.0, 0, value
+            slot[1][bucket] += 1
+            slot[2] += value
+            slot[3] += 1
+            slot[4] = max(slot[4], value)
+
+    def window(self, now = None):
+        """
+        Returns (bucket counts, sum, count, max) over the rolling window.
+        """
+        epoch = int((time.monotonic() if now is None else now) / self.slot_seconds)
+        counts, total, count, maximum = [0] * len(self.counts), 0.0, 0, 0.0
+        with self.lock:
+            for slot in self.slots:
+                if epoch - len(self.slots) < slot[0] <= epoch:
+                    counts = [a + b for a, b in zip(counts, slot[1])]
+                    total += slot[2]
+                    count += slot[3]
+                    maximum = max(maximum, slot[4])
+        return counts, total, count, maximum
+
+    def summary(self, now = None):
+        """
+        Returns {"count", "mean", "p50", "p90", "p99", "max"} over the rolling window,
+        percentiles being bucket upper bounds capped by the window maximum.
+        """
+        counts, total, count, maximum = self.window(now)
+        result = {"count": count, "mean": total / count if count else 0.0, "max": maximum}
+        for name, quantile in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+            rank, seen, value = quantile * count, 0, 0.0
+            for bucket, bucket_count in enumerate(counts):
+                seen += bucket_count
+                if count and seen >= rank:
+                    value = min(self.bounds[bucket], maximum) if bucket < len(self.bounds) else maximum
+                    break
+            result[name] = value
+        return result
+
+    def exposition(self, name, labels):
+        with self.lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip(self.bounds + [float("inf")], counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else f"{bound:.6g}"
+            lines.append(f"{name}_bucket{_label_text(labels, (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_label_text(labels)} {_format(total)}")
+        lines.append(f"{name}_count{_label_text(labels)} {count}")
+        return lines
+
+
+class Counter(object):
+    """
+    Monotonic total, with the rate over the last `window` seconds for the console.
+    """
+    def __init__(self, window = 60):
+        self.lock = threading.Lock()
+        self.value = 0
+        self.rate_window = RollingHistogram([], slots = 6, slot_seconds = window / 6)
+
+    def inc(self, amount = 1):
+        with self.lock:
+            self.value += amount
+        self.rate_window.observe(amount)
+
+    def rate(self, now = None):
+        now = time.monotonic() if now is None else now
+        _, total, _, _ = self.rate_window.window(now)
+        span = self.rate_window.slot_seconds * len(self.rate_window.slots)
+        return total / span
+
+
+class Gauge(object):
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+
+class Metrics(object):
+    """
+    Process wide registry of named metrics with optional labels, e.g.
+        Metrics.instance().histogram("scanner_filter_seconds", reader=0).observe(dt)
+    Metrics are created on first use; the same name and labels always return the same object.
+    Thread-safe. Use Metrics.instance() instead of constructing it directly.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}       # (name, labels) -> metric
+        self.started = time.monotonic()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _get(self, kind, name, labels, *args):
+        key = _key(name, labels)
+        metric = self.metrics.get(key)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.setdefault(key, kind(*args))
+        return metric
+
+    def histogram(self, name, bounds = SECONDS, **labels):
+        return self._get(RollingHistogram, name, labels, bounds)
+
+    def counter(self, name, **labels):
+        return self._get(Counter, name, labels)
+
+    def gauge(self, name, **labels):
+        return self._get(Gauge, name, labels)
+
+    def items(self, prefix = ""):
+        with self.lock:
+            return sorted((key, metric) for key, metric in self.metrics.items() if key[0].startswith(prefix))
+
+    def report(self, prefix = ""):
+        """
+        Human readable summary for the console: rolling percentiles of histograms,
+        totals and rates of counters, current gauge values.
+        """
+        lines = []
+        for (name, labels), metric in self.items(prefix):
+            label = _label_text(labels)
+            if isinstance(metric, RollingHistogram):
+                s = metric.summary()
+                if name.endswith("_seconds"):
+                    lines.append(f"{name}{label}: n={s['count']} mean={s['mean'] * 1e3:.2f} ms p50={s['p50'] * 1e3:.2f} "
+                                 f"p90={s['p90'] * 1e3:.2f} p99={s['p99'] * 1e3:.2f} max={s['max'] * 1e3:.2f} ms")
+                else:
+                    lines.append(f"{name}{label}: n={s['count']} mean={s['mean']:.1f} p50={s['p50']:g} "
+                                 f"p90={s['p90']:g} p99={s['p99']:g} max={s['max']:g}")
+            elif isinstance(metric, Counter):
+                lines.append(f"{name}{label}: {metric.value} ({metric.rate():.1f}/s)")
+            else:
+                lines.append(f"{name}{label}: {metric.value}")
+        return "\n".join(lines)
+
+    def exposition(self):
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        lines, typed = [], set()
+        for (name, labels), metric in self.items():
+            kind = "histogram" if isinstance(metric, RollingHistogram) else \
+                   "counter" if isinstance(metric, Counter) else "gauge"
+            if name not in typed:
+                lines.append(f"# TYPE {name} {kind}")
+                typed.add(name)
+            if isinstance(metric, RollingHistogram):
+                lines.extend(metric.exposition(name, labels))
+            else:
+                lines.append(f"{name}{_label_text(labels)} {_format(metric.value)}")
+        lines.append(f"# TYPE process_uptime_seconds gauge")
+        lines.append(f"process_uptime_seconds {_format(round(time.monotonic() - self.started, 3))}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        # Written next to the target and renamed, a scraper never sees a partial file
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as f:
+            f.write(self.exposition())
+        os.replace(temporary, path)
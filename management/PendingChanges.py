@@ -0,0 +1,99 @@
+import time
+from PyQt6 import QtCore
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
+                             QTableWidgetItem, QPushButton, QHeaderView, QAbstractItemView)
+
+class PendingChangesPanel(QDockWidget):
+    """
+    Non-modal panel collecting detected drawer changes until someone reviews them.
+    Repeated changes of a drawer are merged into its latest count, and a drawer whose
+    count went back to the table value drops out. Changes are accepted or rejected in
+    batches; each accepted batch is emitted once so it becomes a single write.
+    Parameters:
+        parent (QWidget, optional): main window the panel docks into
+    """
+    accepted = QtCore.pyqtSignal(dict)      # {drawer: count}
+    rejected = QtCore.pyqtSignal(dict)
+
+    COLUMNS = ("Drawer", "Table", "Detected", "Updates", "Last seen")
+
+    def __init__(self, parent = None):
+        super().__init__("Pending inventory changes", parent)
+        self.setObjectName("pendingChangesDock")
+        self.changes = {}       # drawer -> [table value, detected count, updates, last seen]
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+        self.accept_selected_button = QPushButton("Accept selected")
+        self.accept_all_button = QPushButton("Accept all")
+        self.reject_all_button = QPushButton("Reject all")
+        self.accept_selected_button.clicked.connect(self.accept_selected)
+        self.accept_all_button.clicked.connect(self.accept_all)
+        self.reject_all_button.clicked.connect(self.reject_all)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.accept_selected_button)
+        buttons.addWidget(self.accept_all_button)
+        buttons.addWidget(self.reject_all_button)
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+        content = QWidget()
+        content.setLayout(layout)
+        self.setWidget(content)
+        self._refresh()
+
+    def __len__(self):
+        return len(self.changes)
+
+    def add(self, changes: dict, table_values: dict):
+        """
+        Merges detected {drawer: count} changes, table_values holding each drawer's current table value.
+        """
+        now = time.time()
+        for drawer, count in changes.items():
+            count, table_value = str(count), table_values.get(drawer)
+            if count == table_value:
+                # Back to what the table already says, nothing to review anymore
+                self.changes.pop(drawer, None)
+                continue
+            entry = self.changes.setdefault(drawer, [table_value, count, 0, now])
+            entry[0], entry[1], entry[2], entry[3] = table_value, count, entry[2] + 1, now
+        self._refresh()
+
+    def accept_selected(self):
+        drawers = {int(self.table.item(index.row(), 0).text()) for index in self.table.selectionModel().selectedRows()}
+        self._take(drawers, self.accepted)
+
+    def accept_all(self):
+        self._take(set(self.changes), self.accepted)
+
+    def reject_all(self):
+        self._take(set(self.changes), self.rejected)
+
+    def _take(self, drawers, signal):
+        batch = {drawer: self.changes.pop(drawer)[1] for drawer in drawers if drawer in self.changes}
+        self._refresh()
+        if batch:
+            signal.emit(batch)
+
+    def _refresh(self):
+        self.table.setRowCount(len(self.changes))
+        for row, drawer in enumerate(sorted(self.changes)):
+            table_value, count, updates, last_seen = self.changes[drawer]
+            values = (drawer, "" if table_value is None else table_value, count, updates, time.strftime("%H:%M:%S", time.localtime(last_seen)))
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+        has_changes = bool(self.changes)
+        self.accept_selected_button.setEnabled(has_changes)
+        self.accept_all_button.setEnabled(has_changes)
+        self.reject_all_button.setEnabled(has_changes)
+        self.setWindowTitle(f"Pending inventory changes ({len(self.changes)})" if has_changes else "Pending inventory changes")
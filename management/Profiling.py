@@ -0,0 +1,128 @@
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+
+# Up to Python 3.11 cProfile only sees the thread that enables it. From 3.12 on it is
+# interpreter-wide, and enabling a second profiler raises ValueError.
+PER_THREAD = sys.version_info < (3, 12)
+
+# Only one session profiles at a time
+_active = threading.Lock()
+
+class ProfileSession(object):
+    """
+    One on-demand profile: cProfile profilers for the threads taking part and optionally
+    a tracemalloc snapshot of allocations made while the session ran. Up to Python 3.11
+    every profiled thread gets its own profiler and the stats are merged; from 3.12 one
+    session-wide profiler, enabled by start(), sees every thread. Only one session can
+    run at a time, start() raises RuntimeError while another one is running.
+    Nothing is installed until start(), so code that is not being profiled runs at full speed.
+    Parameters:
+        name (str): label of the profiled target, used in file names
+        memory (bool): also trace memory allocations
+        directory (str): where stats and snapshots are written
+    """
+    def __init__(self, name, memory = False, directory = "profiles"):
+        self.name = name
+        self.memory = memory
+        self.directory = directory
+        self.profilers = []
+        self.snapshot = None
+        self.started = None
+        self.elapsed = 0.0
+        self.shared = None      # session-wide profiler, Python 3.12 and later
+
+    def profiler(self):
+        """
+        Returns a new profiler for one thread, enable() and disable() it from that thread.
+        Returns None from Python 3.12 on, the session-wide profiler already covers the thread.
+        """
+        if not PER_THREAD:
+            return None
+        profiler = cProfile.Profile()
+        self.profilers.append(profiler)
+        return profiler
+
+    def start(self):
+        if not _active.acquire(blocking=False):
+            raise RuntimeError("Another profile is running")
+        if not PER_THREAD:
+            shared = cProfile.Profile()
+            try:
+                shared.enable()
+            except ValueError as e:
+                _active.release()
+                raise RuntimeError(f"Cannot profile: {e}")
+            self.shared = shared
+            self.profilers.append(shared)
+        self.started = time.monotonic()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    def stop(self):
+        self.elapsed = time.monotonic() - self.started
+        if self.shared is not None:
+            self.shared.disable()
+            self.shared = None
+        if self.memory and tracemalloc.is_tracing():
+            self.snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        _active.release()
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Calls fn under a profiler in the current thread and returns its result.
+        """
+        profiler = self.profiler()
+        self.start()
+        try:
+            if profiler is None:
+                return fn(*args, **kwargs)
+            return profiler.runcall(fn, *args, **kwargs)
+        finally:
+            self.stop()
+
+    def stats(self):
+        profilers = [profiler for profiler in self.profilers if profiler.getstats()]
+        if not profilers:
+            return None
+        stats = pstats.Stats(profilers[0], stream=io.StringIO())
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+    def summary(self, limit = 20, sort = "cumulative"):
+        stream = io.StringIO()
+        stats = self.stats()
+        if stats is None:
+            stream.write("No calls profiled\n")
+        else:
+            stats.stream = stream
+            stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        if self.snapshot is not None:
+            stream.write("Top allocations:\n")
+            for statistic in self.snapshot.statistics("lineno")[:10]:
+                stream.write(f"  {statistic}\n")
+        return stream.getvalue()
+
+    def save(self):
+        """
+        Writes the merged stats (.pstats, readable with pstats or snakeviz) and the
+        memory snapshot (.tracemalloc) if any, returns the paths written.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        paths = []
+        stats = self.stats()
+        if stats is not None:
+            stats.dump_stats(f"{base}.pstats")
+            paths.append(f"{base}.pstats")
+        if self.snapshot is not None:
+            self.snapshot.dump(f"{base}.tracemalloc")
+            paths.append(f"{base}.tracemalloc")
+        return paths
@@ -0,0 +1,122 @@
+from SerialSession import SerialSession
+import time
+from abc import ABC, abstractmethod
+from TagParser import TagParser
+from Metrics import Metrics
+from TagIds import TagInterner
+
+class ReaderBackend(ABC):
+    """
+    Interface between ScannerDriver and a reader model. A backend owns the connection
+    to its reader and turns what the reader sends into detections: sets of
+    (antenna, tag) tuples, tag being the ID of the EPC in the backend's tag_ids
+    interner. EPCs are interned as uppercase ASCII hex bytes, so tags read by
+    different reader models land on the same trackers.
+    Subclasses implement every abstract method, an incomplete backend fails when
+    constructed rather than mid-scan.
+    Windows are back to back like SerialSession windows: take_window() returns what
+    was detected in the next `duration` seconds.
+    """
+    protocol = None
+    tag_ids = None
+    # Set once a finite source (a replayed capture) has nothing left, the driver then stops
+    exhausted = False
+    capture = None
+    # Whether record() accepts a capture, checked before a capture file is created
+    can_record = True
+
+    @abstractmethod
+    def open(self):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+    @abstractmethod
+    def take_window(self, duration):
+        """
+        Blocks until the current window has elapsed and returns its detections.
+        """
+
+    @abstractmethod
+    def restart_window(self):
+        """
+        Drops what was received so far and starts the next window now.
+        """
+
+    @abstractmethod
+    def recent(self, since):
+        """
+        Returns detections received after `since` (monotonic time) without consuming them.
+        Only tells whether the feed is live, tags may be EPC bytes instead of interned IDs.
+        """
+
+    @abstractmethod
+    def wait_for_data(self, timeout):
+        """
+        Blocks until new data arrives or `timeout` seconds pass.
+        """
+
+    def record(self, capture):
+        """
+        Starts writing the raw bytes received from the reader to capture (a CaptureWriter),
+        None stops recording. The previous capture, if any, is closed.
+        """
+        previous, self.capture = self.capture, capture
+        if previous is not None:
+            previous.close()
+
+
+class ZebraBackend(ReaderBackend):
+    """
+    Zebra reader streaming text tag lines on its serial port.
+    Parameters:
+        device (str): serial device path
+        baudrate (int): serial baud rate
+        epc_prefixes (list, optional): EPC prefixes to accept, all if empty
+    """
+    protocol = "zebra"
+
+    def __init__(self, device, baudrate = 115200, epc_prefixes = None):
+        self.device = device
+        self.session = SerialSession(device, baudrate)
+        self.tag_ids = TagInterner()
+        self.parser = TagParser(epc_prefixes, self.tag_ids)
+        # Any well formed frame shows the feed is live, whatever the prefixes
+        self.probe_parser = TagParser()
+        self.metrics_parse = Metrics.instance().histogram("reader_parse_seconds", reader=device)
+        self.metrics_lines = Metrics.instance().counter("reader_lines_total", reader=device)
+
+    def __str__(self):
+        return f"ZebraBackend({self.session}, {self.parser})"
+
+    def open(self):
+        self.session.open()
+
+    def close(self):
+        self.session.close()
+        self.record(None)
+
+    def take_window(self, duration):
+        # The ingest thread keeps reading between scans, this only slices out and parses the next window
+        buffer = self.session.take_window(duration)
+        start = time.perf_counter()
+        tags = self.parser.feed(buffer)
+        self.metrics_parse.observe(time.perf_counter() - start)
+        self.metrics_lines.inc(buffer.count(b"\n"))
+        return tags
+
+    def restart_window(self):
+        self.session.restart_window()
+        self.parser.reset()
+
+    def recent(self, since):
+        return self.probe_parser.parse(self.session.peek(since))
+
+    def wait_for_data(self, timeout):
+        self.session.wait_for_data(timeout)
+
+    def record(self, capture):
+        super().record(capture)
+        self.session.capture = capture
@@ -0,0 +1,156 @@
+import threading
+import time
+import logging
+from ReaderBackend import ReaderBackend
+from SerialCapture import CaptureReader
+from TagParser import TagParser
+from TagIds import TagInterner
+from SR681Backend import FrameParser, parse_tag, CMD_INVENTORY, TAG_EPC
+
+logger = logging.getLogger(__name__)
+
+class ReplayBackend(ReaderBackend):
+    """
+    Plays a capture file back through the same parsing as the live reader it was
+    recorded from. Windows follow the capture's own clock, not the wall clock, so a
+    replay cuts the stream into the same windows whatever the speed and runs are
+    reproducible: speed 1 paces windows in real time, speed N runs N times faster and
+    speed 0 runs as fast as parsing and filtering go. Once the capture is exhausted the
+    driver stops, or the replay starts over if loop is set.
+    Parameters:
+        path (str): capture file written by CaptureWriter
+        speed (float): playback speed, 0 for no pacing
+        epc_prefixes (list, optional): EPC prefixes to accept, all if empty
+        loop (bool): start over at the end of the capture
+    """
+    protocol = "replay"
+    can_record = False
+
+    def __init__(self, path, speed = 1.0, epc_prefixes = None, loop = False):
+        self.path = path
+        self.speed = speed
+        self.epc_prefixes = epc_prefixes
+        self.loop = loop
+        self.condition = threading.Condition()
+        self.stop_flag = False
+        self.capture_file = None
+        self.windows = 0
+        self.last_detections = set()
+        self.tag_ids = TagInterner()
+        self._rewind()
+
+    def __str__(self):
+        return f"ReplayBackend({self.path}, protocol={self.source_protocol}, speed={self.speed}, windows={self.windows})"
+
+    def _rewind(self):
+        if self.capture_file is not None:
+            self.capture_file.close()
+        self.capture_file = CaptureReader(self.path)
+        self.source_protocol = self.capture_file.protocol
+        self.chunks = iter(self.capture_file)
+        self.next_chunk = next(self.chunks, None)
+        self.window_start = 0.0
+        self.clock_start = None
+        if self.source_protocol == "sr681":
+            self.frame_parser = FrameParser()
+            self.prefixes = tuple(p.upper().encode("ascii") for p in (self.epc_prefixes or []))
+        else:
+            self.parser = TagParser(self.epc_prefixes, self.tag_ids)
+
+    def open(self):
+        self.stop_flag = False
+
+    def close(self):
+        self.stop_flag = True
+        with self.condition:
+            self.condition.notify_all()
+        if self.capture_file is not None:
+            self.capture_file.close()
+
+    def take_window(self, duration):
+        if self.clock_start is None:
+            self.clock_start = time.monotonic()
+        window_end = self.window_start + duration
+        chunks = []
+        while self.next_chunk is not None and self.next_chunk[0] < window_end:
+            chunks.append(self.next_chunk[1])
+            self.next_chunk = next(self.chunks, None)
+
+        if self.speed:
+            # Pace the window end against the wall clock
+            with self.condition:
+                while not self.stop_flag:
+                    remaining = self.clock_start + window_end / self.speed - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+        self.window_start = window_end
+        self.windows += 1
+        self.last_detections = self._parse(b"".join(chunks))
+        if self.next_chunk is None:
+            if self.loop:
+                self._rewind()
+            else:
+                logger.info(f"Replay of {self.path} finished after {self.windows} windows")
+                self.exhausted = True
+        return self.last_detections
+
+    def _parse(self, buffer):
+        if self.source_protocol != "sr681":
+            # Lines cut by the window boundary complete in the next window, as live
+            return self.parser.feed(buffer)
+        detected = set()
+        for command, status, data in self.frame_parser.feed(buffer):
+            if command == CMD_INVENTORY and len(data) > TAG_EPC:
+                detection = parse_tag(data, self.prefixes)
+                if detection is not None:
+                    detected.add((detection[0], self.tag_ids.intern(detection[1])))
+        return detected
+
+    def restart_window(self):
+        # The recording cannot react to a trigger, the window just goes on in capture time
+        pass
+
+    def recent(self, since):
+        # Capture time has no relation to `since`, the last window stands for recent data
+        return set(self.last_detections)
+
+    def wait_for_data(self, timeout):
+        with self.condition:
+            self.condition.wait(timeout)
+
+    def record(self, capture):
+        if capture is not None:
+            raise ValueError("A replayed capture cannot be recorded again")
+
+
+if __name__ == "__main__":
+    # Re-runs a capture through parsing and filtering, e.g. to compare filter settings on field data:
+    #   python ReplayBackend.py shelf.cap.gz --method HMMViterbi --speed 0
+    import argparse
+    from PyQt6.QtCore import Qt
+    from ScannerDriver import ScannerDriver
+    from TagTable import FilterMethod
+
+    arguments = argparse.ArgumentParser(description="Replay a reader capture through the scanner")
+    arguments.add_argument("capture")
+    arguments.add_argument("--method", default="WindowLPF", choices=[method.name for method in FilterMethod])
+    arguments.add_argument("--speed", type=float, default=0)
+    arguments.add_argument("--antenna-count", type=int, default=4)
+    arguments.add_argument("--scan-time", type=float, default=3)
+    arguments.add_argument("--window-size", type=int, default=3)
+    options = arguments.parse_args()
+
+    backend = ReplayBackend(options.capture, speed=options.speed)
+    driver = ScannerDriver(None, device=options.capture, antenna_count=options.antenna_count,
+                           scan_time=options.scan_time, window_size=options.window_size, backend=backend)
+    driver.change_filter_method(FilterMethod[options.method])
+    changes = []
+    driver.signals.result.connect(lambda result: result and changes.append(result), Qt.ConnectionType.DirectConnection)
+    start = time.monotonic()
+    driver.run()
+    elapsed = time.monotonic() - start
+    print(f"{backend.windows} windows ({backend.windows * options.scan_time:.0f} s of capture) in {elapsed:.2f} s, "
+          f"{len(changes)} change sets")
+    print(f"Final tag counts: {driver.tag_counts}")
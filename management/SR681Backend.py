@@ -0,0 +1,267 @@
+import threading
+import time
+import logging
+from collections import deque
+import serial
+from ReaderBackend import ReaderBackend
+from Metrics import Metrics
+from TagIds import TagInterner
+
+logger = logging.getLogger(__name__)
+
+REQUEST_HEADER = b"\x7C"
+RESPONSE_HEADER = b"\xCC\xFF\xFF"
+BROADCAST_ADDRESS = b"\xFF\xFF"
+CMD_INVENTORY = 0x20
+# Inventory response data of one tag: antenna, RSSI, then the EPC
+TAG_ANTENNA = 0
+TAG_EPC = 2
+
+def checksum(data):
+    # Two's complement of the byte sum, so a valid frame sums to 0 modulo 256
+    return (-sum(data)) & 0xFF
+
+def encode_request(command, data = b"", address = BROADCAST_ADDRESS):
+    """
+    Builds a request frame: 0x7C, address (2), command, option, data length, data, checksum.
+    encode_request(CMD_INVENTORY) is the 7C FF FF 20 00 00 66 read of testing/SR681_test.py.
+    """
+    frame = REQUEST_HEADER + address + bytes((command, 0x00, len(data))) + bytes(data)
+    return frame + bytes((checksum(frame),))
+
+def parse_tag(data, prefixes = ()):
+    """
+    Returns (antenna, epc) from the data of an inventory response, epc as uppercase
+    ASCII hex bytes, or None if the EPC does not start with one of the prefixes.
+    """
+    epc = data[TAG_EPC:].hex().upper().encode("ascii")
+    if prefixes and not epc.startswith(prefixes):
+        return None
+    return data[TAG_ANTENNA], epc
+
+
+class FrameParser(object):
+    """
+    Incremental parser of SR681 response frames:
+        0xCC 0xFF 0xFF, command, status, data length, data, checksum
+    Bytes are fed as they arrive; complete frames with a valid checksum are returned as
+    (command, status, data). Garbage and frames with a bad checksum are skipped by
+    resynchronizing on the next response header.
+    """
+    MINIMUM = len(RESPONSE_HEADER) + 4
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.checksum_errors = 0
+        self.skipped_bytes = 0
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        frames = []
+        while True:
+            start = self.buffer.find(RESPONSE_HEADER)
+            if start < 0:
+                # Keep a possible partial header at the end
+                keep = len(RESPONSE_HEADER) - 1
+                self.skipped_bytes += max(len(self.buffer) - keep, 0)
+                del self.buffer[:-keep or None]
+                break
+            if start:
+                self.skipped_bytes += start
+                del self.buffer[:start]
+            if len(self.buffer) < self.MINIMUM:
+                break
+            length = len(RESPONSE_HEADER) + 4 + self.buffer[len(RESPONSE_HEADER) + 2]
+            if len(self.buffer) < length:
+                break
+            frame = bytes(self.buffer[:length])
+            if sum(frame) & 0xFF:
+                # Corrupted, look for the next header after this one
+                self.checksum_errors += 1
+                self.skipped_bytes += 1
+                del self.buffer[:1]
+                continue
+            del self.buffer[:length]
+            header = len(RESPONSE_HEADER)
+            frames.append((frame[header], frame[header + 1], frame[header + 3:-1]))
+        return frames
+
+
+class SR681Backend(ReaderBackend):
+    """
+    SR681 reader speaking the binary request/response protocol at 57600 baud.
+    A daemon thread polls the reader with inventory requests, keeping up to
+    pipeline_depth requests in flight so the reader never idles waiting for the next
+    one, and parses responses incrementally as they arrive. An inventory response with
+    data carries one tag: antenna (1 byte), RSSI (1 byte), EPC (rest); the response
+    without data closes the inventory round. With antennas set, each request polls one
+    antenna in turn (its number as request data), otherwise the reader inventories all.
+    Detections feed back to back windows like the Zebra backend.
+    Parameters:
+        device (str): serial device path
+        antennas (list, optional): antennas to poll one by one, all at once if None
+        baudrate (int): serial baud rate
+        epc_prefixes (list, optional): EPC prefixes (hex) to accept, all if empty
+        pipeline_depth (int): inventory requests in flight
+        response_timeout (float): seconds without response before requests count as lost
+        poll_interval (float): pause between inventory rounds, lowers the reader duty cycle
+        history (float): seconds of detections kept for recent() after their window was taken
+        max_detections (int): detection buffer capacity, oldest are dropped beyond it
+    """
+    protocol = "sr681"
+
+    def __init__(self, device, antennas = None, baudrate = 57600, epc_prefixes = None,
+                 pipeline_depth = 2, response_timeout = 0.5, poll_interval = 0, history = 5, max_detections = 100000):
+        self.device = device
+        self.antennas = list(antennas) if antennas else None
+        self.baudrate = baudrate
+        self.prefixes = tuple(p.upper().encode("ascii") if isinstance(p, str) else bytes(p) for p in (epc_prefixes or []))
+        self.pipeline_depth = pipeline_depth
+        self.response_timeout = response_timeout
+        self.poll_interval = poll_interval
+        self.history = history
+        self.max_detections = max_detections
+
+        self.parser = FrameParser()
+        # Used from the scanner thread only, the poll thread keeps EPC bytes
+        self.tag_ids = TagInterner()
+        self.metrics_frames = Metrics.instance().counter("reader_frames_total", reader=device)
+        self.metrics_errors = Metrics.instance().counter("reader_checksum_errors_total", reader=device)
+        self.requests = [encode_request(CMD_INVENTORY, bytes((antenna,))) for antenna in self.antennas] \
+            if self.antennas else [encode_request(CMD_INVENTORY)]
+        self.next_request = 0
+        self.in_flight = 0
+        self.rounds = 0
+        self.lost_requests = 0
+
+        # (arrival time, antenna, epc), guarded by condition
+        self.detections = deque()
+        self.dropped_detections = 0
+        self.condition = threading.Condition()
+        self.window_start = time.monotonic()
+        self.stop_flag = False
+        self.thread = None
+
+    def __str__(self):
+        return (f"SR681Backend({self.device}, rounds={self.rounds}, lost={self.lost_requests}, "
+                f"checksum_errors={self.parser.checksum_errors})")
+
+    def open(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_flag = False
+        self.window_start = time.monotonic()
+        self.thread = threading.Thread(target=self._poll, name=f"SR681Backend({self.device})", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.stop_flag = True
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(self.response_timeout * 2)
+        self.record(None)
+
+    def _poll(self):
+        failures = 0
+        while not self.stop_flag:
+            try:
+                with serial.Serial(self.device, baudrate=self.baudrate, timeout=0.05) as ser:
+                    logger.info(f"Opened SR681 reader on {self.device}")
+                    failures = 0
+                    self.in_flight = 0
+                    last_response = time.monotonic()
+                    while not self.stop_flag:
+                        # Pipelining: queue the next requests before the previous responses are in
+                        if self.in_flight < self.pipeline_depth:
+                            count = self.pipeline_depth - self.in_flight
+                            ser.write(b"".join(self._next_request() for _ in range(count)))
+                            self.in_flight += count
+                            last_response = max(last_response, time.monotonic())
+
+                        chunk = ser.read(max(ser.in_waiting, 1))
+                        now = time.monotonic()
+                        if chunk:
+                            capture = self.capture
+                            if capture is not None:
+                                capture.write(now, chunk)
+                            errors = self.parser.checksum_errors
+                            frames = self.parser.feed(chunk)
+                            for command, status, data in frames:
+                                last_response = now
+                                self._handle(now, command, status, data)
+                            self.metrics_frames.inc(len(frames))
+                            if self.parser.checksum_errors != errors:
+                                self.metrics_errors.inc(self.parser.checksum_errors - errors)
+                        elif now - last_response > self.response_timeout:
+                            # Responses lost, e.g. reader reset: start over with a fresh pipeline
+                            self.lost_requests += self.in_flight
+                            self.in_flight = 0
+                            last_response = now
+            except (serial.SerialException, OSError) as e:
+                if failures == 0:
+                    logger.error(f"SR681 reader on {self.device} failed: {e}")
+                failures += 1
+                with self.condition:
+                    self.condition.wait(min(failures, 10))
+
+    def _next_request(self):
+        request = self.requests[self.next_request]
+        self.next_request = (self.next_request + 1) % len(self.requests)
+        return request
+
+    def _handle(self, timestamp, command, status, data):
+        if command != CMD_INVENTORY:
+            return
+        if len(data) <= TAG_EPC:
+            # End of an inventory round
+            self.in_flight = max(self.in_flight - 1, 0)
+            self.rounds += 1
+            if self.poll_interval:
+                with self.condition:
+                    self.condition.wait(self.poll_interval)
+            return
+        detection = parse_tag(data, self.prefixes)
+        if detection is None:
+            return
+        antenna, epc = detection
+        with self.condition:
+            self.detections.append((timestamp, antenna, epc))
+            if len(self.detections) > self.max_detections:
+                self.detections.popleft()
+                self.dropped_detections += 1
+            self.condition.notify_all()
+
+    def take_window(self, duration):
+        with self.condition:
+            now = time.monotonic()
+            if now - self.window_start > 2 * duration:
+                # Fell behind, restart from one duration ago like SerialSession
+                self.window_start = now - duration
+            window_end = self.window_start + duration
+            while not self.stop_flag:
+                remaining = window_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+
+            reads = {(antenna, epc) for timestamp, antenna, epc in self.detections
+                     if self.window_start <= timestamp < window_end}
+            self.window_start = window_end
+            # Past windows stay around for recent() until they are older than the history
+            while self.detections and self.detections[0][0] < window_end - self.history:
+                self.detections.popleft()
+        intern = self.tag_ids.intern
+        return {(antenna, intern(epc)) for antenna, epc in reads}
+
+    def restart_window(self):
+        with self.condition:
+            self.window_start = time.monotonic()
+
+    def recent(self, since):
+        with self.condition:
+            return {(antenna, epc) for timestamp, antenna, epc in self.detections if timestamp >= since}
+
+    def wait_for_data(self, timeout):
+        with self.condition:
+            self.condition.wait(timeout)
@@ -0,0 +1,123 @@
+import time
+import logging
+from PyQt6 import QtCore
+from Workers import WorkerThread
+from Metrics import Metrics, COUNTS
+
+logger = logging.getLogger(__name__)
+
+class SaveQueue(QtCore.QObject):
+    """
+    Write-behind queue between table edits and Google Sheets.
+    Edits are collected in a pending map keyed by (row, column), so repeated edits of
+    a cell collapse to its latest value. The map is flushed as one push when no edit
+    arrived for debounce_ms, or at the latest max_latency_ms after the first pending
+    edit. Only one push is in flight at a time; a failed push is merged back under
+    any newer edits and retried with exponential backoff.
+    Parameters:
+        push (callable): called in a worker thread with the {(row, column): value} batch, raises on failure
+        threadpool (QThreadPool): pool that runs the pushes
+        debounce_ms (int): quiet time before a flush
+        max_latency_ms (int): upper bound on how long an edit waits for a flush
+        max_backoff_ms (int): upper bound on the retry delay
+    """
+    flush_started = QtCore.pyqtSignal(int)      # number of cells being pushed
+    flushed = QtCore.pyqtSignal(dict)           # batch that reached the sheet
+    failed = QtCore.pyqtSignal(object, int)     # error, retry delay in ms
+
+    def __init__(self, push, threadpool, debounce_ms = 1500, max_latency_ms = 10000,
+                 retry_ms = 2000, max_backoff_ms = 60000):
+        super().__init__()
+        self.push = push
+        self.threadpool = threadpool
+        self.debounce_ms = debounce_ms
+        self.max_latency_ms = max_latency_ms
+        self.retry_ms = retry_ms
+        self.max_backoff_ms = max_backoff_ms
+        self.retry_delay = retry_ms
+
+        self.pending = {}
+        self.in_flight = None
+        self.flush_requested = False
+        # Monotonic time of the oldest pending edit, for the edit to push latency
+        self.pending_since = None
+        self.push_started = None
+        metrics = Metrics.instance()
+        self.metrics_wait = metrics.histogram("save_queue_wait_seconds")
+        self.metrics_push = metrics.histogram("sheets_push_seconds")
+        self.metrics_cells = metrics.histogram("sheets_push_cells", COUNTS)
+        self.metrics_failures = metrics.counter("sheets_push_failures_total")
+
+        self.debounce_timer = QtCore.QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.timeout.connect(self.flush)
+        self.latency_timer = QtCore.QTimer(self)
+        self.latency_timer.setSingleShot(True)
+        self.latency_timer.timeout.connect(self.flush)
+        self.retry_timer = QtCore.QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.timeout.connect(self.flush)
+
+    def __len__(self):
+        return len(self.pending)
+
+    def enqueue(self, row, column, value):
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+        self.pending[(row, column)] = value
+        if self.retry_timer.isActive():
+            # A retry is already scheduled, it will pick this edit up
+            return
+        self.debounce_timer.start(self.debounce_ms)
+        if not self.latency_timer.isActive():
+            self.latency_timer.start(self.max_latency_ms)
+
+    def flush(self):
+        self._stop_timers()
+        if self.in_flight is not None:
+            # Flush again as soon as the current push completes
+            self.flush_requested = True
+            return
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, {}
+        self.in_flight = batch
+        self.flush_requested = False
+        self.push_started = time.monotonic()
+        if self.pending_since is not None:
+            self.metrics_wait.observe(self.push_started - self.pending_since)
+            self.pending_since = None
+        self.metrics_cells.observe(len(batch))
+        worker = WorkerThread(self.push, batch)
+        worker.signals.result.connect(self._on_pushed)
+        worker.signals.error.connect(self._on_error)
+        self.flush_started.emit(len(batch))
+        self.threadpool.start(worker)
+
+    def _stop_timers(self):
+        self.debounce_timer.stop()
+        self.latency_timer.stop()
+        self.retry_timer.stop()
+
+    def _on_pushed(self, batch):
+        self.metrics_push.observe(time.monotonic() - self.push_started)
+        self.in_flight = None
+        self.retry_delay = self.retry_ms
+        self.flushed.emit(batch)
+        if self.pending and (self.flush_requested or not self.debounce_timer.isActive()):
+            self.flush()
+
+    def _on_error(self, error):
+        batch, self.in_flight = self.in_flight, None
+        self.metrics_failures.inc()
+        # The failed batch is older than anything enqueued since
+        self.pending_since = self.push_started
+        # Keep edits made while the push was in flight, they are newer
+        for cell, value in batch.items():
+            self.pending.setdefault(cell, value)
+        delay = self.retry_delay
+        self.retry_delay = min(self.retry_delay * 2, self.max_backoff_ms)
+        logger.error(f"Failed to push {len(batch)} cells, retrying in {delay} ms")
+        self._stop_timers()
+        self.retry_timer.start(delay)
+        self.failed.emit(error, delay)
@@ -1,31 +1,13 @@
-from Workers import WorkerSignals, WorkerThread
-import serial
+from Workers import WorkerThread
+from ReaderBackend import ZebraBackend
+from TagTable import TagTable, FilterMethod
+from FeedProbe import FeedProbe
+from Metrics import Metrics, COUNTS
 import time
-import numpy as np
-from PyQt6.QtCore import QTimer, QEventLoop
-from copy import deepcopy
-import re
-from enum import Enum
+import threading
 from dataclasses import dataclass
-import os
-import json
-
-FORMAT = r'^[^,]+,[12345678]+,<[0-9a-fA-F]{4}>$' # re for parsing
-
-class FilterMethod(Enum):
-    NoFiltering = 0
-    WindowLPF = 1
-    HMMViterbi = 2
-
-    def __str__(self):
-        return self.name
-
-    @classmethod
-    def from_string(cls, method_str):
-        try:
-            return cls[method_str]
-        except KeyError:
-            raise ValueError(f"Invalid filter method: {method_str}")
+import logging
+logger = logging.getLogger(__name__)
 
 @dataclass
 class method_states_t:
@@ -40,88 +22,62 @@ class method_states_t:
         self.next_method = method
 
 
-method_state = method_states_t()
-
-class TagTracker(object):
-    def __init__(self, window_size = 3):
-        # No existance on initialization
-        self.detections = np.zeros(window_size)
-        self.previous_state = False
-        self.state = False
-
-        self.viterbi_states = {
-            "A": np.array([
-                [0.95, 0.05],  # from Present
-                [0.05, 0.95]   # from Absent
-            ]),
-            "B": np.array([
-                [0.1, 0.9],  # Present
-                [0.8, 0.2]   # Absent
-            ]),
-            "V_prev": np.array([0.05, 0.95])  # [Present, Absent]
-        }
-
-    def __str__(self):
-        return f"TagTracker(state={self.state}, detections={self.detections})"
-
-    def update(self, detection: bool):
-        global method_state
-        self.detections = np.roll(self.detections, -1)
-        self.detections[-1] = 1 if detection else 0
-        self.previous_state = self.state
-
-        if method_state.filter_method == FilterMethod.NoFiltering:
-            # No filtering, just update the state
-            self.state = self.detections[-1].astype(bool)
-
-        elif method_state.filter_method == FilterMethod.WindowLPF:
-            self.state = np.mean(self.detections) > 0.5
-
-        elif method_state.filter_method == FilterMethod.HMMViterbi:
-            if method_state.previous_method != method_state.filter_method:
-                # Reset the Viterbi states when the method changes
-                self.viterbi_states["V_prev"] = np.array([0.95, 0.05]) if self.state else np.array([0.05, 0.95])
-            obs_index = int(detection)  # 1 if True, 0 if False
-            # Compute max over previous states for each current state
-            self.viterbi_states["V_prev"] = np.max(self.viterbi_states["V_prev"][:, None] *
-                self.viterbi_states["A"] *
-                self.viterbi_states["B"][:, obs_index],
-                axis=0)
-            self.state = True if np.argmax(self.viterbi_states["V_prev"]) == 0 else False
-        
-        return self.state, self.previous_state
-        
-    def getState(self):
-        return self.state
-
-
 class ScannerDriver(WorkerThread):
     def __init__(self, application, device = None, antenna_count = 4,
-                 scan_time = 3, window_size = 3):
+                 scan_time = 3, window_size = 3, hmm_models = None, epc_prefixes = None, trigger = None,
+                 backend = None, max_tags = 10000):
         # Default 3 scans, 3 secods each
+        # hmm_models optionally maps antenna number (or "default") to {"A": [[..]], "B": [[..]]}
+        # epc_prefixes optionally restricts accepted tags to EPCs starting with one of the prefixes
+        # trigger optionally switches to trigger mode: a GpioTrigger decides when and which antennas to scan
+        # backend optionally replaces the default Zebra text protocol backend on device, see ReaderBackend
+        # max_tags caps the tracked (antenna, tag) pairs, the least recently seen are evicted beyond it
 
         self.application = application      # main application object
         self.device = device                # serial device
         self.antenna_count = antenna_count
 
-        # state variable is a dictionary of dictionaries
-        # Each key is the antenna number
-        # Each value is a dictionary of tags
-            # Each key is the tag ID
-            # Each value is an np.array of presence boolean
-        self.trackers = {}
-        for i in range(self.antenna_count):
-            self.trackers[i] = {}
+        # Reader connection stays open for the lifetime of the driver
+        self.backend = backend if backend is not None else ZebraBackend(self.device, epc_prefixes = epc_prefixes)
+        # Tags are integer IDs interned by the backend, EPCs only come back for display
+        self.tag_ids = self.backend.tag_ids
+
+        # One tracker table holds the filter state of every (antenna, tag) pair
+        self.trackers = TagTable(self.antenna_count, window_size, interner = self.tag_ids, max_tags = max_tags)
+        hmm_models = hmm_models or {}
+        for antenna in range(self.antenna_count):
+            model = hmm_models.get(str(antenna), hmm_models.get("default"))
+            if model is not None:
+                self.trackers.set_model(antenna, model["A"], model["B"])
         self.tag_counts = {i: 0 for i in range(self.antenna_count)}
         self.scan_time = scan_time
         self.window_size = window_size
         self.pause_flag = False
+        # Per driver, so readers of a pool switch filters independently
+        self.method_state = method_states_t()
+
+        # Tells whether the reader already streams, so its configuration can be skipped
+        self.feed_probe = FeedProbe(self.backend)
+        self.gpio_trigger = trigger
+
+        # Stage timings of the scan cycle, looked up once so _scan only observes
+        metrics = Metrics.instance()
+        self.metrics_window = metrics.histogram("scanner_window_seconds", reader=self.device)
+        self.metrics_filter = metrics.histogram("scanner_filter_seconds", reader=self.device)
+        self.metrics_emit = metrics.histogram("scanner_emit_seconds", reader=self.device)
+        self.metrics_tags = metrics.histogram("scanner_window_tags", COUNTS, reader=self.device)
+        self.metrics_trackers = metrics.gauge("scanner_trackers", reader=self.device)
+        self.metrics_evicted = metrics.counter("scanner_evicted_tags_total", reader=self.device)
+        self.metrics_antenna_tags = [metrics.gauge("scanner_present_tags", reader=self.device, antenna=antenna)
+                                     for antenna in range(self.antenna_count)]
+        self.last_emit = None
+        # (profiler, seconds, done event) set by profile(), picked up by the scan loop
+        self.profile_request = None
         
         super().__init__(self._run)
 
     def change_filter_method(self, method: FilterMethod):
-        global method_state
-        method_state.next_method = method
+        self.method_state.next_method = method
 
     def pause(self):
         self.pause_flag = True
@@ -129,73 +85,120 @@ class ScannerDriver(WorkerThread):
     def start(self):
         self.pause_flag = False
 
+    def stop(self):
+        super().stop()
+        if self.gpio_trigger is not None:
+            self.gpio_trigger.stop()
+        self.backend.close()
+
+    def trigger(self, antennas = None):
+        """
+        Requests a scan burst of the given antennas (all if None) in trigger mode.
+        Returns False in continuous mode, where every window is scanned anyway.
+        """
+        if self.gpio_trigger is None:
+            return False
+        self.gpio_trigger.request(antennas)
+        return True
+
+    def profile(self, profiler, seconds):
+        """
+        Runs the scan loop under profiler (a cProfile.Profile, None when a session-wide
+        profiler already covers this thread) for about `seconds` and at least one scan
+        cycle, from the scanner's own thread, starting with the next cycle.
+        Returns an event set once profiling ended, or failed to start.
+        """
+        done = threading.Event()
+        self.profile_request = (profiler, seconds, done)
+        return done
+
     def _run(self):
-        while not self.stop_flag:
-            if self.pause_flag:
-                time.sleep(0.5)
-            else:
-                self._scan()
-
-    def _scan(self):
-        global method_state
+        self.backend.open()
+        try:
+            while not self.stop_flag and not self.backend.exhausted:
+                if self.profile_request is not None:
+                    self._profiled_steps()
+                else:
+                    self._step()
+        finally:
+            self.backend.close()
+            if self.gpio_trigger is not None:
+                self.gpio_trigger.close()
+
+    def _step(self):
+        if self.pause_flag:
+            time.sleep(0.5)
+        elif self.gpio_trigger is None:
+            self._scan()
+        else:
+            self._triggered_scan()
+
+    def _profiled_steps(self):
+        profiler, seconds, done = self.profile_request
+        self.profile_request = None
+        try:
+            if profiler is not None:
+                profiler.enable()
+        except ValueError as e:
+            # Another profiling tool is active, the scan loop goes on unprofiled
+            logger.warning(f"Scanner on {self.device} not profiled: {e}")
+            done.set()
+            return
+        deadline = time.monotonic() + seconds
+        try:
+            self._step()
+            while not self.stop_flag and not self.backend.exhausted and time.monotonic() < deadline:
+                self._step()
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            done.set()
+
+    def _triggered_scan(self):
+        # Idle until an edge or the background interval, then read only for this window
+        antennas = self.gpio_trigger.wait()
+        if antennas is not None and not antennas:
+            return
+        self.backend.restart_window()
+        self.gpio_trigger.pulse()
+        self._scan(antennas)
+
+    def _scan(self, antennas = None):
+        method_state = self.method_state
         method_state.previous_method = method_state.filter_method
         method_state.filter_method = method_state.next_method
 
-        # Fetch the buffer from the device
-        buffer = self._fetch_buffer(self.device)
-        # Parse the buffer
-        tags = self._parse_buffer(buffer)
-
-        changed_antennas = set()
-        self.tag_counts = {i: 0 for i in range(self.antenna_count)}
-        # Update the trackers for detected tags
-        for antenna_num, tag in tags:
-            # check if a tracker exists for this tag
-            if tag not in self.trackers[antenna_num]:
-                self.trackers[antenna_num][tag] = TagTracker(self.window_size)
-            # update the tracker
-            state, previous = self.trackers[antenna_num][tag].update(True)
-
-            if state:
-                self.tag_counts[antenna_num] += 1
-            if state != previous:
-                changed_antennas.add(antenna_num)
-        # update the trackers not detected
-        remove_tags = set()
-        for antenna in self.trackers:
-            for tag, tracker in self.trackers[antenna].items():
-                if (antenna, tag) not in tags:
-                    state, previous = tracker.update(False)
-                    if state != previous:
-                        changed_antennas.add(antenna)
-                    if tracker.detections.sum() == 0:
-                        # remove the tracker if it is not detected
-                        remove_tags.add((antenna, tag))
-        for antenna, tag in remove_tags:
-            del self.trackers[antenna][tag]
-        # emit only changed antennas
+        # Detections of the next window, as (antenna, epc) tuples
+        window_start = time.perf_counter()
+        tags = self.backend.take_window(self.scan_time)
+        filter_start = time.perf_counter()
+        if tags:
+            self.feed_probe.mark_live()
+
+        # Drop reads from antennas outside the configured range
+        tags = {(antenna, tag) for antenna, tag in tags if 0 <= antenna < self.antenna_count}
+
+        # Update every tracker in one batched step
+        changed_antennas, tag_counts = self.trackers.update(
+            tags, method_state.filter_method, method_state.previous_method, antennas)
+        if self.tag_ids is not None:
+            # Reads that did not make it into a tracker give their IDs back
+            self.tag_ids.sweep()
+        self.tag_counts = {i: int(count) for i, count in enumerate(tag_counts)}
+        emit_start = time.perf_counter()
+        # emit only changed antennas, scanning goes on while the results are handled:
+        # the backend keeps capturing the next window and the receiver coalesces what it cannot take yet
         if changed_antennas:
-            self.pause()
+            self.last_emit = time.monotonic()
             self.signals.result.emit({i: self.tag_counts[i] for i in changed_antennas})
 
-    @staticmethod
-    def _parse_buffer(buffer):
-        # this returns a set of tuples (antenna_num, tag) for
-        # each tag in the buffer
-        result = set()
-        lines = buffer.split("\n")
-        for line in lines:
-            line = line.strip()
-            if bool(re.fullmatch(FORMAT, line)):
-                id, antenna, _ = line.split(",")
-                result.add((int(antenna), id))
-        return result
-    
-    def _fetch_buffer(self, device):
-        data = b''
-        start_time = time.time()
-        with serial.Serial(device, baudrate=115200, timeout=1) as ser:
-            while time.time() - start_time < self.scan_time and not self.stop_flag:
-                data += ser.read_all()
-
-        return data.decode('utf-8', errors='replace')
+        self.metrics_window.observe(filter_start - window_start)
+        self.metrics_filter.observe(emit_start - filter_start)
+        self.metrics_emit.observe(time.perf_counter() - emit_start)
+        self.metrics_tags.observe(len(tags))
+        self.metrics_trackers.set(len(self.trackers))
+        if self.trackers.evicted:
+            self.metrics_evicted.inc(self.trackers.evicted)
+        for antenna, count in self.tag_counts.items():
+            if antenna < len(self.metrics_antenna_tags):
+                self.metrics_antenna_tags[antenna].set(count)
@@ -0,0 +1,212 @@
+import time
+import logging
+from functools import partial
+from PyQt6 import QtCore
+from Workers import WorkerSignals
+from ScannerDriver import ScannerDriver
+from TagTable import FilterMethod
+from GpioTrigger import GpioTrigger
+from ReaderBackend import ZebraBackend
+from SR681Backend import SR681Backend
+from ReplayBackend import ReplayBackend
+from SerialCapture import CaptureWriter
+from Metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+class PoolTrackers(object):
+    """
+    Read-only view of the readers' tracker tables as one namespace of drawers,
+    so callers can query a drawer without knowing which reader serves it.
+    """
+    def __init__(self, pool):
+        self.pool = pool
+
+    def items(self, drawer):
+        reader, antenna = self.pool.drawers[drawer]
+        return self.pool.drivers[reader].trackers.items(antenna)
+
+    def epc(self, drawer, tag):
+        # Tag IDs are per reader, the drawer tells whose interner to ask
+        reader, _ = self.pool.drawers[drawer]
+        return self.pool.drivers[reader].trackers.epc(tag)
+
+
+def make_backend(config, epc_prefixes = None):
+    """
+    Creates the backend of a reader from its "model" setting: "zebra" (default), "sr681",
+    or "replay" to play back the capture file given as device. A "record" path records
+    what a live reader sends to a capture file.
+    """
+    model = config.get("model", "zebra")
+    if model == "zebra":
+        backend = ZebraBackend(config["device"], baudrate = config.get("baudrate", 115200), epc_prefixes = epc_prefixes)
+    elif model == "sr681":
+        backend = SR681Backend(config["device"], antennas = config.get("antennas"),
+                               baudrate = config.get("baudrate", 57600), epc_prefixes = epc_prefixes,
+                               pipeline_depth = config.get("pipeline_depth", 2))
+    elif model == "replay":
+        return ReplayBackend(config["device"], speed = config.get("speed", 1.0), epc_prefixes = epc_prefixes,
+                             loop = config.get("loop", False))
+    else:
+        raise ValueError(f"Unknown reader model: {model}")
+    if config.get("record"):
+        backend.record(CaptureWriter(config["record"], backend.protocol, config["device"]))
+    return backend
+
+
+class ScannerPool(QtCore.QObject):
+    """
+    Runs several readers concurrently, one ScannerDriver per serial device, each in
+    its own thread of a dedicated thread pool and with its own antenna count and timing.
+    Reader models can be mixed: every backend reports the same detections to the trackers.
+    The (reader, antenna) pairs are numbered as drawers in reader order, reader 0 taking
+    drawers 0..n0-1, reader 1 the next ones, and so on; drawer numbers are table rows.
+    Results of all readers arriving within merge_ms of each other are emitted as one
+    {drawer: tag count} change set through signals.result. Readers never wait for the
+    receiver: until it calls acknowledge(), newer results are coalesced per drawer into
+    the next change set, which is emitted as soon as the previous one is acknowledged.
+    Parameters:
+        application: main application object
+        readers (list): one dict per reader with "device" and optionally "model" ("zebra", "sr681" or "replay"),
+            "baudrate", "antennas" (SR681 antennas to poll one by one), "pipeline_depth", "record",
+            "speed" and "loop" (replay), "antenna_count",
+            "scan_time", "window_size", "max_tags", "hmm_models", "epc_prefixes" and "trigger"
+            (see GpioTrigger.from_config, the reader then only scans on GPIO edges and a slow background timer)
+        hmm_models (dict, optional): HMM matrices for readers that do not set their own
+        epc_prefixes (list, optional): EPC prefixes for readers that do not set their own
+        merge_ms (int): how long to wait for other readers before emitting a change set
+    """
+    def __init__(self, application, readers, hmm_models = None, epc_prefixes = None, merge_ms = 250):
+        super().__init__()
+        self.signals = WorkerSignals()
+        self.drivers = []
+        self.drawers = []       # drawer -> (reader, antenna)
+        self.offsets = []       # reader -> first drawer
+        for reader, config in enumerate(readers):
+            prefixes = config.get("epc_prefixes", epc_prefixes)
+            driver = ScannerDriver(application, device = config["device"],
+                                   antenna_count = config.get("antenna_count", 4),
+                                   scan_time = config.get("scan_time", 3),
+                                   window_size = config.get("window_size", 3),
+                                   hmm_models = config.get("hmm_models", hmm_models),
+                                   epc_prefixes = prefixes,
+                                   trigger = GpioTrigger.from_config(config["trigger"]) if config.get("trigger") else None,
+                                   backend = make_backend(config, prefixes),
+                                   max_tags = config.get("max_tags", 10000))
+            driver.signals.result.connect(partial(self._on_result, reader))
+            driver.signals.error.connect(self.signals.error.emit)
+            driver.signals.finished.connect(partial(self._on_finished, reader))
+            self.offsets.append(len(self.drawers))
+            self.drawers.extend((reader, antenna) for antenna in range(driver.antenna_count))
+            self.drivers.append(driver)
+        self.antenna_count = len(self.drawers)
+        self.trackers = PoolTrackers(self)
+        self.running = set()
+
+        # Readers block on their serial sessions, each gets a thread of its own
+        self.threadpool = QtCore.QThreadPool()
+        self.threadpool.setMaxThreadCount(max(len(self.drivers), 1))
+
+        self.pending = {}
+        self.awaiting_ack = False
+        self.merge_ms = merge_ms
+        self.merge_timer = QtCore.QTimer(self)
+        self.merge_timer.setSingleShot(True)
+        self.merge_timer.timeout.connect(self._emit)
+        # Driver emit to arrival in this thread, i.e. Qt signal delivery
+        self.metrics_delivery = Metrics.instance().histogram("scanner_signal_delivery_seconds")
+        self.metrics_coalesced = Metrics.instance().counter("scanner_coalesced_results_total")
+
+    def __str__(self):
+        return f"ScannerPool({', '.join(driver.device for driver in self.drivers)}, drawers={self.antenna_count})"
+
+    def __len__(self):
+        return len(self.drivers)
+
+    @property
+    def feed_probe(self):
+        # zebra.conf describes the first Zebra reader, its feed decides whether to configure it
+        for driver in self.drivers:
+            if driver.backend.protocol == "zebra":
+                return driver.feed_probe
+        return None
+
+    def drawer(self, reader, antenna):
+        return self.offsets[reader] + antenna
+
+    def launch(self):
+        for reader, driver in enumerate(self.drivers):
+            self.running.add(reader)
+            self.threadpool.start(driver)
+
+    def change_filter_method(self, method: FilterMethod):
+        for driver in self.drivers:
+            driver.change_filter_method(method)
+
+    def trigger(self):
+        """
+        Requests a full scan burst on readers in trigger mode, returns how many were triggered.
+        """
+        return sum(driver.trigger() for driver in self.drivers)
+
+    def profile(self, session, seconds):
+        """
+        Profiles every reader's scan loop for `seconds` with profilers of session
+        (a ProfileSession), returns the events set as each reader finishes.
+        """
+        return [driver.profile(session.profiler(), seconds) for driver in self.drivers]
+
+    def pause(self):
+        for driver in self.drivers:
+            driver.pause()
+
+    def start(self):
+        for driver in self.drivers:
+            driver.start()
+
+    def stop(self, timeout_ms = 5000):
+        for driver in self.drivers:
+            driver.stop()
+        self.threadpool.waitForDone(timeout_ms)
+
+    def _on_result(self, reader, results):
+        if not results:
+            # A driver's run() ends with its return value, None
+            return
+        emitted = self.drivers[reader].last_emit
+        if emitted is not None:
+            self.metrics_delivery.observe(time.monotonic() - emitted)
+        if self.awaiting_ack:
+            self.metrics_coalesced.inc()
+        offset = self.offsets[reader]
+        for antenna, count in results.items():
+            self.pending[offset + antenna] = count
+        if not self.merge_timer.isActive():
+            self.merge_timer.start(self.merge_ms)
+
+    def acknowledge(self):
+        """
+        Called by the receiver once it handled a change set, releases the coalesced one if any.
+        """
+        self.awaiting_ack = False
+        if self.pending and not self.merge_timer.isActive():
+            # From the event loop, the receiver is usually still on the stack here
+            self.merge_timer.start(0)
+
+    def _emit(self):
+        if not self.pending or self.awaiting_ack:
+            # Kept, and merged with later results, until the last change set is acknowledged
+            return
+        changes, self.pending = self.pending, {}
+        self.awaiting_ack = True
+        self.signals.result.emit(changes)
+
+    def _on_finished(self, reader):
+        self.running.discard(reader)
+        if self.drivers[reader].backend.exhausted:
+            logger.info(f"Reader {reader} replayed {self.drivers[reader].device}")
+        elif not self.drivers[reader].stop_flag:
+            logger.error(f"Reader {reader} on {self.drivers[reader].device} stopped")
+        if not self.running:
+            self.signals.finished.emit()
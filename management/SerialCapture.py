@@ -0,0 +1,108 @@
+import gzip
+import json
+import struct
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SSCAP1\n"
+# Chunk record: microseconds since the capture started, chunk length, then the chunk bytes
+RECORD = struct.Struct("<QI")
+
+def _open(path, mode):
+    # .gz captures are compressed, a day of Zebra lines shrinks about tenfold
+    return gzip.open(path, mode) if str(path).endswith(".gz") else open(path, mode)
+
+
+class CaptureWriter(object):
+    """
+    Records the raw byte stream of a reader with arrival times to a capture file:
+    a magic line, one JSON header line (protocol, device, start time), then one
+    record per chunk as received from the serial port. Safe to write from the
+    ingest thread while another thread closes it.
+    Parameters:
+        path (str): capture file, compressed if it ends with .gz
+        protocol (str): reader protocol of the stream, "zebra" or "sr681"
+        device (str, optional): device the stream came from
+        flush_interval (float): seconds between flushes, bounds what a crash loses
+    """
+    def __init__(self, path, protocol, device = None, flush_interval = 1.0):
+        self.path = path
+        self.protocol = protocol
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.file = _open(path, "wb")
+        self.file.write(MAGIC)
+        self.file.write(json.dumps({"protocol": protocol, "device": device, "started": time.time()}).encode() + b"\n")
+        self.start = None
+        self.last_flush = time.monotonic()
+        self.chunks = 0
+        self.bytes = 0
+
+    def __str__(self):
+        return f"CaptureWriter({self.path}, chunks={self.chunks}, bytes={self.bytes})"
+
+    def write(self, timestamp, chunk):
+        """
+        Appends a chunk received at `timestamp` (monotonic time).
+        """
+        with self.lock:
+            if self.file is None:
+                return
+            if self.start is None:
+                self.start = timestamp
+            self.file.write(RECORD.pack(max(int((timestamp - self.start) * 1e6), 0), len(chunk)))
+            self.file.write(chunk)
+            self.chunks += 1
+            self.bytes += len(chunk)
+            if timestamp - self.last_flush > self.flush_interval:
+                self.file.flush()
+                self.last_flush = timestamp
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class CaptureReader(object):
+    """
+    Reads a capture file written by CaptureWriter.
+    header holds the JSON header; iterating yields (seconds since start, chunk).
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = _open(path, "rb")
+        if self.file.readline() != MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is not a capture file")
+        self.header = json.loads(self.file.readline())
+
+    @property
+    def protocol(self):
+        return self.header.get("protocol", "zebra")
+
+    def __iter__(self):
+        while True:
+            record = self.file.read(RECORD.size)
+            if len(record) < RECORD.size:
+                return
+            offset, length = RECORD.unpack(record)
+            chunk = self.file.read(length)
+            if len(chunk) < length:
+                # Truncated by a crash while recording
+                logger.warning(f"Capture {self.path} ends with a truncated chunk")
+                return
+            yield offset / 1e6, chunk
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,150 @@
+import threading
+import time
+import logging
+from collections import deque
+import serial
+
+logger = logging.getLogger(__name__)
+
+class SerialSession(object):
+    """
+    Long-lived reader session on a serial device.
+    A daemon ingest thread blocks on the port and appends timestamped chunks to a
+    bounded ring buffer. Scan cycles call take_window() to get everything that
+    arrived in the next time window, so windows run back to back and nothing is
+    lost while the consumer is busy.
+    Parameters:
+        device (str): serial device path, e.g. /dev/ttyUSB0
+        baudrate (int): serial baud rate
+        max_bytes (int): ring buffer capacity, oldest chunks are dropped beyond it
+        read_timeout (float): blocking read timeout, bounds the shutdown latency
+    """
+    def __init__(self, device, baudrate = 115200, max_bytes = 1 << 20, read_timeout = 0.5):
+        self.device = device
+        self.baudrate = baudrate
+        self.max_bytes = max_bytes
+        self.read_timeout = read_timeout
+
+        # Ring buffer of (arrival time, chunk), guarded by condition
+        self.buffer = deque()
+        self.buffered_bytes = 0
+        self.dropped_bytes = 0
+        self.condition = threading.Condition()
+
+        self.window_start = time.monotonic()
+        self.stop_flag = False
+        self.thread = None
+        # Optional CaptureWriter recording every chunk, see ReaderBackend.record
+        self.capture = None
+
+    def __str__(self):
+        return f"SerialSession({self.device}, buffered={self.buffered_bytes}, dropped={self.dropped_bytes})"
+
+    def open(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_flag = False
+        self.window_start = time.monotonic()
+        self.thread = threading.Thread(target=self._ingest, name=f"SerialSession({self.device})", daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.stop_flag = True
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(self.read_timeout * 2)
+
+    def _ingest(self):
+        failures = 0
+        while not self.stop_flag:
+            try:
+                with serial.Serial(self.device, baudrate=self.baudrate, timeout=self.read_timeout) as ser:
+                    logger.info(f"Opened serial session on {self.device}")
+                    failures = 0
+                    while not self.stop_flag:
+                        # Block until at least one byte arrives, then drain whatever is waiting
+                        chunk = ser.read(1)
+                        if not chunk:
+                            continue
+                        waiting = ser.in_waiting
+                        if waiting:
+                            chunk += ser.read(waiting)
+                        timestamp = time.monotonic()
+                        self._push(timestamp, chunk)
+                        capture = self.capture
+                        if capture is not None:
+                            capture.write(timestamp, chunk)
+            except (serial.SerialException, OSError) as e:
+                if failures == 0:
+                    logger.error(f"Serial session on {self.device} failed: {e}")
+                failures += 1
+                # Back off before reopening the port, up to 10 s between attempts
+                with self.condition:
+                    self.condition.wait(min(failures, 10))
+
+    def _push(self, timestamp, chunk):
+        with self.condition:
+            self.buffer.append((timestamp, chunk))
+            self.buffered_bytes += len(chunk)
+            while self.buffered_bytes > self.max_bytes:
+                _, dropped = self.buffer.popleft()
+                self.buffered_bytes -= len(dropped)
+                self.dropped_bytes += len(dropped)
+            # Wakes wait_for_data(), take_window() just checks its deadline again
+            self.condition.notify_all()
+
+    def peek(self, since):
+        """
+        Returns the buffered bytes that arrived after `since` (monotonic time) without consuming them.
+        """
+        with self.condition:
+            return b''.join(chunk for timestamp, chunk in self.buffer if timestamp >= since)
+
+    def wait_for_data(self, timeout):
+        """
+        Blocks until a new chunk arrives, the session closes or `timeout` seconds pass.
+        """
+        with self.condition:
+            self.condition.wait(timeout)
+
+    def take_window(self, duration):
+        """
+        Blocks until the current window of `duration` seconds has elapsed and returns
+        the bytes that arrived in it. The next window starts where this one ended.
+        If the consumer fell more than a window behind (e.g. while paused), stale data
+        is discarded and the window restarts from one duration ago.
+        """
+        with self.condition:
+            now = time.monotonic()
+            if now - self.window_start > 2 * duration:
+                self.window_start = now - duration
+                self._discard_before(self.window_start)
+            window_end = self.window_start + duration
+            while not self.stop_flag:
+                remaining = window_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+
+            chunks = []
+            while self.buffer and self.buffer[0][0] < window_end:
+                _, chunk = self.buffer.popleft()
+                self.buffered_bytes -= len(chunk)
+                chunks.append(chunk)
+            self.window_start = window_end
+        return b''.join(chunks)
+
+    def restart_window(self):
+        """
+        Drops buffered data and starts the next window now, e.g. right before a triggered read.
+        """
+        with self.condition:
+            self.window_start = time.monotonic()
+            self._discard_before(self.window_start)
+
+    def _discard_before(self, timestamp):
+        # Caller holds the condition lock
+        while self.buffer and self.buffer[0][0] < timestamp:
+            _, chunk = self.buffer.popleft()
+            self.buffered_bytes -= len(chunk)
@@ -0,0 +1,114 @@
+import json
+
+# Google recommends keeping request payloads below 2 MB
+MAX_REQUEST_BYTES = 2_000_000
+MAX_REQUEST_CELLS = 100_000
+
+def column_letter(index):
+    """
+    Returns the A1 column letters of 0-based sheet column index: 0 -> A, 25 -> Z, 26 -> AA, 701 -> ZZ, 702 -> AAA.
+    """
+    if index < 0:
+        raise ValueError(f"Invalid column index {index}")
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def a1_range(sheet_name, top, left, bottom, right):
+    """
+    Returns the A1 range of the 0-based inclusive sheet rectangle, a single cell if it has one.
+    """
+    if not sheet_name.replace("_", "").isalnum():
+        # Names with spaces or punctuation are quoted, quotes inside doubled
+        sheet_name = "'" + sheet_name.replace("'", "''") + "'"
+    start = f"{column_letter(left)}{top + 1}"
+    if (top, left) == (bottom, right):
+        return f"{sheet_name}!{start}"
+    return f"{sheet_name}!{start}:{column_letter(right)}{bottom + 1}"
+
+def _runs(lines):
+    # Splits each line {position: value} into runs of consecutive positions,
+    # returns {(line, first, last): [values]}
+    runs = {}
+    for line, cells in lines.items():
+        positions = sorted(cells)
+        start = previous = positions[0]
+        for position in positions[1:] + [None]:
+            if position is not None and position == previous + 1:
+                previous = position
+                continue
+            runs[(line, start, previous)] = [cells[p] for p in range(start, previous + 1)]
+            if position is not None:
+                start = previous = position
+    return runs
+
+def _rectangles(cells, by_rows):
+    # Coalesces runs along rows (or columns) and stacks identical spans of adjacent lines,
+    # returns [(top, left, bottom, right, values)] with values in row-major order
+    lines = {}
+    for (row, column), value in cells.items():
+        line, position = (row, column) if by_rows else (column, row)
+        lines.setdefault(line, {})[position] = value
+
+    rectangles = []
+    open_blocks = {}    # (first, last) -> [first line, last line, [values per line], first, last]
+    runs = _runs(lines)
+    for line, first, last in sorted(runs):
+        block = open_blocks.get((first, last))
+        if block is not None and block[1] == line - 1:
+            block[1] = line
+            block[2].append(runs[(line, first, last)])
+            continue
+        if block is not None:
+            rectangles.append(block)
+        open_blocks[(first, last)] = [line, line, [runs[(line, first, last)]], first, last]
+    rectangles.extend(open_blocks.values())
+
+    result = []
+    for first_line, last_line, values, first, last in rectangles:
+        if by_rows:
+            result.append((first_line, first, last_line, last, values))
+        else:
+            # Lines are columns here, transpose the values back to rows
+            result.append((first, first_line, last, last_line, [list(row) for row in zip(*values)]))
+    return result
+
+def encode(sheet_name, deltas, row_offset = 1, column_offset = 1):
+    """
+    Encodes table deltas {(row, column): value} as batchUpdate value ranges.
+    Changed cells are merged into rectangles of contiguous cells, both along rows and
+    along columns, and whichever gives the smaller payload is used. Unchanged cells are
+    never written. row_offset and column_offset map table coordinates to sheet
+    coordinates, by default skipping the header row and column.
+    """
+    cells = {(row + row_offset, column + column_offset): value for (row, column), value in deltas.items()}
+    if not cells:
+        return []
+    candidates = []
+    for by_rows in (True, False):
+        candidates.append([{"range": a1_range(sheet_name, top, left, bottom, right), "values": values}
+                           for top, left, bottom, right, values in _rectangles(cells, by_rows)])
+    return min(candidates, key=lambda data: len(json.dumps(data)))
+
+def chunk(data, max_bytes = MAX_REQUEST_BYTES, max_cells = MAX_REQUEST_CELLS):
+    """
+    Splits value ranges into consecutive chunks that each fit in one batchUpdate request.
+    A single range larger than the limits gets a chunk of its own.
+    """
+    chunks = []
+    current, size, count = [], 0, 0
+    for value_range in data:
+        range_size = len(json.dumps(value_range)) + 2
+        range_cells = sum(len(row) for row in value_range["values"])
+        if current and (size + range_size > max_bytes or count + range_cells > max_cells):
+            chunks.append(current)
+            current, size, count = [], 0, 0
+        current.append(value_range)
+        size += range_size
+        count += range_cells
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,218 @@
+import numpy as np
+from PyQt6 import QtCore
+from PyQt6.QtCore import Qt
+
+class SheetTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model rendering the sheet straight from two object arrays:
+        initial: values last known to be in Google Sheets
+        current: values shown and edited locally
+    Cells whose current value differs from the initial one are drawn with the
+    highlight brush; nothing is stored per cell besides the two arrays.
+    apply_remote() patches a freshly fetched sheet in place and flags cells where
+    the sheet changed under an unsaved local edit as conflicts.
+    Edits made through the view are not applied here, they are emitted as
+    cellEdited so the application can record them and call set_cells().
+    Parameters:
+        highlight (QBrush): foreground for unsaved cells
+        conflict (QBrush, optional): background for cells in conflict with the sheet
+    """
+    cellEdited = QtCore.pyqtSignal(int, int, str)
+
+    ALIGNMENT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+    CHANGED_ROLES = [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ForegroundRole,
+                     Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole]
+
+    def __init__(self, highlight, conflict = None, parent = None):
+        super().__init__(parent)
+        self.highlight = highlight
+        self.conflict = conflict
+        self.conflicts = {}     # (row, column) -> remote value that lost against a local edit
+        self.initial = np.ndarray((0, 0), dtype=object)
+        self.current = self.initial.copy()
+        self.row_headers = []
+        self.column_headers = []
+
+    def load(self, data):
+        """
+        Replaces the whole table with sheet rows as returned by fetch_sheets,
+        the first row and column being the headers.
+        """
+        initial = self._parse(data)
+        self.beginResetModel()
+        self.initial = initial
+        self.current = initial.copy()
+        self.conflicts = {}
+        self.column_headers, self.row_headers = self._headers(data)
+        self.endResetModel()
+
+    @staticmethod
+    def _parse(data):
+        rows = max(len(data) - 1, 0)
+        columns = max(len(data[0]) - 1, 0) if data else 0
+        values = np.ndarray((rows, columns), dtype=object)
+        for row, row_data in enumerate(data[1:]):
+            cells = row_data[1:columns + 1]
+            values[row, :len(cells)] = cells
+        return values
+
+    @staticmethod
+    def _headers(data):
+        column_headers = list(data[0][1:]) if data else []
+        row_headers = [row_data[0] if row_data else "" for row_data in data[1:]]
+        return column_headers, row_headers
+
+    def apply_remote(self, data):
+        """
+        Patches the table with freshly fetched sheet rows without resetting the view.
+        Rows and columns are added or removed at the end, and only cells whose remote value
+        changed are updated. Unsaved local edits are kept: where the sheet changed under one,
+        the local value stays and the cell is flagged as a conflict.
+        Returns a list of (row, column, local value, remote value) conflicts, remote value
+        being None for edited cells whose row or column was removed from the sheet.
+        """
+        remote = self._parse(data)
+        rows, columns = remote.shape
+        old_rows, old_columns = self.current.shape
+        conflicts = []
+
+        # Local edits in rows or columns that no longer exist are lost, report them
+        for row, column in self.dirty_cells():
+            if row >= rows or column >= columns:
+                conflicts.append((int(row), int(column), self.current[row, column], None))
+
+        self._resize(rows, columns)
+
+        # Cells that were added by the resize are taken from the sheet as they are
+        self.initial[old_rows:, :] = remote[old_rows:, :]
+        self.initial[:, old_columns:] = remote[:, old_columns:]
+        self.current[old_rows:, :] = remote[old_rows:, :]
+        self.current[:, old_columns:] = remote[:, old_columns:]
+
+        # Patch the cells that changed remotely in the overlapping part
+        changed = {}
+        for row, column in np.argwhere(self.initial != remote):
+            row, column = int(row), int(column)
+            value = remote[row, column]
+            local = self.current[row, column]
+            if local == self.initial[row, column] or local == value:
+                self.current[row, column] = value
+                self.conflicts.pop((row, column), None)
+            else:
+                self.conflicts[(row, column)] = value
+                conflicts.append((row, column, local, value))
+            self.initial[row, column] = value
+            changed[(row, column)] = value
+        self._emit_changed(changed)
+
+        column_headers, row_headers = self._headers(data)
+        if column_headers != self.column_headers:
+            self.column_headers = column_headers
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, max(columns - 1, 0))
+        if row_headers != self.row_headers:
+            self.row_headers = row_headers
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, 0, max(rows - 1, 0))
+        return conflicts
+
+    def _resize(self, rows, columns):
+        old_rows, old_columns = self.current.shape
+        self.conflicts = {cell: value for cell, value in self.conflicts.items()
+                          if cell[0] < rows and cell[1] < columns}
+        if rows < old_rows:
+            self.beginRemoveRows(QtCore.QModelIndex(), rows, old_rows - 1)
+            self.initial, self.current = self.initial[:rows], self.current[:rows]
+            self.endRemoveRows()
+        if columns < old_columns:
+            self.beginRemoveColumns(QtCore.QModelIndex(), columns, old_columns - 1)
+            self.initial, self.current = self.initial[:, :columns], self.current[:, :columns]
+            self.endRemoveColumns()
+        if rows > old_rows:
+            self.beginInsertRows(QtCore.QModelIndex(), old_rows, rows - 1)
+            self.initial = np.vstack([self.initial, np.ndarray((rows - old_rows, self.initial.shape[1]), dtype=object)])
+            self.current = np.vstack([self.current, np.ndarray((rows - old_rows, self.current.shape[1]), dtype=object)])
+            self.endInsertRows()
+        if columns > old_columns:
+            self.beginInsertColumns(QtCore.QModelIndex(), old_columns, columns - 1)
+            self.initial = np.hstack([self.initial, np.ndarray((self.initial.shape[0], columns - old_columns), dtype=object)])
+            self.current = np.hstack([self.current, np.ndarray((self.current.shape[0], columns - old_columns), dtype=object)])
+            self.endInsertColumns()
+
+    def rowCount(self, parent = QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.current.shape[0]
+
+    def columnCount(self, parent = QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self.current.shape[1]
+
+    def data(self, index, role = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            value = self.current[row, column]
+            return "" if value is None else value
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.highlight if self.current[row, column] != self.initial[row, column] else None
+        if role == Qt.ItemDataRole.BackgroundRole and (row, column) in self.conflicts:
+            return self.conflict
+        if role == Qt.ItemDataRole.ToolTipRole and (row, column) in self.conflicts:
+            return f"Changed in Google Sheets to \"{self.conflicts[(row, column)]}\" while edited here"
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return self.ALIGNMENT
+        return None
+
+    def headerData(self, section, orientation, role = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        headers = self.column_headers if orientation == Qt.Orientation.Horizontal else self.row_headers
+        return headers[section] if section < len(headers) else str(section + 1)
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role = Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        self.cellEdited.emit(index.row(), index.column(), str(value))
+        return True
+
+    def set_cells(self, cells: dict):
+        """
+        Sets current values for {(row, column): value} and repaints only those cells.
+        """
+        for (row, column), value in cells.items():
+            self.current[row, column] = value
+            # Editing a conflicting cell resolves the conflict in favor of the new value
+            self.conflicts.pop((row, column), None)
+        self._emit_changed(cells)
+
+    def mark_saved(self, cells: dict):
+        """
+        Records {(row, column): value} as written to Google Sheets, which clears the
+        highlight of cells that still hold that value.
+        Cells out of range, when a reload shrank the table during the push, are dropped.
+        """
+        rows, columns = self.current.shape
+        cells = {(row, column): value for (row, column), value in cells.items() if row < rows and column < columns}
+        for (row, column), value in cells.items():
+            self.initial[row, column] = value
+            self.conflicts.pop((row, column), None)
+        self._emit_changed(cells)
+
+    def dirty_cells(self):
+        return np.argwhere(self.initial != self.current)
+
+    def _emit_changed(self, cells):
+        # One dataChanged per run of consecutive rows in a column
+        by_column = {}
+        for row, column in cells:
+            by_column.setdefault(column, []).append(row)
+        for column, rows in by_column.items():
+            rows.sort()
+            start = previous = rows[0]
+            for row in rows[1:] + [None]:
+                if row is not None and row == previous + 1:
+                    previous = row
+                    continue
+                self.dataChanged.emit(self.index(start, column), self.index(previous, column), self.CHANGED_ROLES)
+                if row is not None:
+                    start = previous = row
@@ -0,0 +1,77 @@
+import os
+import threading
+import logging
+import httplib2
+import google_auth_httplib2
+from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+
+class SheetsClient(object):
+    """
+    Process-wide Google Sheets client.
+    The service account credentials and their access token are loaded once and
+    refreshed under a lock, the API surface is built from the discovery document
+    bundled with google-api-python-client (no discovery round trip), and each
+    worker thread keeps its own keep-alive HTTP connection since httplib2 is not
+    thread-safe. Use SheetsClient.instance() instead of constructing it directly.
+    Parameters:
+        credentials_path (str): service account json file, defaults to $CREDENTIALS_PATH
+        timeout (float): socket timeout for API requests in seconds
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, credentials_path = None, timeout = 30):
+        self.credentials_path = credentials_path or os.getenv("CREDENTIALS_PATH")
+        self.timeout = timeout
+        self.credentials = Credentials.from_service_account_file(self.credentials_path, scopes=SCOPES)
+        self.service = build('sheets', 'v4', credentials=self.credentials,
+                             cache_discovery=False, static_discovery=True)
+        self._token_lock = threading.Lock()
+        self._local = threading.local()
+        logger.info("Created Google Sheets client")
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _http(self):
+        # One authorized connection per thread, reused across requests
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=self.timeout))
+            self._local.http = http
+        return http
+
+    def _execute(self, request):
+        http = self._http()
+        # Refresh the shared token once for all threads instead of racing on expiry
+        with self._token_lock:
+            if not self.credentials.valid:
+                self.credentials.refresh(google_auth_httplib2.Request(http.http))
+        return request.execute(http=http, num_retries=2)
+
+    def get_values(self, spreadsheet_id, range_name):
+        """
+        Returns the cell values of range_name as a list of rows.
+        """
+        request = self.service.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=range_name)
+        return self._execute(request).get('values', [])
+
+    def batch_update_values(self, spreadsheet_id, data, value_input_option = "USER_ENTERED"):
+        """
+        Writes a list of {"range": ..., "values": [[...]]} entries in one batchUpdate call.
+        """
+        body = {
+            "data": data,
+            "valueInputOption": value_input_option
+        }
+        request = self.service.spreadsheets().values().batchUpdate(spreadsheetId=spreadsheet_id, body=body)
+        return self._execute(request)
@@ -0,0 +1,463 @@
+# Form implementation generated from reading ui file 'src/Smart_Shelving_System.ui'
+#
+# Created by: PyQt6 UI code generator 6.11.0
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic6 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt6 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(987, 722)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(-1)
+        MainWindow.setFont(font)
+        MainWindow.setStyleSheet("QWidget {\n"
+"    font-size: 20px;\n"
+"    background-color: #060070;\n"
+"    color: white;\n"
+"    font-family: \'Arial\';\n"
+"}\n"
+"\n"
+"QLabel {\n"
+"    background-color: #060070;\n"
+"    color: white;\n"
+"    font-family: \'Arial\';\n"
+"}\n"
+"\n"
+"QPushButton {\n"
+"    font-size: 20px;\n"
+"    background-color: #5B00A6; /* Dark Purple */\n"
+"    color: white;\n"
+"}\n"
+"\n"
+"QPlainTextEdit {\n"
+"    font-size: 16px;\n"
+"    font-family: \'DejaVu Sans Mono\';\n"
+"    background-color: #5B00A6; /* Dark Purple */\n"
+"    color: white;\n"
+"}\n"
+"\n"
+"QLineEdit {\n"
+"    font-family: \'DejaVu Sans Mono\';\n"
+"    background-color: #5B00A6;\n"
+"    color: white;\n"
+"}\n"
+"\n"
+"QTableView {\n"
+"    background-color: #9591FF; /* Light blue */\n"
+"    alternate-background-color: #C891FF; /* Lighter purple */\n"
+"    color: black;\n"
+"}\n"
+"\n"
+"QTableWidgetItem {\n"
+"    font-size: 32px;\n"
+"}\n"
+"\n"
+"QTableView::item:selected {\n"
+"    font-size: 24px;\n"
+"    background-color: #FFFEA6; /* Light Yellow */\n"
+"    color: black;         \n"
+"}\n"
+"\n"
+"QHeaderView::section:horizontal {\n"
+"    font-size: 20px;\n"
+"    background-color: #0800FF /* Blue */\n"
+"}\n"
+"\n"
+"QHeaderView::section:vertical {\n"
+"    font-size: 20px;\n"
+"    background-color: #8000FF /* Purple */\n"
+"}\n"
+"\n"
+"QTableCornerButton::section {\n"
+"    background-color: #0800FF /* Blue */\n"
+"}\n"
+"QMenuBar {\n"
+"    font-size: 16px;\n"
+"    background-color:  #200090\n"
+"}\n"
+"QMenu {\n"
+"    font-size: 16px;\n"
+"    background-color:  #200090\n"
+"}\n"
+"QStatusBar {\n"
+"    font-size: 16px;\n"
+"    background-color:  #200090\n"
+"}")
+        MainWindow.setLocale(QtCore.QLocale(QtCore.QLocale.Language.English, QtCore.QLocale.Country.UnitedStates))
+        self.centralwidget = QtWidgets.QWidget(parent=MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.horizontalLayout_2 = QtWidgets.QHBoxLayout(self.centralwidget)
+        self.horizontalLayout_2.setObjectName("horizontalLayout_2")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.verticalLayout = QtWidgets.QVBoxLayout()
+        self.verticalLayout.setObjectName("verticalLayout")
+        spacerItem = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.verticalLayout.addItem(spacerItem)
+        self.label = QtWidgets.QLabel(parent=self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(-1)
+        font.setBold(True)
+        self.label.setFont(font)
+        self.label.setStyleSheet("QLabel {\n"
+"    font-size: 36px;\n"
+"    background-color: #060070;\n"
+"    color: white;\n"
+"    font-family: \'Arial\';\n"
+"}")
+        self.label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.label.setObjectName("label")
+        self.verticalLayout.addWidget(self.label)
+        spacerItem1 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.verticalLayout.addItem(spacerItem1)
+        self.tableWidget = QtWidgets.QTableView(parent=self.centralwidget)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.tableWidget.sizePolicy().hasHeightForWidth())
+        self.tableWidget.setSizePolicy(sizePolicy)
+        palette = QtGui.QPalette()
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.WindowText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.Button, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.Text, brush)
+        brush = QtGui.QBrush(QtGui.QColor(255, 101, 113))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.BrightText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.ButtonText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.Base, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.Window, brush)
+        brush = QtGui.QBrush(QtGui.QColor(200, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.AlternateBase, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0, 128))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Active, QtGui.QPalette.ColorRole.PlaceholderText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.WindowText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.Button, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.Text, brush)
+        brush = QtGui.QBrush(QtGui.QColor(255, 101, 113))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.BrightText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.ButtonText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.Base, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.Window, brush)
+        brush = QtGui.QBrush(QtGui.QColor(200, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.AlternateBase, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0, 128))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Inactive, QtGui.QPalette.ColorRole.PlaceholderText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.WindowText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.Button, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.Text, brush)
+        brush = QtGui.QBrush(QtGui.QColor(255, 101, 113))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.BrightText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.ButtonText, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.Base, brush)
+        brush = QtGui.QBrush(QtGui.QColor(149, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.Window, brush)
+        brush = QtGui.QBrush(QtGui.QColor(200, 145, 255))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.AlternateBase, brush)
+        brush = QtGui.QBrush(QtGui.QColor(0, 0, 0, 128))
+        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+        palette.setBrush(QtGui.QPalette.ColorGroup.Disabled, QtGui.QPalette.ColorRole.PlaceholderText, brush)
+        self.tableWidget.setPalette(palette)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(-1)
+        self.tableWidget.setFont(font)
+        self.tableWidget.setMouseTracking(False)
+        self.tableWidget.setObjectName("tableWidget")
+        self.verticalLayout.addWidget(self.tableWidget)
+        self.verticalLayout_2.addLayout(self.verticalLayout)
+        spacerItem2 = QtWidgets.QSpacerItem(40, 20, QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Minimum)
+        self.verticalLayout_2.addItem(spacerItem2)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.saveButton = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.saveButton.setObjectName("saveButton")
+        self.horizontalLayout.addWidget(self.saveButton)
+        self.reloadButton = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.reloadButton.setObjectName("reloadButton")
+        self.horizontalLayout.addWidget(self.reloadButton)
+        self.verticalLayout_2.addLayout(self.horizontalLayout)
+        self.horizontalLayout_2.addLayout(self.verticalLayout_2)
+        self.line = QtWidgets.QFrame(parent=self.centralwidget)
+        self.line.setFrameShape(QtWidgets.QFrame.Shape.VLine)
+        self.line.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
+        self.line.setObjectName("line")
+        self.horizontalLayout_2.addWidget(self.line)
+        self.verticalLayout_5 = QtWidgets.QVBoxLayout()
+        self.verticalLayout_5.setObjectName("verticalLayout_5")
+        self.ConsoleDisplay = QtWidgets.QPlainTextEdit(parent=self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("DejaVu Sans Mono")
+        font.setPointSize(-1)
+        self.ConsoleDisplay.setFont(font)
+        self.ConsoleDisplay.setReadOnly(True)
+        self.ConsoleDisplay.setObjectName("ConsoleDisplay")
+        self.verticalLayout_5.addWidget(self.ConsoleDisplay)
+        self.ConsoleInput = QtWidgets.QLineEdit(parent=self.centralwidget)
+        font = QtGui.QFont()
+        font.setFamily("DejaVu Sans Mono")
+        font.setPointSize(-1)
+        self.ConsoleInput.setFont(font)
+        self.ConsoleInput.setObjectName("ConsoleInput")
+        self.verticalLayout_5.addWidget(self.ConsoleInput)
+        self.horizontalLayout_2.addLayout(self.verticalLayout_5)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(parent=MainWindow)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 987, 37))
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(-1)
+        self.menubar.setFont(font)
+        self.menubar.setObjectName("menubar")
+        self.menuSmart_Shelving_System = QtWidgets.QMenu(parent=self.menubar)
+        self.menuSmart_Shelving_System.setObjectName("menuSmart_Shelving_System")
+        self.menuFile = QtWidgets.QMenu(parent=self.menubar)
+        self.menuFile.setObjectName("menuFile")
+        self.menuEdit = QtWidgets.QMenu(parent=self.menubar)
+        self.menuEdit.setObjectName("menuEdit")
+        self.menuSettings = QtWidgets.QMenu(parent=self.menubar)
+        self.menuSettings.setObjectName("menuSettings")
+        self.menuData_filtering = QtWidgets.QMenu(parent=self.menuSettings)
+        font = QtGui.QFont()
+        font.setFamily("Arial")
+        font.setPointSize(-1)
+        self.menuData_filtering.setFont(font)
+        self.menuData_filtering.setObjectName("menuData_filtering")
+        MainWindow.setMenuBar(self.menubar)
+        self.statusbar = QtWidgets.QStatusBar(parent=MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+        self.actionAbout = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.HelpAbout)
+        self.actionAbout.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionAbout.setFont(font)
+        self.actionAbout.setObjectName("actionAbout")
+        self.actionHelp = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.HelpFaq)
+        self.actionHelp.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionHelp.setFont(font)
+        self.actionHelp.setObjectName("actionHelp")
+        self.actionExit = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.SystemLogOut)
+        self.actionExit.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionExit.setFont(font)
+        self.actionExit.setObjectName("actionExit")
+        self.actionNew = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.DocumentNew)
+        self.actionNew.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionNew.setFont(font)
+        self.actionNew.setObjectName("actionNew")
+        self.actionOpen = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.DocumentOpen)
+        self.actionOpen.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionOpen.setFont(font)
+        self.actionOpen.setObjectName("actionOpen")
+        self.actionSave = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.DocumentSave)
+        self.actionSave.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionSave.setFont(font)
+        self.actionSave.setObjectName("actionSave")
+        self.actionUndo = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.EditUndo)
+        self.actionUndo.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionUndo.setFont(font)
+        self.actionUndo.setShortcutVisibleInContextMenu(False)
+        self.actionUndo.setObjectName("actionUndo")
+        self.actionRedo = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.EditRedo)
+        self.actionRedo.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionRedo.setFont(font)
+        self.actionRedo.setObjectName("actionRedo")
+        self.actionCut = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.EditCut)
+        self.actionCut.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionCut.setFont(font)
+        self.actionCut.setObjectName("actionCut")
+        self.actionCopy = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.EditCopy)
+        self.actionCopy.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionCopy.setFont(font)
+        self.actionCopy.setObjectName("actionCopy")
+        self.actionPaste = QtGui.QAction(parent=MainWindow)
+        icon = QtGui.QIcon.fromTheme(QtGui.QIcon.ThemeIcon.EditPaste)
+        self.actionPaste.setIcon(icon)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionPaste.setFont(font)
+        self.actionPaste.setObjectName("actionPaste")
+        self.actionSettings = QtGui.QAction(parent=MainWindow)
+        self.actionSettings.setObjectName("actionSettings")
+        self.actionAuto_save = QtGui.QAction(parent=MainWindow)
+        self.actionAuto_save.setCheckable(True)
+        self.actionAuto_save.setChecked(True)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionAuto_save.setFont(font)
+        self.actionAuto_save.setObjectName("actionAuto_save")
+        self.actionWarn_inventory_change = QtGui.QAction(parent=MainWindow)
+        self.actionWarn_inventory_change.setCheckable(True)
+        self.actionWarn_inventory_change.setChecked(True)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionWarn_inventory_change.setFont(font)
+        self.actionWarn_inventory_change.setObjectName("actionWarn_inventory_change")
+        self.actionSave_on_exit = QtGui.QAction(parent=MainWindow)
+        self.actionSave_on_exit.setCheckable(True)
+        self.actionSave_on_exit.setChecked(True)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionSave_on_exit.setFont(font)
+        self.actionSave_on_exit.setObjectName("actionSave_on_exit")
+        self.actionNone = QtGui.QAction(parent=MainWindow)
+        self.actionNone.setCheckable(True)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionNone.setFont(font)
+        self.actionNone.setObjectName("actionNone")
+        self.actionLPF_window = QtGui.QAction(parent=MainWindow)
+        self.actionLPF_window.setCheckable(True)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionLPF_window.setFont(font)
+        self.actionLPF_window.setObjectName("actionLPF_window")
+        self.actionHMM_Viterbi = QtGui.QAction(parent=MainWindow)
+        self.actionHMM_Viterbi.setCheckable(True)
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        self.actionHMM_Viterbi.setFont(font)
+        self.actionHMM_Viterbi.setObjectName("actionHMM_Viterbi")
+        self.menuSmart_Shelving_System.addAction(self.actionAbout)
+        self.menuSmart_Shelving_System.addSeparator()
+        self.menuSmart_Shelving_System.addAction(self.actionHelp)
+        self.menuSmart_Shelving_System.addAction(self.actionExit)
+        self.menuFile.addAction(self.actionNew)
+        self.menuFile.addAction(self.actionOpen)
+        self.menuFile.addAction(self.actionSave)
+        self.menuEdit.addAction(self.actionUndo)
+        self.menuEdit.addAction(self.actionRedo)
+        self.menuEdit.addSeparator()
+        self.menuEdit.addAction(self.actionCut)
+        self.menuEdit.addAction(self.actionCopy)
+        self.menuEdit.addAction(self.actionPaste)
+        self.menuData_filtering.addAction(self.actionNone)
+        self.menuData_filtering.addAction(self.actionLPF_window)
+        self.menuData_filtering.addAction(self.actionHMM_Viterbi)
+        self.menuSettings.addAction(self.actionAuto_save)
+        self.menuSettings.addAction(self.actionWarn_inventory_change)
+        self.menuSettings.addAction(self.actionSave_on_exit)
+        self.menuSettings.addSeparator()
+        self.menuSettings.addAction(self.menuData_filtering.menuAction())
+        self.menubar.addAction(self.menuSmart_Shelving_System.menuAction())
+        self.menubar.addAction(self.menuFile.menuAction())
+        self.menubar.addAction(self.menuEdit.menuAction())
+        self.menubar.addAction(self.menuSettings.menuAction())
+
+        self.retranslateUi(MainWindow)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "Inventory Management"))
+        self.label.setText(_translate("MainWindow", "Inventory"))
+        self.saveButton.setText(_translate("MainWindow", "Save"))
+        self.reloadButton.setText(_translate("MainWindow", "Reload From Google"))
+        self.menuSmart_Shelving_System.setTitle(_translate("MainWindow", "Intellitory"))
+        self.menuFile.setTitle(_translate("MainWindow", "File"))
+        self.menuEdit.setTitle(_translate("MainWindow", "Edit"))
+        self.menuSettings.setTitle(_translate("MainWindow", "Settings"))
+        self.menuData_filtering.setTitle(_translate("MainWindow", "Tags filtering"))
+        self.actionAbout.setText(_translate("MainWindow", "About"))
+        self.actionHelp.setText(_translate("MainWindow", "Help"))
+        self.actionExit.setText(_translate("MainWindow", "Exit"))
+        self.actionNew.setText(_translate("MainWindow", "New"))
+        self.actionNew.setShortcut(_translate("MainWindow", "Ctrl+N"))
+        self.actionOpen.setText(_translate("MainWindow", "Open"))
+        self.actionOpen.setShortcut(_translate("MainWindow", "Ctrl+O"))
+        self.actionSave.setText(_translate("MainWindow", "Save"))
+        self.actionSave.setShortcut(_translate("MainWindow", "Ctrl+S"))
+        self.actionUndo.setText(_translate("MainWindow", "Undo"))
+        self.actionUndo.setShortcut(_translate("MainWindow", "Ctrl+Z"))
+        self.actionRedo.setText(_translate("MainWindow", "Redo"))
+        self.actionRedo.setShortcut(_translate("MainWindow", "Ctrl+Shift+Z"))
+        self.actionCut.setText(_translate("MainWindow", "Cut"))
+        self.actionCut.setShortcut(_translate("MainWindow", "Ctrl+X"))
+        self.actionCopy.setText(_translate("MainWindow", "Copy"))
+        self.actionCopy.setShortcut(_translate("MainWindow", "Ctrl+C"))
+        self.actionPaste.setText(_translate("MainWindow", "Paste"))
+        self.actionPaste.setShortcut(_translate("MainWindow", "Ctrl+V"))
+        self.actionSettings.setText(_translate("MainWindow", "Settings"))
+        self.actionAuto_save.setText(_translate("MainWindow", "Auto save"))
+        self.actionWarn_inventory_change.setText(_translate("MainWindow", "Warn inventory change"))
+        self.actionSave_on_exit.setText(_translate("MainWindow", "Save on exit"))
+        self.actionNone.setText(_translate("MainWindow", "None"))
+        self.actionLPF_window.setText(_translate("MainWindow", "LPF window"))
+        self.actionHMM_Viterbi.setText(_translate("MainWindow", "HMM Viterbi"))
@@ -0,0 +1,73 @@
+class TagInterner(object):
+    """
+    Maps every EPC to a small integer ID when it is first parsed, so trackers, detection
+    sets and change sets hash and store ints instead of EPC bytes. The EPC is kept once
+    here and only looked up again for display.
+    IDs are reference counted by the tracker table: an ID is freed and reused once no
+    tracker holds it, and IDs that were parsed but never tracked (reads from antennas
+    outside the configured range, or outside a focused scan) are freed by sweep().
+    Not thread-safe: every reader has its own interner, used from its scanner thread.
+    Only lookup() may be called from other threads, for display.
+    """
+    def __init__(self):
+        self.ids = {}           # epc -> id
+        self.epcs = []          # id -> epc, None for free IDs
+        self.references = []    # id -> number of trackers holding it
+        self.free_ids = []
+        self.fresh = []         # IDs interned since the last sweep
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __str__(self):
+        return f"TagInterner(tags={len(self)}, capacity={len(self.epcs)})"
+
+    def intern(self, epc):
+        id = self.ids.get(epc)
+        if id is None:
+            if self.free_ids:
+                id = self.free_ids.pop()
+                self.epcs[id] = epc
+            else:
+                id = len(self.epcs)
+                self.epcs.append(epc)
+                self.references.append(0)
+            self.ids[epc] = id
+            self.fresh.append(id)
+        return id
+
+    def epc(self, id):
+        return self.epcs[id]
+
+    def lookup(self, id):
+        """
+        Returns the EPC of id for display from a thread other than the scanner's, None
+        when the ID was freed meanwhile. The race is accepted: an ID freed and reused
+        between listing the trackers and this lookup shows the new tag's EPC.
+        """
+        epcs = self.epcs
+        epc = epcs[id] if id < len(epcs) else None
+        return epc if epc is not None and self.ids.get(epc) == id else None
+
+    def acquire(self, id):
+        self.references[id] += 1
+
+    def release(self, id):
+        self.references[id] -= 1
+        if self.references[id] == 0:
+            self._free(id)
+
+    def sweep(self):
+        """
+        Frees the IDs interned since the last sweep that no tracker holds.
+        Costs O(newly interned), call it after each tracker update.
+        """
+        for id in self.fresh:
+            if self.references[id] == 0 and self.epcs[id] is not None:
+                self._free(id)
+        self.fresh.clear()
+
+    def _free(self, id):
+        del self.ids[self.epcs[id]]
+        self.epcs[id] = None
+        self.free_ids.append(id)
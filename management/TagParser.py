@@ -0,0 +1,75 @@
+import re
+
+# Zebra serial frame, one per line: EPC,antenna,<hex>
+EPC = rb'[^,\r\n]+'
+FRAME = rb'^[ \t\r]*(%s),([12345678]+),<[0-9a-fA-F]{4}>[ \t\r]*$'
+# Longest unterminated line kept for the next chunk, anything longer is garbage
+MAX_PARTIAL = 1024
+
+class TagParser(object):
+    """
+    Parses Zebra tag lines straight from the bytes (or memoryview) read from the
+    serial port. The whole buffer is scanned by one compiled multiline pattern, so
+    no per-line strings are built and only the EPC and antenna fields are copied out.
+    feed() parses a stream window by window, holding back the unterminated line at
+    the end of a window until the next one completes it.
+    Parameters:
+        prefixes (list, optional): EPC prefixes to accept, e.g. ["E28069950000"].
+            Frames with any other EPC are rejected by the pattern itself.
+        interner (TagInterner, optional): returns interned integer tag IDs instead of EPC bytes
+    """
+    def __init__(self, prefixes = None, interner = None):
+        self.interner = interner
+        self.prefixes = [p.encode("ascii") if isinstance(p, str) else bytes(p) for p in (prefixes or [])]
+        if self.prefixes:
+            epc = rb'(?:%s)[^,\r\n]*' % b'|'.join(re.escape(p) for p in self.prefixes)
+        else:
+            epc = EPC
+        self.pattern = re.compile(FRAME % epc, re.MULTILINE)
+        self.partial = b""
+
+    def __str__(self):
+        return f"TagParser(prefixes={[p.decode('ascii') for p in self.prefixes]})"
+
+    def parse(self, buffer):
+        """
+        Returns a set of (antenna_num, tag) tuples, tag being the interned tag ID,
+        or the raw EPC bytes without interner.
+        """
+        # Deduplicate on the raw fields first so int() and interning only run once per distinct read
+        reads = set(self.pattern.findall(buffer))
+        if self.interner is None:
+            return {(int(antenna), epc) for epc, antenna in reads}
+        ids, intern = self.interner.ids, self.interner.intern
+        return {(int(antenna), ids[epc] if epc in ids else intern(epc)) for epc, antenna in reads}
+
+    def feed(self, buffer):
+        """
+        Parses the next window of a stream like parse(). The bytes after the last newline
+        are held back and parsed with the next window, so a line cut by the window
+        boundary is not lost.
+        """
+        first = buffer.find(b"\n")
+        if first < 0:
+            self.partial += bytes(buffer)
+            if len(self.partial) > MAX_PARTIAL:
+                self.partial = b""
+            return set()
+        last = buffer.rfind(b"\n")
+        tags = set()
+        start = 0
+        if self.partial:
+            # Only the line completing the held back bytes is copied
+            tags = self.parse(self.partial + bytes(buffer[:first + 1]))
+            start = first + 1
+        tags |= self.parse(memoryview(buffer)[start:last + 1])
+        self.partial = bytes(buffer[last + 1:])
+        if len(self.partial) > MAX_PARTIAL:
+            self.partial = b""
+        return tags
+
+    def reset(self):
+        """
+        Drops the held back bytes, when the stream is cut e.g. by a window restart.
+        """
+        self.partial = b""
@@ -0,0 +1,319 @@
+import numpy as np
+from enum import Enum
+
+class FilterMethod(Enum):
+    NoFiltering = 0
+    WindowLPF = 1
+    HMMViterbi = 2
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def from_string(cls, method_str):
+        try:
+            return cls[method_str]
+        except KeyError:
+            raise ValueError(f"Invalid filter method: {method_str}")
+
+# Default Viterbi model, row 0 = Present, row 1 = Absent
+VITERBI_A = np.array([
+    [0.95, 0.05],  # from Present
+    [0.05, 0.95]   # from Absent
+])
+VITERBI_B = np.array([
+    [0.1, 0.9],  # Present
+    [0.8, 0.2]   # Absent
+])
+VITERBI_INIT = np.array([0.05, 0.95])  # [Present, Absent]
+
+# Smallest probability allowed before taking logs, keeps log(0) out of the recursion
+MIN_PROBABILITY = 1e-300
+
+def to_log(probabilities) -> np.ndarray:
+    return np.log(np.clip(np.asarray(probabilities, dtype=float), MIN_PROBABILITY, 1.0))
+
+LOG_VITERBI_INIT = to_log(VITERBI_INIT)
+
+def validate_model(A, B):
+    """
+    Checks that A (transition) and B (observation) are 2x2 row-stochastic matrices
+    and returns them as arrays.
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    for name, matrix in (("A", A), ("B", B)):
+        if matrix.shape != (2, 2):
+            raise ValueError(f"Viterbi matrix {name} must be 2x2, got shape {matrix.shape}")
+        if np.any(matrix < 0) or not np.allclose(matrix.sum(axis=1), 1.0):
+            raise ValueError(f"Viterbi matrix {name} rows must be probabilities summing to 1: {matrix.tolist()}")
+    return A, B
+
+def viterbi_step(log_v, log_a, log_b_obs):
+    """
+    One normalized log-domain Viterbi step for many tags at once.
+    log_v:      (n, 2) previous log scores [Present, Absent]
+    log_a:      (n, 2, 2) or (2, 2) log transition matrices
+    log_b_obs:  (n, 2) log probability of each tag's observation in each state
+    Returns the new (n, 2) scores shifted so the best state of every tag is 0,
+    which keeps them bounded no matter how many scans have run.
+    """
+    # V[j] = max_k V_prev[k] + A[k, j] + B[j, obs]
+    log_v = np.max(log_v[:, :, None] + log_a, axis=1) + log_b_obs
+    return log_v - log_v.max(axis=1, keepdims=True)
+
+# Number of set bits for every byte value, fallback when np.bitwise_count is unavailable
+_POPCOUNT_LUT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _POPCOUNT_LUT[values.view(np.uint8)].reshape(len(values), -1).sum(axis=1)
+
+def _assign(target, value, scope):
+    # target[:] = value, restricted to the rows selected by the boolean scope if given
+    if scope is None:
+        target[:] = value
+    else:
+        target[scope] = value[scope]
+
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+class TagTable(object):
+    """
+    Tracker table for every (antenna, tag) pair seen by the scanner, stored as
+    dense NumPy columns indexed by row instead of one TagTracker object per tag.
+    Columns:
+        antenna:        antenna number of the row, -1 for free rows
+        history:        detection history bit-packed into a uint64, newest scan in bit 0
+        state:          current filtered presence
+        previous_state: presence before the last update
+        viterbi:        (rows, 2) normalized log Viterbi scores [Present, Absent]
+        last_seen:      antenna tick (scans of that antenna) of the last detection
+        last_scan:      update count at the last detection, orders rows for LRU eviction
+    update() advances every row by one scan in a single batched step.
+    The HMM model can be set per antenna with set_model().
+    Tags are interned integer IDs when an interner (TagInterner) is given, which then
+    counts one reference per row holding the ID; any hashable tag works without.
+    A row expires once its window holds no detection, window_size ticks of its antenna
+    after it was last seen. An expiry wheel per antenna keeps the rows seen at each tick
+    in window_size slots, the slot coming due again holds exactly the candidates, so
+    expiry costs O(detections) instead of a pass over every row.
+    With max_tags set, the least recently seen rows are evicted to make room for new
+    tags, keeping the table bounded however many distinct EPCs pass by the antennas.
+    """
+    def __init__(self, antenna_count, window_size = 3, capacity = 1024, interner = None, max_tags = None):
+        if not 1 <= window_size <= 64:
+            raise ValueError(f"Invalid window size: {window_size}")
+        self.antenna_count = antenna_count
+        self.window_size = window_size
+        self.window_mask = np.uint64((1 << window_size) - 1)
+        self.interner = interner
+        if max_tags is not None and max_tags < 1:
+            raise ValueError(f"Invalid tag cap: {max_tags}")
+        self.max_tags = max_tags
+        self.evicted = 0        # rows evicted by the last update
+
+        self.index = {}         # (antenna, tag) -> row
+        self.keys = []          # row -> (antenna, tag), None for free rows
+        self.free_rows = []
+        self.size = 0           # high-water mark of used rows
+
+        self.antenna = np.full(capacity, -1, dtype=np.int32)
+        self.history = np.zeros(capacity, dtype=np.uint64)
+        self.state = np.zeros(capacity, dtype=bool)
+        self.previous_state = np.zeros(capacity, dtype=bool)
+        self.viterbi = np.tile(LOG_VITERBI_INIT, (capacity, 1))
+        self.last_seen = np.zeros(capacity, dtype=np.int64)
+        self.last_scan = np.zeros(capacity, dtype=np.int64)
+
+        # Expiry wheel: slot tick % window_size of an antenna holds the rows seen at that
+        # tick, it comes due again window_size ticks later
+        self.ticks = np.zeros(antenna_count, dtype=np.int64)
+        self.wheel = [[_NO_ROWS] * window_size for _ in range(antenna_count)]
+        self.scans = 0
+
+        # Per-antenna log HMM model, indexed by the antenna column
+        self.log_a = np.tile(to_log(VITERBI_A), (antenna_count, 1, 1))
+        self.log_b = np.tile(to_log(VITERBI_B), (antenna_count, 1, 1))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __str__(self):
+        return f"TagTable(tags={len(self)}, capacity={len(self.antenna)})"
+
+    def _grow(self):
+        capacity = len(self.antenna) * 2
+        old = len(self.antenna)
+        self.antenna = np.concatenate([self.antenna, np.full(capacity - old, -1, dtype=np.int32)])
+        self.history = np.concatenate([self.history, np.zeros(capacity - old, dtype=np.uint64)])
+        self.state = np.concatenate([self.state, np.zeros(capacity - old, dtype=bool)])
+        self.previous_state = np.concatenate([self.previous_state, np.zeros(capacity - old, dtype=bool)])
+        self.viterbi = np.concatenate([self.viterbi, np.tile(LOG_VITERBI_INIT, (capacity - old, 1))])
+        self.last_seen = np.concatenate([self.last_seen, np.zeros(capacity - old, dtype=np.int64)])
+        self.last_scan = np.concatenate([self.last_scan, np.zeros(capacity - old, dtype=np.int64)])
+
+    def _allocate(self, key):
+        if self.free_rows:
+            row = self.free_rows.pop()
+            self.keys[row] = key
+        else:
+            if self.size == len(self.antenna):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.keys.append(key)
+        self.index[key] = row
+        self.antenna[row] = key[0]
+        if self.interner is not None:
+            self.interner.acquire(key[1])
+        return row
+
+    def _release(self, rows):
+        for row in rows:
+            key = self.keys[row]
+            del self.index[key]
+            self.keys[row] = None
+            if self.interner is not None:
+                self.interner.release(key[1])
+        self.antenna[rows] = -1
+        self.history[rows] = 0
+        self.state[rows] = False
+        self.previous_state[rows] = False
+        self.viterbi[rows] = LOG_VITERBI_INIT
+        self.free_rows.extend(rows.tolist())
+
+    def _make_room(self, detected):
+        """
+        Evicts the least recently seen rows so the new tags of a scan fit under max_tags.
+        Returns the detections to track: all of them unless a single scan holds more
+        distinct tags than the cap, the ones over it are then dropped; and the antennas
+        that lost a present tag, whose counts change.
+        """
+        if len(detected) > self.max_tags:
+            detected = list(detected)[:self.max_tags]
+        new = sum(1 for key in detected if key not in self.index)
+        excess = len(self.index) + new - self.max_tags
+        if excess > 0:
+            # Rows seen in this scan are the most recent, the others go first
+            self.last_scan[[self.index[key] for key in detected if key in self.index]] = self.scans
+            rows = np.flatnonzero(self.antenna[:self.size] >= 0)
+            evicted = rows[np.argpartition(self.last_scan[rows], excess - 1)[:excess]]
+            # Released rows lose their state, so their antennas would not show as changed
+            changed_antennas = set(np.unique(self.antenna[evicted[self.state[evicted]]]).tolist())
+            self._release(evicted)
+            self.evicted = len(evicted)
+            return detected, changed_antennas
+        return detected, set()
+
+    def set_model(self, antenna, A, B):
+        """
+        Sets the HMM transition matrix A and observation matrix B used for one antenna.
+        """
+        if not 0 <= antenna < self.antenna_count:
+            raise ValueError(f"Invalid antenna number: {antenna}")
+        A, B = validate_model(A, B)
+        self.log_a[antenna] = to_log(A)
+        self.log_b[antenna] = to_log(B)
+
+    def update(self, detected, method: FilterMethod, previous_method: FilterMethod, antennas = None):
+        """
+        Advances every tracked tag by one scan.
+        detected is a set of (antenna, tag) tuples seen in this scan.
+        antennas optionally limits the scan to some antennas (a focused scan): tags of
+        other antennas keep their state and history as if no scan happened.
+        Returns (changed_antennas, tag_counts): the set of antennas with at least one
+        state change and an array of present tag counts per antenna.
+        """
+        if antennas is not None:
+            detected = [key for key in detected if key[0] in antennas]
+        self.scans += 1
+        self.evicted = 0
+        evicted_antennas = set()
+        if self.max_tags is not None:
+            detected, evicted_antennas = self._make_room(detected)
+        hits = np.fromiter((self.index[key] if key in self.index else self._allocate(key) for key in detected),
+                           dtype=np.intp, count=len(detected))
+        advanced = range(self.antenna_count) if antennas is None else \
+            [antenna for antenna in antennas if 0 <= antenna < self.antenna_count]
+        self.ticks[advanced] += 1
+        hit_antennas = self.antenna[hits]
+        self.last_seen[hits] = self.ticks[hit_antennas]
+        self.last_scan[hits] = self.scans
+
+        n = self.size
+        active = self.antenna[:n] >= 0
+        # Rows advanced by this scan, None meaning all of them
+        scope = None if antennas is None else active & np.isin(self.antenna[:n], list(antennas))
+        observed = np.zeros(n, dtype=bool)
+        observed[hits] = True
+
+        history = self.history[:n]
+        _assign(history, ((history << np.uint64(1)) | observed.astype(np.uint64)) & self.window_mask, scope)
+
+        state = self.state[:n]
+        self.previous_state[:n] = state
+
+        if method == FilterMethod.NoFiltering:
+            _assign(state, observed, scope)
+        elif method == FilterMethod.WindowLPF:
+            _assign(state, popcount(history) * 2 > self.window_size, scope)
+        elif method == FilterMethod.HMMViterbi:
+            viterbi = self.viterbi[:n]
+            if previous_method != method:
+                # Reset the Viterbi states when the method changes
+                viterbi[:] = np.where(state[:, None], LOG_VITERBI_INIT[::-1], LOG_VITERBI_INIT)
+            # Free rows carry antenna -1, they are masked out below
+            antenna = np.maximum(self.antenna[:n], 0)
+            log_b_obs = self.log_b[antenna[:, None], np.arange(2)[None, :], observed.astype(np.intp)[:, None]]
+            _assign(viterbi, viterbi_step(viterbi, self.log_a[antenna], log_b_obs), scope)
+            _assign(state, viterbi[:, 0] >= viterbi[:, 1], scope)
+        state &= active
+
+        changed = active & (state != self.previous_state[:n])
+        changed_antennas = set(np.unique(self.antenna[:n][changed]).tolist()) | evicted_antennas
+        tag_counts = np.bincount(self.antenna[:n][state], minlength=self.antenna_count)
+
+        # Drop trackers with no detections left in their window: the rows last seen
+        # window_size ticks ago, taken from the slot of the wheel coming due
+        expired = []
+        for antenna in advanced:
+            tick = self.ticks[antenna]
+            slot = tick % self.window_size
+            due = self.wheel[antenna][slot]
+            self.wheel[antenna][slot] = hits[hit_antennas == antenna]
+            # Rows seen again, or freed and reused since, are stale entries
+            expired.append(due[(self.antenna[due] == antenna) & (self.last_seen[due] == tick - self.window_size)])
+        expired = np.concatenate(expired) if expired else _NO_ROWS
+        if len(expired):
+            # Rows can still be Present when their window empties (sticky HMM model, window_size 1),
+            # they leave the counts now and their antennas change
+            present = expired[self.state[expired]]
+            if len(present):
+                changed_antennas |= set(np.unique(self.antenna[present]).tolist())
+                tag_counts -= np.bincount(self.antenna[present], minlength=self.antenna_count)
+            self._release(expired)
+
+        return changed_antennas, tag_counts
+
+    def items(self, antenna = None):
+        """
+        Yields (tag, description) for every tracked tag, optionally for one antenna only.
+        """
+        for row, key in enumerate(self.keys):
+            if key is None or (antenna is not None and key[0] != antenna):
+                continue
+            yield key[1], self.describe(row)
+
+    def epc(self, tag):
+        """
+        Returns the EPC bytes of a tag, for display from any thread, None when its
+        interned ID is stale (see TagInterner.lookup).
+        """
+        return self.interner.lookup(tag) if self.interner is not None else tag
+
+    def describe(self, row):
+        bits = int(self.history[row])
+        detections = [(bits >> i) & 1 for i in reversed(range(self.window_size))]
+        return f"TagTracker(state={bool(self.state[row])}, detections={detections})"
@@ -0,0 +1,127 @@
+import sqlite3
+import threading
+import json
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+class _TransactionStack(object):
+    """
+    LIFO of transactions with the newest memory_limit kept in memory and older ones
+    spilled to a table of the journal database, oldest dropped beyond max_transactions.
+    """
+    def __init__(self, journal, table, memory_limit, max_transactions):
+        self.journal = journal
+        self.table = table
+        self.memory_limit = memory_limit
+        self.max_transactions = max_transactions
+        self.memory = deque()
+        self.spilled = 0
+        with journal.lock, journal.connection:
+            journal.connection.execute(f"DROP TABLE IF EXISTS {table}")
+            journal.connection.execute(f"CREATE TABLE {table} (seq INTEGER PRIMARY KEY, cells TEXT)")
+
+    def __len__(self):
+        return len(self.memory) + self.spilled
+
+    def push(self, transaction):
+        self.memory.append(transaction)
+        if len(self.memory) > self.memory_limit:
+            self._spill(len(self.memory) - self.memory_limit // 2)
+
+    def pop(self):
+        if not self.memory and self.spilled:
+            self._load(self.memory_limit // 2)
+        return self.memory.pop() if self.memory else None
+
+    def clear(self):
+        self.memory.clear()
+        if self.spilled:
+            with self.journal.lock, self.journal.connection:
+                self.journal.connection.execute(f"DELETE FROM {self.table}")
+            self.spilled = 0
+
+    def _spill(self, count):
+        # Oldest in-memory transactions go to disk in one write, encoded as [[row, column, before, after], ...]
+        rows = [(json.dumps([[row, column, before, after] for (row, column), (before, after) in self.memory.popleft().items()]),)
+                for _ in range(count)]
+        with self.journal.lock, self.journal.connection:
+            self.journal.connection.executemany(f"INSERT INTO {self.table} (cells) VALUES (?)", rows)
+            self.spilled += count
+            if self.spilled > self.max_transactions:
+                dropped = self.spilled - self.max_transactions
+                self.journal.connection.execute(
+                    f"DELETE FROM {self.table} WHERE seq IN (SELECT seq FROM {self.table} ORDER BY seq LIMIT ?)", (dropped,))
+                self.spilled = self.max_transactions
+                logger.info(f"Dropped {dropped} oldest transactions from {self.table} history")
+
+    def _load(self, count):
+        # Newest spilled transactions come back to memory in one read
+        with self.journal.lock, self.journal.connection:
+            rows = self.journal.connection.execute(
+                f"SELECT seq, cells FROM {self.table} ORDER BY seq DESC LIMIT ?", (max(count, 1),)).fetchall()
+            self.journal.connection.execute(f"DELETE FROM {self.table} WHERE seq >= ?", (rows[-1][0],))
+            self.spilled -= len(rows)
+        for _, cells in reversed(rows):
+            self.memory.append({(row, column): (before, after) for row, column, before, after in json.loads(cells)})
+
+
+class UndoJournal(object):
+    """
+    Bounded undo/redo history of table edits, grouped in transactions.
+    A transaction maps (row, column) to (value before, value after) and is undone or
+    redone as a whole, e.g. one scan result or one paste is a single undo step.
+    The newest memory_limit transactions of each stack are kept in memory, older ones
+    are spilled to a SQLite file and read back in batches when undo reaches them.
+    The history is not meant to outlive the application, it is cleared when opened.
+    Parameters:
+        path (str): SQLite database file holding the spilled history
+        memory_limit (int): transactions kept in memory per stack
+        max_transactions (int): transactions kept on disk per stack, older ones are dropped
+    """
+    def __init__(self, path = "undo_journal.db", memory_limit = 100, max_transactions = 10000):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=OFF")
+        self.undo_stack = _TransactionStack(self, "undo", memory_limit, max_transactions)
+        self.redo_stack = _TransactionStack(self, "redo", memory_limit, max_transactions)
+
+    def __str__(self):
+        return f"UndoJournal({self.path}, undo={len(self.undo_stack)}, redo={len(self.redo_stack)})"
+
+    def record(self, transaction: dict):
+        """
+        Records a new transaction {(row, column): (before, after)}, which clears the redo history.
+        """
+        if not transaction:
+            return
+        self.undo_stack.push(transaction)
+        self.redo_stack.clear()
+
+    def undo(self):
+        """
+        Returns the cells to set to revert the last transaction as {(row, column): value}, or None.
+        """
+        transaction = self.undo_stack.pop()
+        if transaction is None:
+            return None
+        self.redo_stack.push(transaction)
+        return {cell: before for cell, (before, after) in transaction.items()}
+
+    def redo(self):
+        """
+        Returns the cells to set to reapply the last undone transaction as {(row, column): value}, or None.
+        """
+        transaction = self.redo_stack.pop()
+        if transaction is None:
+            return None
+        self.undo_stack.push(transaction)
+        return {cell: after for cell, (before, after) in transaction.items()}
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
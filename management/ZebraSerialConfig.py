@@ -1,111 +1,200 @@
-import serial
 import time
-import platform
-import configparser
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import NoAlertPresentException
-import subprocess
+import logging
+import urllib.request
+import urllib.parse
+from http.cookiejar import CookieJar
+from html.parser import HTMLParser
+
+logger = logging.getLogger(__name__)
+
+class ZebraConfigError(Exception):
+    pass
+
+class _Page(HTMLParser):
+    """
+    Collects what the configuration sequence needs from a reader page:
+    frames by id or name, elements by id, and forms with their fields.
+    """
+    def __init__(self, url, html):
+        super().__init__(convert_charrefs=True)
+        self.url = url
+        self.frames = {}        # id or name -> absolute src
+        self.elements = {}      # id -> {"tag", "attrs", "text", "form"}
+        self.forms = []         # {"id", "action", "method", "fields", "buttons"}
+        self.form = None
+        self.text_target = None
+        self.feed(html)
+        self.close()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or "" for name, value in attrs}
+        if tag in ("frame", "iframe") and "src" in attrs:
+            for key in (attrs.get("id"), attrs.get("name")):
+                if key:
+                    self.frames[key] = urllib.parse.urljoin(self.url, attrs["src"])
+        elif tag == "form":
+            self.form = {"id": attrs.get("id", ""),
+                         "action": urllib.parse.urljoin(self.url, attrs.get("action", "")),
+                         "method": attrs.get("method", "get").lower(),
+                         "fields": {}, "buttons": {}}
+            self.forms.append(self.form)
+        elif tag in ("input", "button", "select", "textarea") and self.form is not None and attrs.get("name"):
+            if tag == "button" or attrs.get("type", "").lower() in ("submit", "button"):
+                self.form["buttons"][attrs["name"]] = attrs.get("value", "")
+            elif attrs.get("type", "").lower() not in ("checkbox", "radio") or "checked" in attrs:
+                self.form["fields"][attrs["name"]] = attrs.get("value", "")
+
+        if "id" in attrs:
+            element = {"tag": tag, "attrs": attrs, "text": attrs.get("value", ""), "form": self.form}
+            self.elements[attrs["id"]] = element
+            if tag in ("a", "button"):
+                element["text"] = ""
+                self.text_target = element
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self.form = None
+        elif tag in ("a", "button"):
+            self.text_target = None
+
+    def handle_data(self, data):
+        if self.text_target is not None:
+            self.text_target["text"] += data
+
+    def element_text(self, element_id):
+        element = self.elements.get(element_id)
+        return element["text"].strip() if element else None
+
 
 class ZebraSerialConfig:
-    def __init__(self, driver_path, url, password):
-        self.driver_path = driver_path
+    """
+    Configures the serial port output of a Zebra RFID reader through its web interface
+    with plain HTTP requests, following the same frames, fields and buttons a browser would:
+        1. Login frame: submit the password form, accepting the active session prompt if one comes back
+        2. menuId frame: follow the serial port configuration link
+        3. serial port page (shown in the content frame): press "Connect" and poll until the button reads "Disconnect"
+    Session cookies are kept in a cookie jar. Every step waits on a page condition with
+    a bounded timeout instead of fixed sleeps.
+    Parameters:
+        url (str): reader web interface, e.g. http://169.254.250.233/
+        password (str): reader admin password
+        timeout (float): bound for each request and for the connect state change
+        poll_interval (float): delay between checks of the connect state
+    """
+    LOGIN_FRAME = "Login"
+    MENU_FRAME = "menuId"
+    PASSWORD_FIELD = "password"
+    LOGIN_BUTTON = "LoginId-button"
+    SERIAL_PORT_LINK = "SerialPortConfigLink"
+    CONNECT_BUTTON = "btnLLRPConnect"
+
+    def __init__(self, url, password, timeout = 5, poll_interval = 0.1):
         self.url = url
         self.password = password
-        self.service = Service(self.driver_path)
-        
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        
-        self.driver = webdriver.Chrome(service=self.service, options=options)
-
-    def frame_switch(self, frame_id):
-        WebDriverWait(self.driver, 10).until(EC.frame_to_be_available_and_switch_to_it((By.ID, frame_id)))
-
-    def wait_for_element(self, type, element):
-        if type == "ID":
-            return WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, element)))
-        elif type == "XPATH":
-            return WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.XPATH, element)))
-
-    def alert_check(self):
-        WebDriverWait(self.driver, 10).until(EC.alert_is_present())
-        alert = self.driver.switch_to.alert
-        alert.accept() 
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+    @classmethod
+    def from_file(cls, path = "zebra.conf", **kwargs):
+        """
+        Creates the client from a "key = value" file with url and password entries.
+        """
+        config = {}
+        with open(path, "r") as f:
+            for line in f:
+                if "=" in line:
+                    key, value = line.strip().split('=', 1)
+                    config[key.strip()] = value.strip()
+        return cls(config.get('url'), config.get('password'), **kwargs)
+
+    def _get(self, url):
+        with self.opener.open(url, timeout=self.timeout) as response:
+            return _Page(response.geturl(), response.read().decode("utf-8", errors="replace"))
+
+    def _submit(self, form, button = None, **fields):
+        data = dict(form["fields"])
+        data.update(fields)
+        if button is not None:
+            data[button] = form["buttons"].get(button, "")
+        encoded = urllib.parse.urlencode(data)
+        if form["method"] == "post":
+            request = urllib.request.Request(form["action"], data=encoded.encode())
+        else:
+            request = urllib.request.Request(f"{form['action']}?{encoded}")
+        with self.opener.open(request, timeout=self.timeout) as response:
+            return _Page(response.geturl(), response.read().decode("utf-8", errors="replace"))
+
+    def _frame(self, page, frame_id):
+        if frame_id not in page.frames:
+            raise ZebraConfigError(f"Frame {frame_id} not found on {page.url}")
+        return self._get(page.frames[frame_id])
+
+    def _form_of(self, page, element_id):
+        element = page.elements.get(element_id)
+        if element is None or element["form"] is None:
+            raise ZebraConfigError(f"No form with {element_id} on {page.url}")
+        return element["form"], element["attrs"].get("name")
+
+    def login(self):
+        """
+        Logs in and returns the main page holding the menu and content frames.
+        """
+        main = self._get(self.url)
+        if self.MENU_FRAME in main.frames:
+            # Still logged in from an earlier session
+            return main
+        login = self._frame(main, self.LOGIN_FRAME)
+        form, field = self._form_of(login, self.PASSWORD_FIELD)
+        button = login.elements.get(self.LOGIN_BUTTON, {}).get("attrs", {}).get("name")
+        response = self._submit(form, button, **{field or self.PASSWORD_FIELD: self.password})
+
+        # Another session is active: the reader asks to take it over, like the browser alert
+        if self.MENU_FRAME not in response.frames and response.forms and self.PASSWORD_FIELD not in response.elements:
+            logger.info("Taking over active reader session")
+            response = self._submit(response.forms[0], next(iter(response.forms[0]["buttons"]), None))
+
+        main = self._get(self.url)
+        if self.MENU_FRAME not in main.frames:
+            raise ZebraConfigError("Login to the Zebra reader failed")
+        return main
 
     def connect(self):
-        try:
-            # Load Zebra Website (Configured IP Address)
-            self.driver.get(self.url)
-            
-            # Switch to Login Frame
-            self.frame_switch("Login")
-            
-            # Enter Password
-            password_field = self.wait_for_element("ID", "password")
-            password_field.send_keys("SmartShelving1!")
-
-            # Click Login Button
-            login_button = self.driver.find_element(By.ID, "LoginId-button")
-            ActionChains(self.driver).move_to_element(login_button).click().perform()
-
-            # Check for Active Session
-            self.alert_check()
-
-            # Switch to menuId Frame
-            time.sleep(5)
-            #print(self.driver.page_source)  # Check if elements exist in the source
-            self.driver.page_source
-            self.frame_switch("menuId")
-
-            # Load up Serial Port Configuration and Connect
-            communication_button = self.wait_for_element("XPATH", "//*[@id='v_mnu_01']/ul/li[6]/a")
-            communication_button.click()
-
-            serial_port_config_button = self.wait_for_element("ID", "SerialPortConfigLink")
-            serial_port_config_button.click()
-            
-            time.sleep(5)
-
-            # Switch to Content Frame
-            self.driver.switch_to.parent_frame()
-            self.frame_switch("content")
-
-            # Wait for 'Connect' Button and Configure Serial Port
-            connect_button = self.wait_for_element("ID", "btnLLRPConnect")
-            button_text = connect_button.text.strip()
-        
-            if button_text == "Connect":
-                #print("Button is in now in 'Connect' state.")
-                ActionChains(self.driver).move_to_element(connect_button).click().perform()
-
-                # Wait until the text changes to "Disconnect"
-                WebDriverWait(self.driver, 10).until(
-                    lambda d: d.find_element(By.ID, "btnLLRPConnect").text.strip() == "Disconnect"
-                )
-            self.driver.close()
-            self.service.stop()
-        except Exception as e:
-            self.driver.close()
-            self.service.stop()
-            raise e
+        """
+        Connects the reader's serial port output. Returns True if it was connected now,
+        False if it already was. Raises ZebraConfigError or URLError on failure.
+        """
+        main = self.login()
+        menu = self._frame(main, self.MENU_FRAME)
+        link = menu.elements.get(self.SERIAL_PORT_LINK)
+        if link is None or not link["attrs"].get("href"):
+            raise ZebraConfigError("Serial port configuration link not found")
+        serial_url = urllib.parse.urljoin(menu.url, link["attrs"]["href"])
+        page = self._get(serial_url)
+
+        state = page.element_text(self.CONNECT_BUTTON)
+        if state == "Disconnect":
+            logger.info("Zebra reader serial port already connected")
+            return False
+        if state != "Connect":
+            raise ZebraConfigError(f"Unexpected serial port state {state!r}")
+
+        form, button = self._form_of(page, self.CONNECT_BUTTON)
+        self._submit(form, button)
+
+        # Wait until the button turns into "Disconnect"
+        deadline = time.monotonic() + self.timeout
+        while page.element_text(self.CONNECT_BUTTON) != "Disconnect":
+            if time.monotonic() > deadline:
+                raise ZebraConfigError("Zebra reader serial port did not connect in time")
+            time.sleep(self.poll_interval)
+            page = self._get(serial_url)
+        logger.info("Zebra reader serial port connected")
+        return True
 
 
 if __name__ == "__main__":
-    config = configparser.ConfigParser()
-    config.read('zebra.conf')
-    
-    chromedriver_path = subprocess.check_output(["which", "chromedriver"]).decode().strip()
-    url = config['url']
-    password = config['password']
-    
-    zebra_interface = ZebraSerialConfig(chromedriver_path, url, password)
-    zebra_interface.connect()
+    logging.basicConfig(level=logging.INFO)
+    start = time.monotonic()
+    connected = ZebraSerialConfig.from_file('zebra.conf').connect()
+    print(f"{'Connected' if connected else 'Already connected'} in {time.monotonic() - start:.2f} s")
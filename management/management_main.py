@@ -1,25 +1,36 @@
 import sys, os, logging, time, platform
-from PyQt6.QtWidgets import QApplication, QMainWindow, QTableWidget, QTableWidgetItem, QPushButton, QHeaderView, QMessageBox, QStatusBar, QPlainTextEdit, QLineEdit, QWidget, QScroller, QScrollerProperties
-from PyQt6 import uic, QtGui, QtCore
-from PyQt6.QtGui import QColor, QBrush, QActionGroup
+from PyQt6.QtWidgets import QApplication, QMainWindow, QTableView, QPushButton, QHeaderView, QMessageBox, QStatusBar, QPlainTextEdit, QLineEdit, QWidget, QScroller, QScrollerProperties, QProgressBar
+from PyQt6 import QtGui, QtCore
+from PyQt6.QtGui import QColor, QBrush, QActionGroup, QShortcut, QKeySequence
 from PyQt6.QtCore import QEvent, Qt
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
 from serial.tools.list_ports import comports
 import numpy as np
 from Workers import WorkerThread
+from SheetsClient import SheetsClient
+import SheetDeltas
+from SaveQueue import SaveQueue
+from LocalMirror import LocalMirror
+from SheetTableModel import SheetTableModel
+from PendingChanges import PendingChangesPanel
+from UndoJournal import UndoJournal
 from Console import Console
-from ScannerDriver import ScannerDriver, FilterMethod
+from ScannerDriver import FilterMethod
+from ScannerPool import ScannerPool
 from ZebraSerialConfig import ZebraSerialConfig
+from Metrics import Metrics
+from Smart_Shelving_System_ui import Ui_MainWindow
 import json
 import subprocess
 logger = logging.getLogger(__name__)
 
-class GoogleSheetTableApp(QMainWindow):
+# Background stages run after the window is shown, see start_background_stages
+STARTUP_STAGES = ("sheets", "reader", "scanner")
+
+class GoogleSheetTableApp(QMainWindow, Ui_MainWindow):
     """
     A QMainWindow-based application that manages a Google Sheets-backed table with a rich user interface.
     This application loads table data from a specified Google Sheet and provides features such as:
-        - Displaying and editing table data in a QTableWidget.
+        - Displaying and editing table data in a QTableView backed by SheetTableModel.
         - Automatic and manual saving of changes back to Google Sheets.
         - Undo/redo functionality for cell edits.
         - UI elements including a console for output, buttons for saving and reloading, and status messages.
@@ -31,24 +42,41 @@ class GoogleSheetTableApp(QMainWindow):
         sheet_name (str): The name of the sheet within the Google Sheet document containing table data.
         settings (dict, optional): A dictionary to override default settings. Possible keys include:
             - 'auto_save': (bool) whether changes are automatically saved.
-            - 'warn_inventory_change': (bool) whether to warn when inventory changes are detected.
+            - 'warn_inventory_change': (bool) whether detected inventory changes wait for review in the pending changes panel
+              instead of being recorded right away.
             - 'save_on_exit': (bool) whether to save changes automatically upon application exit.
+            - 'hmm_models': (dict) per-antenna HMM matrices {"<antenna>"|"default": {"A": [[..]], "B": [[..]]}} for HMM-Viterbi filtering.
+            - 'epc_prefixes': (list) EPC prefixes accepted by the scanner, all tags are accepted if empty.
+            - 'readers': (list) one {"device", "model", "antenna_count", "scan_time", "window_size", "max_tags", "trigger"} dict per RFID reader,
+              model being "zebra" (default, text protocol) or "sr681" (binary protocol), see ScannerPool,
+              drawers (table rows) are numbered across readers in order. Defaults to one reader on the platform's serial port.
+              "trigger" switches a reader to GPIO trigger mode, see GpioTrigger.from_config.
+            - 'metrics_file': (str) text exposition file of the scan and save metrics, written every
+              'metrics_interval' seconds (default metrics.prom every 15 s, an interval of 0 disables it).
     The class also handles:
         - Initialization of UI components (widgets from the .ui file).
         - Loading of initial configurations including previous scan results if available.
         - Synchronization of table state with Google Sheets through methods like fetch_sheets, load_table, and push_sheets.
-        - Undo/redo mechanisms through the maintenance of an undo_stack and redo_stack.
+        - An offline-first local mirror (LocalMirror) the table is loaded from at startup, with a journal of edits not yet pushed.
+        - Undo/redo through a bounded UndoJournal of transactions, one per edit, scan result or paste,
+          with older history spilled to disk.
         - Background tasks using worker threads to keep the UI responsive during long operations.
-        - Peripheral (scanner) management with a dedicated thread and real-time status updates.
+        - Peripheral (scanner) management through a ScannerPool running one thread per reader, with real-time status updates.
         - Cleanup and saving of application state on close via a custom closeEvent.
+        - Staged startup: the window is built from the precompiled Smart_Shelving_System_ui module and shown
+          right away, sheet sync, reader configuration and scanner start then run concurrently in the background.
+          Per-stage timings since start_time are kept in startup_timings.
     Usage:
         Instantiate the class with the appropriate spreadsheet_id, sheet_name, and optional settings dictionary. The application will configure the UI,
-        fetch initial data from Google Sheets, and start background services such as device configuration and scanning once launched.
+        load the table from the local mirror, sync it with Google Sheets in the background, and start background services such as device configuration and scanning once launched.
     """
     def __init__(self, spreadsheet_id:str, sheet_name:str, settings:dict = {}):
         self.start_time = time.time()
+        self.startup_timings = {}
         super().__init__()
-        uic.loadUi('src/Smart_Shelving_System.ui', self)
+        # Precompiled with pyuic6 from src/Smart_Shelving_System.ui, see README
+        self.setupUi(self)
+        self.mark_startup("ui")
         self.spreadsheet_id = spreadsheet_id
         self.sheet_name = sheet_name
         self.settings = settings
@@ -78,17 +106,24 @@ class GoogleSheetTableApp(QMainWindow):
             self.console.append_output("No settings provided, using default settings")
 
         # Initialize a thread pool for background tasks
+        # Readers run in the scanner pool's own threads, keep enough here for the startup stages
         self.threadpool = QtCore.QThreadPool()
+        self.threadpool.setMaxThreadCount(max(self.threadpool.maxThreadCount(), len(STARTUP_STAGES)))
         threading_info =f"Multithreading with maximum {self.threadpool.maxThreadCount()} threads"
         logger.info(threading_info)
         self.console.append_output(threading_info)
 
-        # Initialize stacks to track edit changes
-        self.undo_stack = []
-        self.redo_stack = []
+        # Undo history, one transaction per edit, scan result or paste
+        self.undo_journal = UndoJournal()
+
+        # Edits are written behind to Google Sheets, coalesced per cell
+        self.save_queue = SaveQueue(self.push_sheets, self.threadpool)
+        self.save_queue.flush_started.connect(self.on_save_started)
+        self.save_queue.flushed.connect(self.on_changes_saved)
+        self.save_queue.failed.connect(self.on_save_failed)
 
-        # Access the QTableWidget, QPushButtons, QStatusBar, and console widgets from the .ui file by their object names
-        self.table_widget = self.findChild(QTableWidget, 'tableWidget')
+        # Access the QTableView, QPushButtons, QStatusBar, and console widgets from the .ui file by their object names
+        self.table_view = self.findChild(QTableView, 'tableWidget')
         self.save_button = self.findChild(QPushButton, 'saveButton')
         self.reload_button = self.findChild(QPushButton, 'reloadButton')
         self.statusbar = self.findChild(QStatusBar, 'statusbar')
@@ -115,59 +150,192 @@ class GoogleSheetTableApp(QMainWindow):
 
         self.table_colors = {
             'brightText': QBrush(QColor(255, 0, 0)), # red
-            'text': self.table_widget.palette().text()
+            'text': self.table_view.palette().text(),
+            'conflict': QBrush(QColor(255, 165, 0, 96)) # translucent orange
         }
 
-        # Load table data from Google Sheets
-        try:
-            data = self.fetch_sheets(spreadsheet_id, sheet_name)
-        except Exception as e:
-            logger.error("Failed to fetch initial Google Sheets data")
-            logger.error(e)
-            self.console.append_output("Failed to fetch initial Google Sheets data")
-            self.console.append_output(e)
-            # TODO: Display an error message
-            # This should not be recoverable
-            sys.exit(-1)
-        self.load_table(data)
+        # The view renders straight from the model's initial/current state arrays
+        self.table_model = SheetTableModel(self.table_colors['brightText'], self.table_colors['conflict'], self)
+        self.table_view.setModel(self.table_model)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table_view.setAlternatingRowColors(True)
+
+        # Load table data from the local mirror, Google Sheets is synced in the background
+        self.mirror = LocalMirror(spreadsheet_id, sheet_name)
+        data = self.mirror.load()
+        if data:
+            self.load_table(data)
+            self.apply_local_edits(self.mirror.pending())
+            self.console.append_output(f"Loaded table from local mirror, last synced {time.ctime(self.mirror.last_synced())}")
+        else:
+            self.load_table([])
+            self.console.append_output("No local copy of the table, waiting for Google Sheets")
+        self.mark_startup("table")
 
         # Start peripheral manager in background
         #self.peripheral_thread = PeripheralManager()
         #self.peripheral_thread.signals.result.connect(self.peripheral_handler)
         #self.threadpool.start(self.peripheral_thread)
 
+        # Detected inventory changes wait here for review while the scanner keeps running
+        self.pending_changes = PendingChangesPanel(self)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.pending_changes)
+        self.pending_changes.accepted.connect(self.accept_inventory_changes)
+        self.pending_changes.rejected.connect(
+            lambda changes: self.console.append_output(f"Rejected changes for drawers {sorted(changes)}"))
+
         # Connect signals to slots for table operations
-        self.table_widget.cellChanged.connect(self.record_change)
+        self.table_model.cellEdited.connect(self.record_change)
         self.save_button.clicked.connect(self.save)
         self.reload_button.clicked.connect(self.reload_table)
         self.actionSave.triggered.connect(self.save)
         self.actionUndo.triggered.connect(self.undo)
         self.actionRedo.triggered.connect(self.redo)
+        QShortcut(QKeySequence.StandardKey.Paste, self.table_view, self.paste)
 
         self.statusbar.showMessage("Ready")
         logger.info("Initialized Google Sheet Table App")
         self.console.append_output("Initialized Google Sheet Table App")
         self.console.append_output("Type 'help' for a list of available commands")
-        
+
+        # Startup progress shown in the status bar until all background stages are done
+        self.startup_progress = QProgressBar()
+        self.startup_progress.setRange(0, len(STARTUP_STAGES))
+        self.startup_progress.setFormat("Starting %v/%m")
+        self.startup_progress.setMaximumWidth(200)
+        self.statusbar.addPermanentWidget(self.startup_progress)
+        self.startup_pending = set(STARTUP_STAGES)
+
+        # Checks the reader feed once its cached state expired, started after the reader stage
+        self.feed_watchdog = QtCore.QTimer(self)
+        self.feed_watchdog.timeout.connect(lambda: self.threadpool.start(WorkerThread(self.check_reader_feed)))
+
+        # Scan cycle and save metrics for a local scraper, see the stats console command
+        self.metrics = Metrics.instance()
+        self.metrics_handling = self.metrics.histogram("ui_scan_results_seconds")
+        self.metrics_timer = QtCore.QTimer(self)
+        self.metrics_timer.timeout.connect(self.write_metrics)
+        if self.settings.get('metrics_interval', 15):
+            self.metrics_timer.start(int(self.settings.get('metrics_interval', 15) * 1000))
+
+        # Run the slow stages once the event loop has shown the window
+        QtCore.QTimer.singleShot(0, self.start_background_stages)
+
+    def mark_startup(self, stage):
+        self.startup_timings[stage] = time.time() - self.start_time
+        logger.info(f"Startup stage {stage} at {self.startup_timings[stage]:.3f} s")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if "window" not in self.startup_timings:
+            self.mark_startup("window")
+
+    def start_background_stages(self):
+        self.sync_sheets()
+
+        # The serial session keeps retrying the port, so the scanner can start before the reader is configured
+        self.start_scanner()
+        self.finish_startup_stage("scanner")
+
+        if self.scanner.feed_probe is None:
+            # No Zebra reader in the pool, nothing to configure or watch
+            self.finish_startup_stage("reader")
+            return
         zebra_config_thread = WorkerThread(self.zebra_serial_config)
-        zebra_config_thread.signals.finished.connect(lambda: self.start_scanner())
+        zebra_config_thread.signals.finished.connect(lambda: self.finish_startup_stage("reader"))
+        zebra_config_thread.signals.finished.connect(
+            lambda: self.feed_watchdog.start(int(self.scanner.feed_probe.ttl * 1000)))
         self.threadpool.start(zebra_config_thread)
-        self.console.append_output("Configuring Zebra RFID reader...")
+        self.console.append_output("Checking Zebra RFID reader feed...")
+
+    def finish_startup_stage(self, stage):
+        if stage not in self.startup_pending:
+            return
+        self.startup_pending.remove(stage)
+        self.mark_startup(stage)
+        self.startup_progress.setValue(len(STARTUP_STAGES) - len(self.startup_pending))
+        if not self.startup_pending:
+            self.statusbar.removeWidget(self.startup_progress)
+            timings = ", ".join(f"{stage} {t:.2f} s" for stage, t in self.startup_timings.items())
+            self.console.append_output(f"Startup complete: {timings}")
 
     @staticmethod
     def fetch_sheets(spreadsheet_id, sheet_name):
-        # Authenticate with the Google Sheets API
-        creds = Credentials.from_service_account_file(os.getenv("CREDENTIALS_PATH"))
-        service = build('sheets', 'v4', credentials=creds)
+        # The shared client keeps credentials, token and connections between calls
         range_name = f'{sheet_name}'
         
         # Call the Sheets API to get all data in the sheet
-        sheet = service.spreadsheets()
-        result = sheet.values().get(spreadsheetId=spreadsheet_id, range=range_name).execute()
-        values = result.get('values', [])
-        
-        return values
+        return SheetsClient.instance().get_values(spreadsheet_id, range_name)
     
+    @property
+    def table_initial_state(self):
+        return self.table_model.initial
+
+    @property
+    def table_current_state(self):
+        return self.table_model.current
+
+    def fetch_and_mirror(self):
+        # Runs in a worker thread, the fetched sheet becomes the new local mirror
+        data = self.fetch_sheets(self.spreadsheet_id, self.sheet_name)
+        self.mirror.store(data)
+        return data
+
+    def sync_sheets(self):
+        self.update_status("Syncing with Google Sheets")
+        worker = WorkerThread(self.fetch_and_mirror)
+        worker.signals.result.connect(self.on_sheets_synced)
+        worker.signals.error.connect(self.on_sync_failed)
+        self.threadpool.start(worker)
+
+    def on_sheets_synced(self, data):
+        # Unsaved cells and journaled offline edits are kept, conflicting remote changes are flagged
+        self.merge_remote(data)
+
+        # Push what was edited while offline
+        for (row, column), value in self.mirror.pending().items():
+            self.save_queue.enqueue(row, column, value)
+        self.save_queue.flush()
+        self.update_status("Ready")
+        self.console.append_output("Synced table with Google Sheets")
+        self.finish_startup_stage("sheets")
+
+    def on_sync_failed(self, error):
+        logger.error("Failed to fetch Google Sheets data")
+        logger.error(error)
+        self.console.append_output("Failed to fetch Google Sheets data, using local copy. Retrying in 30 s")
+        self.update_status("Offline, using local copy")
+        self.finish_startup_stage("sheets")
+        QtCore.QTimer.singleShot(30000, self.sync_sheets)
+
+    def merge_remote(self, data):
+        # Patches only the cells that changed in the sheet, keeping scroll, selection and local edits
+        conflicts = self.table_model.apply_remote(data)
+        for row, column, local, remote in conflicts:
+            if remote is None:
+                message = f"Conflict at row {row + 1}, column {column + 1}: removed from Google Sheets, local edit \"{local}\" dropped"
+            else:
+                message = f"Conflict at row {row + 1}, column {column + 1}: Google Sheets has \"{remote}\", keeping local \"{local}\""
+            logger.warning(message)
+            self.console.append_output(message)
+        return conflicts
+
+    def apply_local_edits(self, edits: dict):
+        # Shows local values on top of the loaded table without touching the undo history,
+        # returns the cells that were in range
+        rows, columns = self.table_current_state.shape
+        edits = {(row, column): value for (row, column), value in edits.items() if row < rows and column < columns}
+        self.table_model.set_cells(edits)
+        return edits
+
+    def queue_save(self, cells: dict):
+        # Journal first so the edits survive a restart while offline, the save queue
+        # then pushes all of them in one batch
+        self.mirror.journal(cells)
+        for (row, column), value in cells.items():
+            self.save_queue.enqueue(row, column, value)
+
     def change_algorithm(self, action):
         if action == self.actionNone:
             self.console.append_output("No filtering selected")
@@ -209,21 +377,21 @@ class GoogleSheetTableApp(QMainWindow):
             self.actionSave_on_exit.setChecked(True)
             self.console.append_output("Save on exit enabled")
     
-    def zebra_serial_config(self):
+    def zebra_serial_config(self, force = False):
+        # A reader that already streams tag frames keeps its configuration
+        feed_probe = self.scanner.feed_probe
+        if feed_probe is None:
+            return
+        if not force and feed_probe.is_live():
+            self.console.append_output("Zebra RFID reader feed is live, skipping configuration")
+            return
         retried = 0
         while True:
             try:
-                with open("zebra.conf", "r") as f:
-                    config = {}
-                    for line in f:
-                        key, value = line.strip().split('=', 1)
-                        config[key.strip()] = value.strip()
-                    chromedriver_path = config.get('chromedriver_path')
-                    url = config.get('url')
-                    password = config.get('password')
-                zebra_interface = ZebraSerialConfig(chromedriver_path, url, password)
+                zebra_interface = ZebraSerialConfig.from_file("zebra.conf")
                 self.update_status("Configuring Zebra RFID reader...")
                 zebra_interface.connect()
+                feed_probe.invalidate()
                 self.update_status("Ready")
                 self.console.append_output("Zebra RFID reader successfully configured")
                 return
@@ -236,6 +404,13 @@ class GoogleSheetTableApp(QMainWindow):
                     self.update_status("Zebra reader configuration failed\n")
                     return
     
+    def check_reader_feed(self):
+        # Runs in a worker thread from the feed watchdog, reconfigures only once the feed went silent
+        if self.scanner.feed_probe.is_live():
+            return
+        self.console.append_output("Zebra RFID reader feed went silent, reconfiguring")
+        self.zebra_serial_config(force=True)
+
     def update_status(self, message):
         self.statusbar.showMessage(message)
 
@@ -269,6 +444,7 @@ class GoogleSheetTableApp(QMainWindow):
                 json.dump(self.settings, f, indent=4)
             self.console.append_output("Stopping all application jobs...")
             all_stopped = self.threadpool.waitForDone(10000)
+            self.undo_journal.close()
             event.accept()
         else:
             event.ignore()
@@ -279,242 +455,168 @@ class GoogleSheetTableApp(QMainWindow):
         QMessageBox.information(self, "Peripheral Message", args[0])
 
     def load_table(self, data):
-        self.table_widget.setRowCount(len(data)-1)
-        self.table_widget.setColumnCount(len(data[0])-1)
-        
-        # Initialize table state variables
-        self.table_initial_state = np.ndarray((len(data)-1, len(data[0])-1,), dtype=object)
-        self.table_current_state = self.table_initial_state.copy()
-
-        self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table_widget.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table_widget.setAlternatingRowColors(True)
-        for row in range(len(data)-1):
-            #brush = self.colors['base'] if row % 2 else self.colors['alternateBase']
-            for col in range(len(data[0])-1):
-                self.table_widget.setItem(row, col, QTableWidgetItem())
-                self.table_widget.item(row, col).setTextAlignment(
-                    QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
-                #self.table_widget.item(row, col).setBackground(brush)
-                
-        for row_index, row_data in enumerate(data):
-            #if (row_index-1) % 2:
-            #    brush = self.colors['base']
-            #else:
-            #    brush = self.colors['alternateBase']
-            for col_index, cell_data in enumerate(row_data):
-                if row_index == 0:
-                    if col_index == 0:
-                        continue
-                    self.table_widget.setHorizontalHeaderItem(col_index - 1, QTableWidgetItem(cell_data))
-                elif col_index == 0:
-                    self.table_widget.setVerticalHeaderItem(row_index - 1, QTableWidgetItem(cell_data))
-                    #self.table_widget.verticalHeaderItem(row_index - 1).setBackground(brush)
-                else:
-                    self.table_widget.item(row_index - 1, col_index - 1).setText(cell_data)
-                    self.table_initial_state[row_index - 1][col_index - 1] = cell_data
-                    self.table_current_state[row_index - 1][col_index - 1] = cell_data
-
-    def record_change(self, row, column, value = None, nosave = False):
-        previous_value = self.table_current_state[row][column]
-        new_value = (self.table_widget.item(row, column).text() if value is None else str(value))
-
-        if previous_value == new_value:
-            return
-        self.table_widget.cellChanged.disconnect()
-        self.redo_stack.clear()
-        if self.table_initial_state[row, column] != new_value:
-            self.table_widget.item(row, column).setForeground(self.table_colors['brightText'])
-            if value is not None:
-                self.table_widget.item(row, column).setText(new_value)
-        else:
-            self.table_widget.item(row, column).setForeground(self.table_colors['text'])
-        self.undo_stack.append((row, column, previous_value))
-        self.table_current_state[row, column] = new_value
-        self.table_widget.cellChanged.connect(self.record_change)
-        if nosave:
+        self.table_model.load(data)
+
+    def record_change(self, row, column, value, nosave = False):
+        self.record_changes({(row, column): value}, nosave)
+
+    def record_changes(self, cells: dict, nosave = False):
+        # Applies {(row, column): value} as one undo transaction and one batched table update,
+        # cells out of the table's range are dropped so the journal never records them
+        rows, columns = self.table_current_state.shape
+        transaction = {}
+        for (row, column), value in cells.items():
+            if row >= rows or column >= columns:
+                continue
+            previous_value = self.table_current_state[row, column]
+            new_value = str(value)
+            if previous_value != new_value:
+                transaction[(row, column)] = (previous_value, new_value)
+        if not transaction:
             return
-        if self.settings.get('auto_save', True):
-            self.save()
+        self.undo_journal.record(transaction)
+        self.apply_history({cell: after for cell, (before, after) in transaction.items()}, nosave)
+
+    def apply_history(self, cells, nosave = False):
+        cells = self.apply_local_edits(cells)
+        if cells and not nosave and self.settings.get('auto_save', True):
+            self.queue_save(cells)
 
     def undo(self):
-        if not self.undo_stack:
+        cells = self.undo_journal.undo()
+        if cells is None:
             return
         self.statusbar.showMessage("Undo")
-        change = self.undo_stack.pop()
-        row, column, value = change
-        self.redo_stack.append((row, column, self.table_current_state[row, column]))
-        self.table_current_state[row, column] = value
-
-        self.table_widget.cellChanged.disconnect()
-        self.table_widget.item(row, column).setText(value)
-        if self.table_initial_state[row][column] != value:
-            self.table_widget.item(row, column).setForeground(self.table_colors['brightText'])
-        else:
-            self.table_widget.item(row, column).setForeground(self.table_colors['text'])
-        self.table_widget.cellChanged.connect(self.record_change)
+        self.apply_history(cells)
 
     def redo(self):
-        if not self.redo_stack:
+        cells = self.undo_journal.redo()
+        if cells is None:
             return
         self.statusbar.showMessage("Redo")
-        change = self.redo_stack.pop()
-        row, column, value = change
-        self.undo_stack.append((row, column, self.table_current_state[row, column]))
-        self.table_current_state[row, column] = value
-
-        self.table_widget.cellChanged.disconnect()
-        self.table_widget.item(row, column).setText(value)
-        if self.table_initial_state[row][column] != value:
-            self.table_widget.item(row, column).setForeground(self.table_colors['brightText'])
-        else:
-            self.table_widget.item(row, column).setForeground(self.table_colors['text'])
-        self.table_widget.cellChanged.connect(self.record_change)
+        self.apply_history(cells)
+
+    def paste(self):
+        # Pastes tab separated clipboard text from the current cell on, as a single undo step
+        anchor = self.table_view.currentIndex()
+        text = QApplication.clipboard().text()
+        if not anchor.isValid() or not text:
+            return
+        rows, columns = self.table_current_state.shape
+        cells = {}
+        for row_offset, line in enumerate(text.rstrip("\r\n").split("\n")):
+            for column_offset, value in enumerate(line.rstrip("\r").split("\t")):
+                row, column = anchor.row() + row_offset, anchor.column() + column_offset
+                if row < rows and column < columns:
+                    cells[(row, column)] = value
+        self.record_changes(cells)
 
     def save(self):
+        # Queue every unsaved cell and push them now, the table stays editable meanwhile
+        self.queue_save({(int(row), int(column)): self.table_current_state[row, column]
+                         for row, column in self.table_model.dirty_cells()})
+        self.save_queue.flush()
+
+    def on_save_started(self, count):
         self.statusbar.showMessage("Saving changes")
-        self.console.append_output("Saving changes")
-        self.save_button.setEnabled(False)
+        self.console.append_output(f"Saving {count} changed cells")
+
+    def on_changes_saved(self, deltas):
+        self.mirror.acknowledge(deltas)
+        # The sheet now holds the pushed values, only cells edited since stay highlighted
+        self.table_model.mark_saved(deltas)
+        self.statusbar.showMessage("Changes saved to google")
+        self.console.append_output("Changes saved to google")
+
+    def on_save_failed(self, error, retry_ms):
+        logger.error(error)
+        self.console.append_output(f"Failed to save changes, retrying in {retry_ms / 1000:.0f} s")
+        self.statusbar.showMessage("Failed to save changes, will retry")
+
+    def reload_table(self):
+        # Reloading only patches what changed remotely, unsaved edits are kept and
+        # flagged where the sheet changed under them, so no confirmation is needed
+        logger.info("Reloading table")
+        self.console.append_output("Reloading table")
+        worker = WorkerThread(self.fetch_and_mirror)
+        self.statusbar.showMessage("Reloading table")
         self.reload_button.setEnabled(False)
-        self.table_widget.setEnabled(False)
-        worker = WorkerThread(self.push_sheets)
-        worker.signals.finished.connect(lambda: self.table_widget.setEnabled(True))
-        worker.signals.finished.connect(lambda: self.save_button.setEnabled(True))
+
+        worker.signals.result.connect(self.on_table_reloaded)
         worker.signals.finished.connect(lambda: self.reload_button.setEnabled(True))
-        worker.signals.finished.connect(lambda: self.statusbar.showMessage("Changes saved to google"))
-        worker.signals.finished.connect(lambda: self.console.append_output("Changes saved to google"))
-        worker.signals.error.connect(lambda: self.table_widget.setEnabled(True))
-        worker.signals.error.connect(lambda: self.save_button.setEnabled(True))
-        worker.signals.error.connect(lambda: self.reload_button.setEnabled(True))
-        worker.signals.error.connect(lambda e: logger.error(e))
+        worker.signals.error.connect(lambda e: logger.warning(e))
         worker.signals.error.connect(lambda e: self.console.append_output(e))
-        worker.signals.error.connect(lambda: QMessageBox.critical(self, "Error", "Failed to save changes."))
-        worker.signals.error.connect(lambda: self.statusbar.showMessage("Failed to save changes"))
-        worker.signals.error.connect(lambda: self.console.append_output("Failed to save changes"))
+        worker.signals.error.connect(lambda: QMessageBox.warning(self, "Warning", "Failed to reload table."))
+        worker.signals.error.connect(lambda: self.statusbar.showMessage("Failed to reload table"))
+        self.threadpool.start(worker)
+
+    def on_table_reloaded(self, data):
+        conflicts = self.merge_remote(data)
+        message = f"Table reloaded, {len(conflicts)} conflicts" if conflicts else "Table reloaded"
+        self.statusbar.showMessage(message)
+        self.console.append_output(message)
+
+    def write_metrics(self):
+        worker = WorkerThread(self.metrics.write, self.settings.get('metrics_file', "metrics.prom"))
+        worker.signals.error.connect(lambda e: logger.warning(f"Failed to write metrics: {e[0]}"))
         self.threadpool.start(worker)
 
-    def reload_table(self):
-        response = QMessageBox.critical(
-            self,
-            "Reload Table?",
-            "Are you sure you want to reload the table? This cannot be undone.",
-            QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel
-        )
-        if response == QMessageBox.StandardButton.Ok:
-            logger.info("Reloading table")
-            self.console.append_output("Reloading table")
-            worker = WorkerThread(self.fetch_sheets, self.spreadsheet_id, self.sheet_name)
-            self.statusbar.showMessage("Reloading table")
-            self.table_widget.setEnabled(False)
-            self.reload_button.setEnabled(False)
-            self.save_button.setEnabled(False)
-            self.table_widget.cellChanged.disconnect()
-            
-            worker.signals.result.connect(self.load_table)
-            worker.signals.finished.connect(lambda: self.table_widget.setEnabled(True))
-            worker.signals.finished.connect(lambda: self.save_button.setEnabled(True))
-            worker.signals.finished.connect(lambda: self.reload_button.setEnabled(True))
-            worker.signals.finished.connect(lambda: self.table_widget.cellChanged.connect(self.record_change))
-            worker.signals.finished.connect(lambda: self.statusbar.showMessage("Table reloaded"))
-            worker.signals.finished.connect(lambda: self.console.append_output("Table reloaded"))
-            worker.signals.error.connect(lambda: self.table_widget.setEnabled(True))
-            worker.signals.error.connect(lambda: self.reload_button.setEnabled(True))
-            worker.signals.error.connect(lambda: self.save_button.setEnabled(True))
-            worker.signals.error.connect(lambda: self.table_widget.cellChanged.connect(self.record_change))
-            worker.signals.error.connect(lambda e: logger.warning(e))
-            worker.signals.error.connect(lambda e: self.console.append_output(e))
-            worker.signals.error.connect(lambda: QMessageBox.warning(self, "Warning", "Failed to reload table."))
-            worker.signals.error.connect(lambda: self.statusbar.showMessage("Failed to reload table"))
-            
-            self.undo_stack.clear()
-            self.redo_stack.clear()
-            self.threadpool.start(worker)
-        else:
-            return
-        
     def handle_scan_results(self, results:dict):
+        # The table is still empty until the first sync on a first run, drawers past the last row are dropped
+        rows = self.table_current_state.shape[0]
+        results = {drawer: count for drawer, count in results.items() if drawer < rows}
         if not results:
+            self.scanner.acknowledge()
             return
-        # Scanner is paused when results are received
-        if self.settings.get('warn_inventory_change', True):
-            response = QMessageBox.critical(
-                self,
-                "Inventory Changed",
-                f"Inventory changed for drawers {results.keys()}, Record changes?",
-                QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel
-            )
-
-            if response == QMessageBox.StandardButton.Cancel:
-                self.console.append_output("Changes not recorded")
-                self.scanner.start()
-                return
-
-        self.console.append_output("Changed drawers:")
-        for antenna_num in results:
-            self.console.append_output(f"\tAntenna {antenna_num}:{results[antenna_num]}\ttags")
-            self.record_change(antenna_num, 1, results[antenna_num], nosave=True)
-        if self.settings.get('auto_save', True):
-            self.console.append_output("Auto saving changes")
-            self.save()
-        # Restart the scanner
-        self.scanner.start()
+        # The scanner keeps running, changes arriving meanwhile are coalesced until acknowledged
+        start = time.perf_counter()
+        try:
+            self.console.append_output("Changed drawers:")
+            for antenna_num in results:
+                self.console.append_output(f"\tAntenna {antenna_num}:{results[antenna_num]}\ttags")
+            if self.settings.get('warn_inventory_change', True):
+                # Reviewed in the pending changes panel, nobody has to be there for scanning to go on
+                self.pending_changes.add(results, {drawer: self.table_current_state[drawer, 1] for drawer in results})
+            else:
+                self.accept_inventory_changes(results)
+        finally:
+            self.scanner.acknowledge()
+            self.metrics_handling.observe(time.perf_counter() - start)
+
+    def accept_inventory_changes(self, changes: dict):
+        # The whole batch is one undo step and one push
+        self.console.append_output(f"Recording changes for drawers {sorted(changes)}")
+        rows = self.table_current_state.shape[0]
+        self.record_changes({(drawer, 1): count for drawer, count in changes.items() if drawer < rows})
 
     def start_scanner(self):
-        current_os = platform.system()
-        if (current_os == "Darwin"):
-            self.scanner = ScannerDriver(self, device = '/dev/tty.usbserial-A9Z2MKOX',
-                                        antenna_count = 4,
-                                        scan_time = 3,
-                                        window_size = 3)
-        elif (current_os == "Linux"):
-            self.scanner = ScannerDriver(self, device = '/dev/ttyUSB0',
-                                        antenna_count = 4,
-                                        scan_time = 3,
-                                        window_size = 3)
+        readers = self.settings.get('readers')
+        if not readers:
+            # Single reader on the platform's default serial device
+            current_os = platform.system()
+            device = '/dev/tty.usbserial-A9Z2MKOX' if current_os == "Darwin" else '/dev/ttyUSB0'
+            readers = [{"device": device, "antenna_count": 4, "scan_time": 3, "window_size": 3}]
+        self.scanner = ScannerPool(self, readers,
+                                   hmm_models = self.settings.get('hmm_models'),
+                                   epc_prefixes = self.settings.get('epc_prefixes'))
         self.scanner.signals.error.connect(lambda e: self.console.append_output(str(e)))
         self.scanner.signals.finished.connect(lambda: self.console.append_output("Scanner stopped on critical error, restart required."))
         self.scanner.signals.result.connect(self.handle_scan_results)
-        self.console.append_output("Scanner started")
-        self.threadpool.start(self.scanner)
-
-    def push_sheets(self):
-        deltas = np.argwhere(self.table_initial_state != self.table_current_state)
-        deltas = [(row, column, self.table_current_state[row, column]) for row, column in deltas]
-        requests = []
-
-        self.table_widget.cellChanged.disconnect()
-        for row, column, value in deltas:
-            column_letter = chr(65 + column + 1) # map column index to letter
-            cell_range = f'{self.sheet_name}!{column_letter}{row+2}' # Convert to A1 notation
-            requests.append({
-                "range": cell_range,
-                "values": [[value]]
-            })
-        self.table_widget.cellChanged.connect(self.record_change)
-        
-        try:
-            creds = Credentials.from_service_account_file(os.getenv("CREDENTIALS_PATH"))
-            service = build('sheets', 'v4', credentials=creds)
-            body = {
-                "data": requests,
-                "valueInputOption": "USER_ENTERED"
-            }
-            service.spreadsheets().values().batchUpdate(
-                spreadsheetId=self.spreadsheet_id,
-                body=body
-            ).execute()
-        except Exception as e:
-            # TODO: Display an error message
-            # This should be recoverable
-            return
+        self.console.append_output(f"Scanner started with {len(self.scanner)} readers, {self.scanner.antenna_count} drawers")
+        self.scanner.launch()
+
+    def push_sheets(self, deltas: dict):
+        # Runs in a worker thread, deltas maps (row, column) to the value to write.
+        # Contiguous cells are merged into ranges, large pushes are split into several requests
+        chunks = SheetDeltas.chunk(SheetDeltas.encode(self.sheet_name, deltas))
 
-        for row, column, _ in deltas:
-            self.table_widget.item(row, column).setForeground(self.table_colors['text'])
-        self.table_initial_state = self.table_current_state.copy()
+        # Raises on failure so the save queue can retry, rewriting chunks that already went through is harmless
+        for data in chunks:
+            SheetsClient.instance().batch_update_values(self.spreadsheet_id, data)
 
         logger.info("Pushed changes to Google Sheets")
         logger.info(deltas)
-        logger.info(self.table_current_state)
+        return deltas
   
 
 if __name__ == '__main__':
@@ -0,0 +1,60 @@
+import os
+import sys
+import re
+import random
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from TagParser import TagParser
+
+FORMAT = r'^[^,]+,[12345678]+,<[0-9a-fA-F]{4}>$' # previous ScannerDriver pattern
+
+def legacy_parse(data: bytes):
+    # Previous ScannerDriver path: decode, split, fullmatch and split every line
+    result = set()
+    buffer = data.decode('utf-8', errors='replace')
+    for line in buffer.split("\n"):
+        line = line.strip()
+        if bool(re.fullmatch(FORMAT, line)):
+            id, antenna, _ = line.split(",")
+            result.add((int(antenna), id))
+    return result
+
+def make_buffer(lines, tags = 500, antennas = 4, noise = 0.02, seed = 0):
+    """
+    Builds a scan window of `lines` reader lines over a population of `tags` EPCs,
+    with a fraction of truncated or garbage lines like the ones seen on a busy port.
+    """
+    rng = random.Random(seed)
+    epcs = [f"E28069950000{rng.getrandbits(48):012X}" for _ in range(tags // 2)]
+    epcs += [f"E2801160{rng.getrandbits(64):016X}" for _ in range(tags - len(epcs))]
+    out = []
+    for _ in range(lines):
+        line = f"{rng.choice(epcs)},{rng.randint(1, antennas)},<{rng.getrandbits(16):04X}>"
+        if rng.random() < noise:
+            line = line[:rng.randint(1, len(line) - 1)]
+        out.append(line + "\r\n")
+    return "".join(out).encode("ascii")
+
+def bench(lines, prefixes = None, repeat = 5):
+    data = make_buffer(lines)
+    parser = TagParser(prefixes)
+    view = memoryview(data)
+
+    expected = {(a, t) for a, t in legacy_parse(data)
+                if not prefixes or any(t.startswith(p) for p in prefixes)}
+    assert {(a, t.decode("ascii")) for a, t in parser.parse(view)} == expected
+
+    number = max(1, 20000 // lines)
+    legacy = min(timeit.repeat(lambda: legacy_parse(data), number=number, repeat=repeat)) / number
+    fast = min(timeit.repeat(lambda: parser.parse(view), number=number, repeat=repeat)) / number
+    return legacy, fast
+
+
+if __name__ == "__main__":
+    print(f"{'lines':>8} {'prefixes':>9} {'regex ms':>10} {'bytes ms':>10} {'lines/s':>12} {'speedup':>8}")
+    for lines in (100, 1000, 10000, 50000):
+        for prefixes in (None, ["E28069950000"]):
+            legacy, fast = bench(lines, prefixes)
+            print(f"{lines:>8} {'yes' if prefixes else 'no':>9} {legacy * 1e3:>10.3f} {fast * 1e3:>10.3f} "
+                  f"{lines / fast:>12.0f} {legacy / fast:>7.1f}x")
@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import time
+import tempfile
+
+MANAGEMENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management")
+sys.path.insert(0, MANAGEMENT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+# Time from constructor entry until the window is shown, in seconds
+BUDGET = float(os.getenv("STARTUP_BUDGET", 1.0))
+
+def measure_startup():
+    """
+    Starts the application without network, reader or local mirror in a scratch
+    directory and returns its startup_timings plus the module import time.
+    Background stages fail fast here (no credentials, no zebra.conf, no serial port),
+    only the time until the window is shown is budgeted.
+    """
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        app = QApplication.instance() or QApplication([])
+        start = time.time()
+        from management_main import GoogleSheetTableApp
+        imported = time.time() - start
+
+        window = GoogleSheetTableApp("benchmark", "Sheet1", {"auto_save": False})
+        window.show()
+        app.processEvents()
+        timings = dict(window.startup_timings)
+        timings["import"] = imported
+
+        window.scanner.stop()
+        window.threadpool.waitForDone(10000)
+        return timings
+    finally:
+        os.chdir(cwd)
+
+def test_startup_budget():
+    timings = measure_startup()
+    assert timings["window"] < BUDGET, f"window shown after {timings['window']:.3f} s, budget {BUDGET} s"
+
+
+if __name__ == "__main__":
+    timings = measure_startup()
+    print(json.dumps({stage: round(t, 4) for stage, t in timings.items()}, indent=4))
+    if timings["window"] > BUDGET:
+        print(f"Startup budget of {BUDGET} s exceeded")
+        sys.exit(1)
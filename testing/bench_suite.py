@@ -0,0 +1,250 @@
+"""
+Benchmarks of the scanner and sync hot paths, without hardware or network.
+Every case reports the best time per call over several repeats and, when it
+makes sense, a throughput. Results are written as JSON so runs of two versions
+can be compared:
+    python bench_suite.py --output after.json --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import timeit
+import argparse
+import platform
+import subprocess
+
+MANAGEMENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management")
+sys.path.insert(0, MANAGEMENT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QApplication, QTableView
+from bench_parser import make_buffer
+from TagParser import TagParser
+from TagTable import TagTable, FilterMethod
+from ReaderBackend import ReaderBackend
+from ScannerDriver import ScannerDriver
+from SheetTableModel import SheetTableModel
+from SR681Backend import FrameParser
+import SheetDeltas
+
+TAG_COUNTS = (1000, 10000, 100000)
+
+class FixedBackend(ReaderBackend):
+    """
+    Reader stand-in returning a precomputed detection set for every window.
+    """
+    protocol = "bench"
+
+    def __init__(self, detections):
+        self.detections = detections
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def take_window(self, duration):
+        return self.detections
+
+    def restart_window(self):
+        pass
+
+    def recent(self, since):
+        return self.detections
+
+    def wait_for_data(self, timeout):
+        pass
+
+def best(fn, number, repeat = 5):
+    # Best time per call, the minimum is the least disturbed by the rest of the machine
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+def detections(tags, antennas = 4, seen = 0.9, seed = 0):
+    """
+    Detection sets of four scans over `tags` tracked tags spread over the antennas,
+    each seen with probability `seen` like a shelf with some missed reads.
+    Tags are interned IDs, as the reader backends produce them.
+    """
+    rng = random.Random(seed)
+    return [{(tag % antennas, tag) for tag in range(tags) if rng.random() < seen} for _ in range(4)]
+
+def bench_parse():
+    results = {}
+    for lines in (1000, 10000, 50000):
+        data = memoryview(make_buffer(lines))
+        for name, parser in (("all", TagParser()), ("prefix", TagParser(["E28069950000"]))):
+            seconds = best(lambda: parser.parse(data), max(1, 20000 // lines))
+            results[f"zebra_{name}_{lines}"] = {"seconds": seconds, "lines_per_second": lines / seconds}
+
+    rng = random.Random(0)
+    frames = b""
+    for _ in range(10000):
+        payload = bytes((rng.randint(1, 4), 0xC8)) + rng.getrandbits(96).to_bytes(12, "big")
+        frame = b"\xCC\xFF\xFF\x20\x00" + bytes((len(payload),)) + payload
+        frames += frame + bytes(((-sum(frame)) & 0xFF,))
+    seconds = best(lambda: FrameParser().feed(frames), 3)
+    results["sr681_10000"] = {"seconds": seconds, "frames_per_second": 10000 / seconds}
+    return results
+
+def bench_tracker_update():
+    results = {}
+    for tags in TAG_COUNTS:
+        scans = detections(tags)
+        for method in FilterMethod:
+            table = TagTable(4, 3)
+            for scan in scans:
+                table.update(scan, method, method)
+            index = iter(range(1 << 30))
+            seconds = best(lambda: table.update(scans[next(index) % len(scans)], method, method),
+                           max(1, 20000 // tags))
+            results[f"{method}_{tags}"] = {"seconds": seconds, "tags_per_second": tags / seconds}
+    return results
+
+def bench_tracker_churn():
+    # Shelf tags plus 200 stray tags passing by each scan, the cap keeps evicting the oldest strays
+    results = {}
+    for tags in TAG_COUNTS:
+        shelf = detections(tags)
+        table = TagTable(4, 3, max_tags=tags + 400)
+        index = iter(range(1 << 30))
+
+        def update():
+            scan = next(index)
+            strays = {(stray % 4, tags + scan * 200 + stray) for stray in range(200)}
+            table.update(shelf[scan % len(shelf)] | strays, FilterMethod.WindowLPF, FilterMethod.WindowLPF)
+        for _ in range(10):
+            update()
+        seconds = best(update, max(1, 20000 // tags))
+        results[f"WindowLPF_{tags}"] = {"seconds": seconds, "tags_per_second": tags / seconds, "tracked": len(table)}
+    return results
+
+def bench_scan_cycle():
+    # Full ScannerDriver._scan: window, antenna filtering, tracker update and result emission
+    results = {}
+    for tags in TAG_COUNTS:
+        scans = detections(tags)
+        driver = ScannerDriver(None, device="bench", antenna_count=4, scan_time=0,
+                               backend=FixedBackend(scans[0]))
+        driver.change_filter_method(FilterMethod.HMMViterbi)
+        index = iter(range(1 << 30))
+
+        def cycle():
+            driver.backend.detections = scans[next(index) % len(scans)]
+            driver._scan()
+        cycle()
+        seconds = best(cycle, max(1, 20000 // tags))
+        results[f"HMMViterbi_{tags}"] = {"seconds": seconds, "tags_per_second": tags / seconds}
+    return results
+
+def sheet(rows, columns = 6):
+    return [["Drawer", "Count"] + [f"Column {c}" for c in range(columns - 2)]] + \
+           [[str(r), str(r % 17)] + [f"item {r}.{c}" for c in range(columns - 2)] for r in range(rows)]
+
+def bench_load_table():
+    app = QApplication.instance() or QApplication([])
+    results = {}
+    for rows in (100, 1000, 10000, 50000):
+        data = sheet(rows)
+        model = SheetTableModel(QColor("white"), QColor("red"))
+        view = QTableView()
+        view.setModel(model)
+        seconds = best(lambda: (model.load(data), app.processEvents()), 3, repeat=3)
+        results[f"rows_{rows}"] = {"seconds": seconds, "rows_per_second": rows / seconds}
+    return results
+
+def bench_push_payload():
+    # SheetDeltas encoding and chunking of push_sheets, for drawer counts and scattered edits
+    results = {}
+    rng = random.Random(0)
+    for cells in (10, 1000, 10000, 100000):
+        column = {(row, 1): str(row % 17) for row in range(cells)}
+        scattered = {(rng.randrange(cells * 4), rng.randrange(6)): "x" for _ in range(cells)}
+        for name, deltas in (("column", column), ("scattered", scattered)):
+            seconds = best(lambda: SheetDeltas.chunk(SheetDeltas.encode("Sheet1", deltas)), max(1, 20000 // cells),
+                           repeat = 5 if cells < 10000 else 2)
+            payload = len(json.dumps(SheetDeltas.encode("Sheet1", deltas)))
+            results[f"{name}_{cells}"] = {"seconds": seconds, "cells_per_second": cells / seconds,
+                                          "payload_bytes": payload}
+    return results
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "tracker_update": bench_tracker_update,
+    "tracker_churn": bench_tracker_churn,
+    "scan_cycle": bench_scan_cycle,
+    "load_table": bench_load_table,
+    "push_payload": bench_push_payload,
+}
+
+def revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=MANAGEMENT,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run(names):
+    results = {"meta": {"revision": revision(), "python": platform.python_version(),
+                        "machine": platform.machine(), "platform": platform.platform(),
+                        "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+               "results": {}}
+    for name in names:
+        start = time.perf_counter()
+        results["results"][name] = BENCHMARKS[name]()
+        print(f"{name}: {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return results
+
+def compare(current, baseline, threshold):
+    """
+    Returns (case, baseline seconds, current seconds) for every case slower than
+    baseline by more than threshold (0.2 = 20 %).
+    """
+    regressions = []
+    for group, cases in current["results"].items():
+        for case, result in cases.items():
+            before = baseline.get("results", {}).get(group, {}).get(case)
+            if before and result["seconds"] > before["seconds"] * (1 + threshold):
+                regressions.append((f"{group}.{case}", before["seconds"], result["seconds"]))
+    return regressions
+
+def test_benchmarks_run():
+    # Smoke run of the smallest cases, keeps the suite working as the code changes
+    global TAG_COUNTS
+    TAG_COUNTS, counts = (1000,), TAG_COUNTS
+    try:
+        results = run(["tracker_update", "scan_cycle"])
+    finally:
+        TAG_COUNTS = counts
+    assert results["results"]["scan_cycle"]["HMMViterbi_1000"]["seconds"] > 0
+    assert not compare(results, results, 0)
+
+
+if __name__ == "__main__":
+    arguments = argparse.ArgumentParser(description="Scanner and sync benchmarks")
+    arguments.add_argument("benchmarks", nargs="*", help=f"subset of {', '.join(BENCHMARKS)}")
+    arguments.add_argument("--output", help="JSON file for the results, stdout if omitted")
+    arguments.add_argument("--compare", help="JSON results of a baseline run")
+    arguments.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as regression")
+    options = arguments.parse_args()
+    unknown = set(options.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        arguments.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = run(options.benchmarks or list(BENCHMARKS))
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=4)
+    else:
+        print(json.dumps(results, indent=4))
+
+    if options.compare:
+        with open(options.compare, "r") as f:
+            regressions = compare(results, json.load(f), options.threshold)
+        for case, before, after in regressions:
+            print(f"Regression {case}: {before * 1e3:.3f} ms -> {after * 1e3:.3f} ms", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,99 @@
+import os
+import sys
+import pty
+import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from PyQt6.QtCore import Qt
+from GpioTrigger import GpioTrigger, MockGpioBackend
+from ScannerDriver import ScannerDriver
+
+DRAWER_LINE = 5
+TRIGGER_LINE = 17
+
+class MockReader(MockGpioBackend):
+    """
+    Mock GPIO wired to a fake reader on a pty: a trigger pulse makes it send the tags
+    currently in its drawers, like a reader configured for GPI triggered reads.
+    """
+    def __init__(self, master, drawers):
+        super().__init__()
+        self.master = master
+        self.drawers = drawers      # antenna -> list of EPCs
+
+    def write(self, line, level):
+        super().write(line, level)
+        if line == TRIGGER_LINE and level == 1:
+            frames = b"".join(b"%s,%d,<1234>\r\n" % (epc, antenna)
+                              for antenna, epcs in self.drawers.items() for epc in epcs)
+            os.write(self.master, frames)
+
+    def pulses(self):
+        return sum(1 for _, line, level in self.writes if line == TRIGGER_LINE and level == 1)
+
+def test_edge_schedules_focused_burst():
+    backend = MockGpioBackend()
+    trigger = GpioTrigger(backend, {DRAWER_LINE: [1, 2]}, burst_scans=3, background_interval=0.3)
+    backend.inject(DRAWER_LINE, 1)
+    assert [trigger.wait() for _ in range(3)] == [{1, 2}] * 3
+    # Burst done, the next scan is the full background one
+    start = time.monotonic()
+    assert trigger.wait() is None
+    assert 0.25 < time.monotonic() - start < 0.6
+    trigger.request()
+    assert trigger.wait() is None
+    trigger.stop()
+    assert trigger.wait() == set()
+
+def run_driver(scan_time = 0.2, idle = 1.5):
+    master, slave = pty.openpty()
+    reader = MockReader(master, {1: [b"E2800001", b"E2800002"]})
+    trigger = GpioTrigger(reader, {DRAWER_LINE: [1]}, trigger_line=TRIGGER_LINE, burst_scans=2, background_interval=60)
+    driver = ScannerDriver(None, device=os.ttyname(slave), antenna_count=4, scan_time=scan_time, trigger=trigger)
+    results = []
+    driver.signals.result.connect(lambda r: results.append((time.monotonic(), r)), Qt.ConnectionType.DirectConnection)
+    thread = threading.Thread(target=driver.run, daemon=True)
+    thread.start()
+    return driver, reader, results, thread
+
+def test_trigger_mode_scans_only_on_edges():
+    driver, reader, results, thread = run_driver()
+    try:
+        time.sleep(1.0)
+        # Idle shelf: no reads at all
+        assert reader.pulses() == 0 and results == []
+
+        edge = time.monotonic()
+        reader.inject(DRAWER_LINE, 1)
+        deadline = edge + 2
+        while not results and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert results, "no result after the drawer edge"
+        latency = results[0][0] - edge
+        assert results[0][1] == {1: 2}
+        assert latency < 2 * driver.scan_time
+
+        time.sleep(1.0)
+        # One burst of two focused scans, then idle again
+        assert reader.pulses() == 2
+        assert driver.trigger() is True
+        time.sleep(0.6)
+        assert reader.pulses() == 4
+    finally:
+        driver.stop()
+        thread.join(2)
+
+
+if __name__ == "__main__":
+    test_edge_schedules_focused_burst()
+    driver, reader, results, thread = run_driver()
+    time.sleep(5)
+    idle_pulses = reader.pulses()
+    edge = time.monotonic()
+    reader.inject(DRAWER_LINE, 1)
+    time.sleep(1)
+    driver.stop()
+    thread.join(2)
+    print(f"5 s idle: {idle_pulses} reads in trigger mode, {int(5 / driver.scan_time)} scan windows in continuous mode")
+    print(f"Drawer edge to result: {results[0][0] - edge:.3f} s (scan time {driver.scan_time} s)")
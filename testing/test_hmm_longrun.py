@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from TagTable import TagTable, FilterMethod, VITERBI_A, VITERBI_B, to_log, viterbi_step
+
+# Number of simulated scans, the default runs in seconds, set HMM_LONGRUN_SCANS=1000000 for the full long run
+SCANS = int(os.getenv("HMM_LONGRUN_SCANS", 50_000))
+TAGS = 64
+SEGMENT = 500       # scans between ground truth presence flips
+
+def simulate_detections(rng, truth):
+    # Present tags are read 90% of the time, absent tags produce 20% false reads (matches B)
+    p_detect = np.where(truth, VITERBI_B[0, 1], VITERBI_B[1, 1])
+    return rng.random(truth.shape) < p_detect
+
+def ground_truth(scan, offsets):
+    return ((scan + offsets) // SEGMENT) % 2 == 0
+
+def run_viterbi_steps():
+    """
+    Runs SCANS normalized log-domain Viterbi steps on TAGS tags, checks the scores
+    never degenerate and returns the fraction of decoded states matching the ground truth.
+    """
+    rng = np.random.default_rng(0)
+    offsets = rng.integers(0, SEGMENT, TAGS)
+    log_a = to_log(VITERBI_A)
+    log_b = to_log(VITERBI_B)
+    log_v = np.tile(to_log([0.05, 0.95]), (TAGS, 1))
+    correct = 0
+    for scan in range(SCANS):
+        truth = ground_truth(scan, offsets)
+        observed = simulate_detections(rng, truth).astype(np.intp)
+        log_v = viterbi_step(log_v, log_a, log_b[:, observed].T)
+        correct += np.count_nonzero((log_v[:, 0] >= log_v[:, 1]) == truth)
+    assert np.all(np.isfinite(log_v))
+    assert np.all(log_v.max(axis=1) == 0)
+    return correct / (SCANS * TAGS)
+
+def test_viterbi_step_stays_finite():
+    accuracy = run_viterbi_steps()
+    assert accuracy > 0.95, f"accuracy {accuracy:.4f}"
+
+def test_linear_domain_underflows():
+    """
+    Documents the failure mode fixed by the log-domain filter: the unnormalized
+    product for an absent tag collapses to zero within a few thousand scans and
+    argmax then always reports Present.
+    """
+    rng = np.random.default_rng(2)
+    v = np.array([0.05, 0.95])
+    for _ in range(10_000):
+        observed = int(simulate_detections(rng, np.array(False)))
+        v = np.max(v[:, None] * VITERBI_A * VITERBI_B[:, observed], axis=0)
+    assert np.all(v == 0) and np.argmax(v) == 0
+
+def test_tag_table_long_run():
+    """
+    Drives the full TagTable update for a tenth of SCANS and checks it keeps tracking
+    a tag that is present and then removed for long stretches.
+    """
+    rng = np.random.default_rng(1)
+    scans = max(SCANS // 10, 2 * SEGMENT)
+    table = TagTable(antenna_count = 1, window_size = 64)
+    key = (0, "E2801160600002089A6B3C11")
+    errors = 0
+    checked = 0
+    for scan in range(scans):
+        truth = ground_truth(scan, 0)
+        detected = {key} if simulate_detections(rng, np.array(truth)) else set()
+        table.update(detected, FilterMethod.HMMViterbi, FilterMethod.HMMViterbi)
+        if key in table.index:
+            row = table.index[key]
+            assert np.all(np.isfinite(table.viterbi[row]))
+            # Skip the first scans after each flip while the filter settles
+            if scan % SEGMENT >= 10:
+                checked += 1
+                errors += bool(table.state[row]) != truth
+    assert checked > 0
+    assert errors / checked < 0.05, f"error rate {errors / checked:.4f}"
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    test_linear_domain_underflows()
+    print("Linear domain recursion underflows as expected")
+    accuracy = run_viterbi_steps()
+    print(f"{SCANS} scans x {TAGS} tags: accuracy {accuracy:.4f}")
+    test_tag_table_long_run()
+    print(f"TagTable long run passed in {time.perf_counter() - start:.1f} s")
@@ -0,0 +1,67 @@
+import os
+import sys
+import pstats
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from Profiling import ProfileSession
+from ReplayBackend import ReplayBackend
+from ScannerDriver import ScannerDriver
+from test_replay import write_capture
+
+def test_profile_call_with_memory(tmp_path):
+    session = ProfileSession("build", memory=True, directory=str(tmp_path))
+    assert session.run(lambda: len([str(i) for i in range(10000)])) == 10000
+    summary = session.summary()
+    assert "<listcomp>" in summary or "<lambda>" in summary
+    assert "Top allocations" in summary
+    paths = session.save()
+    assert [os.path.splitext(path)[1] for path in paths] == [".pstats", ".tracemalloc"]
+    assert pstats.Stats(paths[0]).total_calls > 0
+
+def test_profile_running_scanner(tmp_path):
+    path = str(tmp_path / "shelf.cap")
+    write_capture(path, seconds=600)
+    driver = ScannerDriver(None, device=path, scan_time=3, backend=ReplayBackend(path, speed=100))
+    thread = threading.Thread(target=driver.run, daemon=True)
+    thread.start()
+    session = ProfileSession("scanner", directory=str(tmp_path))
+    session.start()
+    done = driver.profile(session.profiler(), 0.3)
+    assert done.wait(5)
+    session.stop()
+    driver.stop()
+    thread.join(5)
+    assert "_scan" in session.summary()
+
+class BusyProfiler(object):
+    # Python 3.12+ behaviour when another profiler is already enabled
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+def test_one_session_at_a_time(tmp_path):
+    first = ProfileSession("first", directory=str(tmp_path))
+    first.start()
+    try:
+        second = ProfileSession("second", directory=str(tmp_path))
+        try:
+            second.start()
+            assert False, "second session started"
+        except RuntimeError:
+            pass
+    finally:
+        first.stop()
+    assert second.run(lambda: 1) == 1
+
+def test_failed_enable_keeps_scanning(tmp_path):
+    path = str(tmp_path / "shelf.cap")
+    write_capture(path, seconds=600)
+    driver = ScannerDriver(None, device=path, scan_time=3, backend=ReplayBackend(path, speed=100))
+    thread = threading.Thread(target=driver.run, daemon=True)
+    thread.start()
+    done = driver.profile(BusyProfiler(), 0.3)
+    assert done.wait(5)
+    # The scan loop survived the failed enable()
+    assert thread.is_alive()
+    driver.stop()
+    thread.join(5)
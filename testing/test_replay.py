@@ -0,0 +1,113 @@
+import os
+import sys
+import pty
+import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from PyQt6.QtCore import Qt
+from ReaderBackend import ZebraBackend
+from ReplayBackend import ReplayBackend
+from SerialCapture import CaptureWriter, CaptureReader
+from ScannerDriver import ScannerDriver
+from TagTable import FilterMethod
+
+def write_capture(path, seconds = 60, interval = 0.5):
+    # Synthetic Zebra stream: two tags on antenna 1, a third one leaving antenna 2 halfway
+    capture = CaptureWriter(path, "zebra", "/dev/null")
+    for i in range(int(seconds / interval)):
+        lines = b"E2800001,1,<1234>\r\nE2800002,1,<1234>\r\n"
+        if i * interval < seconds / 2:
+            lines += b"E2800003,2,<1234>\r\n"
+        capture.write(i * interval, lines)
+    capture.close()
+
+def replay(path, speed = 0, method = FilterMethod.WindowLPF):
+    backend = ReplayBackend(path, speed=speed)
+    driver = ScannerDriver(None, device=path, antenna_count=4, scan_time=3, backend=backend)
+    driver.change_filter_method(method)
+    changes = []
+    # The driver's own return value arrives as a final None result
+    driver.signals.result.connect(lambda result: result and changes.append(result), Qt.ConnectionType.DirectConnection)
+    start = time.monotonic()
+    driver.run()
+    return changes, backend, time.monotonic() - start
+
+def test_record_live_session(tmp_path):
+    master, slave = pty.openpty()
+    path = str(tmp_path / "live.cap.gz")
+    backend = ZebraBackend(os.ttyname(slave))
+    backend.record(CaptureWriter(path, backend.protocol, os.ttyname(slave)))
+    backend.open()
+    try:
+        time.sleep(0.3)
+        os.write(master, b"E2800001,1,<1234>\r\n")
+        time.sleep(0.2)
+        os.write(master, b"E2800002,2,<1234>\r\n")
+        time.sleep(0.3)
+    finally:
+        backend.close()
+    with CaptureReader(path) as capture:
+        assert capture.protocol == "zebra"
+        chunks = list(capture)
+    assert b"".join(chunk for _, chunk in chunks) == b"E2800001,1,<1234>\r\nE2800002,2,<1234>\r\n"
+    assert 0.1 < chunks[-1][0] < 0.4
+
+def test_line_split_across_windows():
+    master, slave = pty.openpty()
+    backend = ZebraBackend(os.ttyname(slave))
+    backend.open()
+    try:
+        # Opening the port flushes its input, wait until the session receives before writing
+        while not backend.session.peek(0):
+            os.write(master, b"\r\n")
+            backend.wait_for_data(0.05)
+        backend.restart_window()
+        os.write(master, b"E2800001,1,<1234>\r\nE2800")
+        first = backend.take_window(0.3)
+        os.write(master, b"002,2,<1234>\r\n")
+        second = backend.take_window(0.3)
+    finally:
+        backend.close()
+    epcs = lambda tags: {(antenna, backend.tag_ids.epc(tag)) for antenna, tag in tags}
+    assert epcs(first) == {(1, b"E2800001")}
+    assert epcs(second) == {(2, b"E2800002")}
+
+def test_replay_keeps_lines_split_across_windows(tmp_path):
+    path = str(tmp_path / "split.cap")
+    capture = CaptureWriter(path, "zebra", "/dev/null")
+    # Capture time starts at the first chunk, the window boundary is at 3 s
+    capture.write(0.0, b"E2800001,1,<1234>\r\n")
+    capture.write(2.9, b"E2800001,1,<1234>\r\nE28000")
+    capture.write(3.1, b"02,2,<1234>\r\n")
+    capture.close()
+    backend = ReplayBackend(path, speed=0)
+    windows = [backend.take_window(3) for _ in range(2)]
+    assert [{(antenna, backend.tag_ids.epc(tag)) for antenna, tag in window} for window in windows] == \
+        [{(1, b"E2800001")}, {(2, b"E2800002")}]
+
+def test_replay_is_deterministic_and_fast(tmp_path):
+    path = str(tmp_path / "shelf.cap")
+    write_capture(path)
+    changes, backend, elapsed = replay(path)
+    assert backend.exhausted and backend.windows == 20
+    assert elapsed < 2
+    assert changes == replay(path)[0]
+    assert changes[0] == {1: 2, 2: 1} and changes[-1] == {2: 0}
+
+def test_replay_speed(tmp_path):
+    path = str(tmp_path / "shelf.cap")
+    write_capture(path, seconds=6)
+    changes, backend, elapsed = replay(path, speed=10)
+    # 6 s of capture at 10x
+    assert 0.5 < elapsed < 1.2
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "day.cap.gz")
+        # A day of reads every half second
+        write_capture(path, seconds=24 * 3600)
+        for method in FilterMethod:
+            changes, backend, elapsed = replay(path, method=method)
+            print(f"{method}: {backend.windows} windows replayed in {elapsed:.2f} s, {len(changes)} change sets")
@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from SheetDeltas import column_letter, a1_range, encode, chunk
+
+def legacy_encode(sheet_name, deltas):
+    # One range per cell, as push_sheets built them before
+    return [{"range": f"{sheet_name}!{chr(65 + column + 1)}{row + 2}", "values": [[value]]}
+            for (row, column), value in deltas.items()]
+
+def per_cell_encode(sheet_name, deltas):
+    # One range per cell with correct column letters, the worst case for encode()
+    return [{"range": a1_range(sheet_name, row + 1, column + 1, row + 1, column + 1), "values": [[value]]}
+            for (row, column), value in deltas.items()]
+
+def parse_a1(cell):
+    letters = cell.rstrip("0123456789")
+    column = 0
+    for letter in letters:
+        column = column * 26 + ord(letter) - 64
+    return int(cell[len(letters):]) - 1, column - 1
+
+def decode(data):
+    # Expands value ranges back to {(sheet row, sheet column): value}
+    cells = {}
+    for value_range in data:
+        cell_range = value_range["range"].rsplit("!", 1)[1]
+        top, left = parse_a1(cell_range.split(":")[0])
+        for r, row in enumerate(value_range["values"]):
+            for c, value in enumerate(row):
+                cells[(top + r, left + c)] = value
+    return cells
+
+def test_column_letters():
+    assert [column_letter(i) for i in (0, 25, 26, 51, 52, 701, 702, 16383)] == \
+        ["A", "Z", "AA", "AZ", "BA", "ZZ", "AAA", "XFD"]
+    assert a1_range("Sheet1", 1, 26, 4, 27) == "Sheet1!AA2:AB5"
+    assert a1_range("My sheet", 0, 0, 0, 0) == "'My sheet'!A1"
+
+def test_column_update_is_one_range():
+    deltas = {(row, 0): str(row) for row in range(500)}
+    data = encode("Sheet1", deltas)
+    assert data == [{"range": "Sheet1!B2:B501", "values": [[str(row)] for row in range(500)]}]
+
+def test_round_trip():
+    rng = random.Random(0)
+    for _ in range(200):
+        deltas = {(rng.randrange(40), rng.randrange(40)): str(rng.randrange(100)) for _ in range(rng.randrange(1, 300))}
+        data = encode("Sheet1", deltas)
+        assert decode(data) == {(row + 1, column + 1): value for (row, column), value in deltas.items()}
+        assert len(json.dumps(data)) <= len(json.dumps(per_cell_encode("Sheet1", deltas)))
+
+def test_chunking():
+    deltas = {(row, column): "x" * 10 for row in range(0, 2000, 2) for column in range(0, 40, 2)}
+    data = encode("Sheet1", deltas)
+    chunks = chunk(data, max_bytes=50_000, max_cells=5_000)
+    assert len(chunks) > 1
+    assert [value_range for part in chunks for value_range in part] == data
+    for part in chunks:
+        assert len(json.dumps(part)) <= 50_000
+        assert sum(len(row) for value_range in part for row in value_range["values"]) <= 5_000
+
+
+if __name__ == "__main__":
+    deltas = {(row, 0): str(row) for row in range(500)}
+    legacy, merged = legacy_encode("Sheet1", deltas), encode("Sheet1", deltas)
+    print(f"Full column of 500 cells: {len(legacy)} ranges, {len(json.dumps(legacy))} bytes before, "
+          f"{len(merged)} ranges, {len(json.dumps(merged))} bytes now")
+    test_column_letters()
+    test_column_update_is_one_range()
+    test_round_trip()
+    test_chunking()
+    print("All tests passed")
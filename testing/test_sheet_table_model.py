@@ -0,0 +1,80 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from PyQt6.QtCore import Qt
+from SheetTableModel import SheetTableModel
+
+HIGHLIGHT, CONFLICT = "highlight", "conflict"
+
+def sheet(values):
+    # Sheet rows as fetched: header row and header column around the values
+    columns = len(values[0]) if values else 0
+    return [[""] + [f"C{c}" for c in range(columns)]] + [[f"R{r}"] + list(row) for r, row in enumerate(values)]
+
+def loaded(values):
+    model = SheetTableModel(HIGHLIGHT, CONFLICT)
+    model.load(sheet(values))
+    return model
+
+def test_remote_change_to_dirty_cell_conflicts():
+    model = loaded([["1", "2"], ["3", "4"]])
+    model.set_cells({(0, 0): "10"})
+    conflicts = model.apply_remote(sheet([["5", "2"], ["3", "4"]]))
+    # The local edit is kept, still unsaved, and flagged against the sheet value
+    assert conflicts == [(0, 0, "10", "5")]
+    assert model.current[0, 0] == "10" and model.initial[0, 0] == "5"
+    assert model.conflicts == {(0, 0): "5"}
+    index = model.index(0, 0)
+    assert model.data(index, Qt.ItemDataRole.BackgroundRole) == CONFLICT
+    assert model.data(index, Qt.ItemDataRole.ForegroundRole) == HIGHLIGHT
+
+    # Editing the cell again resolves the conflict
+    model.set_cells({(0, 0): "11"})
+    assert model.conflicts == {}
+
+def test_remote_change_to_clean_cell_is_taken():
+    model = loaded([["1", "2"], ["3", "4"]])
+    model.set_cells({(0, 0): "10"})
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, roles: changed.append((top.row(), top.column())))
+    conflicts = model.apply_remote(sheet([["1", "2"], ["3", "40"]]))
+    assert conflicts == [] and model.conflicts == {}
+    assert model.current[1, 1] == "40" and model.initial[1, 1] == "40"
+    assert model.data(model.index(1, 1), Qt.ItemDataRole.ForegroundRole) is None
+    # Only the cell that changed remotely is repainted, the local edit is untouched
+    assert changed == [(1, 1)] and model.current[0, 0] == "10"
+
+    # A remote change to the value edited here is no conflict either
+    assert model.apply_remote(sheet([["10", "2"], ["3", "40"]])) == []
+    assert model.dirty_cells().size == 0
+
+def test_remote_resize():
+    model = loaded([["1", "2"], ["3", "4"]])
+    model.set_cells({(1, 0): "30"})
+    signals = []
+    model.rowsInserted.connect(lambda parent, first, last: signals.append(("rows+", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: signals.append(("rows-", first, last)))
+    model.columnsInserted.connect(lambda parent, first, last: signals.append(("columns+", first, last)))
+    model.columnsRemoved.connect(lambda parent, first, last: signals.append(("columns-", first, last)))
+
+    # Grows by a row and a column: new cells come from the sheet as they are
+    assert model.apply_remote(sheet([["1", "2", "x"], ["3", "4", "y"], ["5", "6", "z"]])) == []
+    assert signals == [("rows+", 2, 2), ("columns+", 2, 2)]
+    assert (model.rowCount(), model.columnCount()) == (3, 3)
+    assert list(model.current[2]) == ["5", "6", "z"] and list(model.current[:, 2]) == ["x", "y", "z"]
+    assert model.current[1, 0] == "30" and model.headerData(2, Qt.Orientation.Vertical) == "R2"
+
+    # Shrinks to one row and one column: the edit in the dropped row is reported lost
+    signals.clear()
+    conflicts = model.apply_remote(sheet([["1"]]))
+    assert conflicts == [(1, 0, "30", None)]
+    assert signals == [("rows-", 1, 2), ("columns-", 1, 2)]
+    assert (model.rowCount(), model.columnCount()) == (1, 1)
+    assert model.current.shape == model.initial.shape == (1, 1) and model.dirty_cells().size == 0
+
+if __name__ == "__main__":
+    test_remote_change_to_dirty_cell_conflicts()
+    test_remote_change_to_clean_cell_is_taken()
+    test_remote_resize()
+    print("Sheet table model OK")
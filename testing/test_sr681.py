@@ -0,0 +1,91 @@
+import os
+import sys
+import pty
+import time
+import select
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from SR681Backend import SR681Backend, FrameParser, encode_request, checksum, CMD_INVENTORY
+
+READ = [0x7C,0xFF,0xFF,0x20,0x00,0x00,0x66]
+
+def response(command, data = b"", status = 0x00):
+    frame = b"\xCC\xFF\xFF" + bytes((command, status, len(data))) + data
+    return frame + bytes((checksum(frame),))
+
+def tag(antenna, epc):
+    return response(CMD_INVENTORY, bytes((antenna, 0xC8)) + epc)
+
+class FakeReader(threading.Thread):
+    """
+    SR681 stand-in on a pty: answers every inventory request with the tags of the
+    requested antenna (all antennas for a plain read) and an empty closing frame.
+    """
+    def __init__(self, master, drawers):
+        super().__init__(daemon=True)
+        self.master = master
+        self.drawers = drawers      # antenna -> list of EPC bytes
+        self.requests = []
+        self.stop_flag = False
+
+    def run(self):
+        buffer = b""
+        while not self.stop_flag:
+            if not select.select([self.master], [], [], 0.05)[0]:
+                continue
+            buffer += os.read(self.master, 1024)
+            while len(buffer) >= 7:
+                length = 7 + buffer[5]
+                if len(buffer) < length:
+                    break
+                request, buffer = buffer[:length], buffer[length:]
+                self.requests.append(request)
+                antennas = [request[6]] if request[5] else list(self.drawers)
+                frames = b"".join(tag(antenna, epc) for antenna in antennas for epc in self.drawers.get(antenna, []))
+                os.write(self.master, frames + response(CMD_INVENTORY))
+
+def test_request_encoding():
+    assert encode_request(CMD_INVENTORY) == bytes(READ)
+    assert checksum(READ[:-1]) == 0x66
+    frame = encode_request(CMD_INVENTORY, b"\x02")
+    assert frame[:7] == bytes([0x7C, 0xFF, 0xFF, 0x20, 0x00, 0x01, 0x02]) and sum(frame) & 0xFF == 0
+
+def test_parser_split_frames_and_resync():
+    parser = FrameParser()
+    stream = b"\x00\x13" + tag(1, b"\xE2\x80\x01") + tag(2, b"\xE2\x80\x02") + response(CMD_INVENTORY)
+    frames = []
+    for i in range(len(stream)):
+        frames += parser.feed(stream[i:i + 1])
+    assert frames == [(CMD_INVENTORY, 0, b"\x01\xC8\xE2\x80\x01"), (CMD_INVENTORY, 0, b"\x02\xC8\xE2\x80\x02"),
+                      (CMD_INVENTORY, 0, b"")]
+
+    corrupted = bytearray(tag(1, b"\xE2\x80\x01"))
+    corrupted[-2] ^= 0xFF
+    frames = parser.feed(bytes(corrupted) + tag(3, b"\xE2\x80\x03"))
+    assert frames == [(CMD_INVENTORY, 0, b"\x03\xC8\xE2\x80\x03")]
+    assert parser.checksum_errors == 1
+
+def test_backend_windows_and_per_antenna_polling():
+    master, slave = pty.openpty()
+    reader = FakeReader(master, {1: [b"\xE2\x80\x00\x01", b"\x30\x00\x00\x09"], 2: [b"\xE2\x80\x00\x02"]})
+    reader.start()
+    backend = SR681Backend(os.ttyname(slave), antennas=[1, 2], epc_prefixes=["E280"])
+    backend.open()
+    try:
+        backend.take_window(0.2)
+        detected = backend.take_window(0.3)
+        assert {(antenna, backend.tag_ids.epc(tag)) for antenna, tag in detected} == {(1, b"E2800001"), (2, b"E2800002")}
+        assert backend.recent(time.monotonic() - 0.2)
+        # Both antennas polled in turn, up to pipeline_depth requests in flight
+        assert {request[6] for request in reader.requests} == {1, 2}
+        assert backend.rounds > 2 and backend.parser.checksum_errors == 0
+    finally:
+        backend.close()
+        reader.stop_flag = True
+
+if __name__ == "__main__":
+    test_request_encoding()
+    test_parser_split_frames_and_resync()
+    test_backend_windows_and_per_antenna_polling()
+    print("SR681 backend OK")
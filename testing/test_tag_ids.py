@@ -0,0 +1,103 @@
+import os
+import sys
+import random
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from TagIds import TagInterner
+from TagTable import TagTable, FilterMethod
+
+def test_intern_and_sweep():
+    interner = TagInterner()
+    first = interner.intern(b"E2800001")
+    assert interner.intern(b"E2800001") == first and interner.epc(first) == b"E2800001"
+    interner.intern(b"E2800002")
+    # Nothing tracks them, both IDs are freed and reused
+    interner.sweep()
+    assert len(interner) == 0
+    # Freed IDs look stale from other threads
+    assert interner.lookup(first) is None
+    assert interner.intern(b"E2800003") in (0, 1) and len(interner.epcs) == 2
+
+def test_table_references():
+    interner = TagInterner()
+    table = TagTable(2, window_size=2, interner=interner)
+    tag = interner.intern(b"E2800001")
+    table.update({(0, tag), (1, tag)}, FilterMethod.NoFiltering, FilterMethod.NoFiltering)
+    interner.sweep()
+    assert interner.references[tag] == 2 and table.epc(tag) == b"E2800001"
+
+    # Tracked on one antenna only after the other window empties
+    for _ in range(2):
+        table.update({(0, tag)}, FilterMethod.NoFiltering, FilterMethod.NoFiltering)
+    assert interner.references[tag] == 1
+    for _ in range(2):
+        table.update(set(), FilterMethod.NoFiltering, FilterMethod.NoFiltering)
+    assert len(table) == 0 and len(interner) == 0
+
+def test_wheel_expiry_matches_window():
+    # Churn of stray tags with focused scans: rows expire exactly when their window empties
+    rng = random.Random(3)
+    table = TagTable(3, window_size=4)
+    windows = {}        # key -> detection window bits, the reference
+    for _ in range(300):
+        antennas = None if rng.random() < 0.7 else {rng.randrange(3)}
+        detected = {(rng.randrange(3), rng.randrange(40)) for _ in range(rng.randrange(12))}
+        table.update(detected, FilterMethod.WindowLPF, FilterMethod.WindowLPF, antennas)
+        for key in set(windows) | detected:
+            if antennas is None or key[0] in antennas:
+                windows[key] = ((windows.get(key, 0) << 1) | (key in detected)) & 0b1111
+        windows = {key: bits for key, bits in windows.items() if bits}
+        assert set(table.index) == set(windows)
+        active = np.flatnonzero(table.antenna[:table.size] >= 0)
+        assert len(active) == len(table) and np.all(table.history[active] != 0)
+
+def test_cap_evicts_least_recently_seen():
+    interner = TagInterner()
+    table = TagTable(1, window_size=8, interner=interner, max_tags=3)
+    for epc in [b"A", b"B", b"C"]:
+        table.update({(0, interner.intern(epc))}, FilterMethod.NoFiltering, FilterMethod.NoFiltering)
+    table.update({(0, interner.intern(b"A")), (0, interner.intern(b"D"))}, FilterMethod.NoFiltering,
+                 FilterMethod.NoFiltering)
+    interner.sweep()
+    # B was seen longest ago, its row and ID are gone
+    assert table.evicted == 1 and len(table) == 3
+    assert sorted(interner.epc(key[1]) for key in table.keys if key is not None) == [b"A", b"C", b"D"]
+    assert b"B" not in interner.ids
+
+    # More new tags in one scan than the cap: only max_tags of them are tracked
+    table.update({(0, interner.intern(bytes([i]))) for i in range(10)}, FilterMethod.NoFiltering,
+                 FilterMethod.NoFiltering)
+    interner.sweep()
+    assert len(table) == 3 and len(interner) == 3
+
+def test_eviction_changes_counts():
+    # Evicting a present tag lowers its antenna's count, the antenna must be reported
+    table = TagTable(1, 3, max_tags=2)
+    table.update({(0, 1), (0, 2)}, FilterMethod.NoFiltering, FilterMethod.NoFiltering)
+    table.update({(0, 1), (0, 2)}, FilterMethod.NoFiltering, FilterMethod.NoFiltering)
+    table.update({(0, 2)}, FilterMethod.WindowLPF, FilterMethod.NoFiltering)
+    changed, counts = table.update({(0, 2), (0, 3)}, FilterMethod.WindowLPF, FilterMethod.WindowLPF)
+    assert table.evicted == 1 and (0, 1) not in table.index
+    assert counts[0] == 1 and changed == {0}
+
+def test_expiry_of_present_tag_changes_counts():
+    # A sticky model keeps the tag Present after its window emptied, expiry must report the drop
+    table = TagTable(1, 3)
+    table.set_model(0, [[0.999, 0.001], [0.001, 0.999]], [[0.1, 0.9], [0.8, 0.2]])
+    for _ in range(20):
+        table.update({(0, 1)}, FilterMethod.HMMViterbi, FilterMethod.HMMViterbi)
+    counts = None
+    for _ in range(3):
+        changed, counts = table.update(set(), FilterMethod.HMMViterbi, FilterMethod.HMMViterbi)
+    assert len(table) == 0
+    assert counts[0] == 0 and changed == {0}
+
+if __name__ == "__main__":
+    test_intern_and_sweep()
+    test_table_references()
+    test_wheel_expiry_matches_window()
+    test_cap_evicts_least_recently_seen()
+    test_eviction_changes_counts()
+    test_expiry_of_present_tag_changes_counts()
+    print("Tag IDs OK")
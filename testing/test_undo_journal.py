@@ -0,0 +1,62 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from UndoJournal import UndoJournal
+
+def edit(i):
+    # Transaction i sets cell (i, 1) from str(i) to str(i + 1), and (0, 0) with it
+    return {(i, 1): (str(i), str(i + 1)), (0, 0): (f"a{i}", f"a{i + 1}")}
+
+def test_undo_redo_across_spill(tmp_path):
+    journal = UndoJournal(str(tmp_path / "undo.db"), memory_limit=4)
+    try:
+        for i in range(11):
+            journal.record(edit(i))
+        # Older transactions went to SQLite, newest stay in memory
+        assert journal.undo_stack.spilled > 0 and len(journal.undo_stack.memory) <= 4
+        assert len(journal.undo_stack) == 11
+
+        # Undo everything, past the spill point, newest first
+        for i in reversed(range(11)):
+            assert journal.undo() == {(i, 1): str(i), (0, 0): f"a{i}"}
+        assert journal.undo() is None
+        assert journal.redo_stack.spilled > 0
+
+        # Redo reads the redo history back from disk in order
+        for i in range(11):
+            assert journal.redo() == {(i, 1): str(i + 1), (0, 0): f"a{i + 1}"}
+        assert journal.redo() is None
+
+        # A new edit after undos clears the redo history, spilled part included
+        for _ in range(8):
+            journal.undo()
+        journal.record(edit(20))
+        assert len(journal.redo_stack) == 0 and journal.redo() is None
+        assert journal.undo() == {(20, 1): "20", (0, 0): "a20"}
+        assert journal.undo() == {(2, 1): "2", (0, 0): "a2"}
+    finally:
+        journal.close()
+
+def test_oldest_dropped_beyond_max(tmp_path):
+    journal = UndoJournal(str(tmp_path / "undo.db"), memory_limit=2, max_transactions=3)
+    try:
+        for i in range(10):
+            journal.record(edit(i))
+        undone = []
+        while True:
+            cells = journal.undo()
+            if cells is None:
+                break
+            undone.append(cells[(0, 0)])
+        # In memory plus at most max_transactions on disk, the newest ones
+        assert undone == [f"a{i}" for i in reversed(range(10 - len(undone), 10))]
+        assert len(undone) <= 2 + 3
+    finally:
+        journal.close()
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_undo_redo_across_spill(pathlib.Path(tempfile.mkdtemp()))
+    test_oldest_dropped_beyond_max(pathlib.Path(tempfile.mkdtemp()))
+    print("Undo journal OK")
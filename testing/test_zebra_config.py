@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "management"))
+from ZebraSerialConfig import ZebraSerialConfig, ZebraConfigError
+
+PASSWORD = "secret"
+
+class ReaderState(object):
+    def __init__(self, active_session = False, connect_delay = 3):
+        self.sessions = set()
+        self.active_session = active_session
+        self.connected = False
+        self.connect_polls = None   # polls left until the port reports connected
+        self.connect_delay = connect_delay
+        self.connect_clicks = 0
+
+class ReaderHandler(BaseHTTPRequestHandler):
+    """
+    Stand-in for the reader's web interface: a frameset with a Login frame until
+    logged in, then menuId and content frames; the serial port page has a
+    Connect/Disconnect button that takes a few page loads to change state.
+    """
+    def log_message(self, *args):
+        pass
+
+    def session(self):
+        cookie = self.headers.get("Cookie", "")
+        return cookie.split("session=", 1)[1].split(";")[0] if "session=" in cookie else None
+
+    def reply(self, html, cookie = None):
+        body = html.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        if cookie:
+            self.send_header("Set-Cookie", f"session={cookie}; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        logged_in = self.session() in state.sessions
+        if self.path == "/":
+            if logged_in:
+                self.reply('<frameset><frame id="menuId" src="/menu.html"><frame name="content" src="/blank.html"></frameset>')
+            else:
+                self.reply('<frameset><frame id="Login" src="/login.html"></frameset>')
+        elif self.path == "/login.html":
+            self.reply('<form action="/cgi-bin/login" method="post"><input type="hidden" name="lang" value="en">'
+                       '<input id="password" name="pwd" type="password">'
+                       '<button id="LoginId-button" name="login" value="1">Login</button></form>')
+        elif self.path == "/menu.html" and logged_in:
+            self.reply('<div id="v_mnu_01"><ul><li><a href="#">Communication</a></li></ul>'
+                       '<a id="SerialPortConfigLink" href="/serial.html" target="content">Serial Port</a></div>')
+        elif self.path == "/serial.html" and logged_in:
+            if state.connect_polls is not None:
+                state.connect_polls -= 1
+                if state.connect_polls <= 0:
+                    state.connected, state.connect_polls = True, None
+            label = "Disconnect" if state.connected else "Connect"
+            self.reply(f'<form action="/cgi-bin/serial" method="post"><input type="hidden" name="port" value="1">'
+                       f'<button id="btnLLRPConnect" name="action" value="{label.lower()}"> {label} </button></form>')
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        state = self.server.state
+        fields = urllib.parse.parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        if self.path == "/cgi-bin/login":
+            if fields.get("pwd") != [PASSWORD] or fields.get("lang") != ["en"]:
+                self.reply('<p>Wrong password</p><form action="/cgi-bin/login" method="post"><input id="password" name="pwd"></form>')
+            elif state.active_session:
+                self.reply('<p>Another session is active.</p><form action="/cgi-bin/takeover" method="post">'
+                           '<button name="ok" value="1">OK</button></form>')
+            else:
+                state.sessions.add("s1")
+                self.reply("<p>Logged in</p>", cookie="s1")
+        elif self.path == "/cgi-bin/takeover" and fields.get("ok") == ["1"]:
+            state.active_session = False
+            state.sessions = {"s2"}
+            self.reply("<p>Logged in</p>", cookie="s2")
+        elif self.path == "/cgi-bin/serial" and self.session() in state.sessions:
+            if fields.get("action") == ["connect"] and fields.get("port") == ["1"]:
+                state.connect_clicks += 1
+                state.connect_polls = state.connect_delay
+            self.reply("<p>OK</p>")
+        else:
+            self.send_error(403)
+
+def start_reader(**kwargs):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReaderHandler)
+    server.state = ReaderState(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+def test_connect():
+    server, url = start_reader()
+    try:
+        start = time.monotonic()
+        assert ZebraSerialConfig(url, PASSWORD).connect() is True
+        assert time.monotonic() - start < 1
+        assert server.state.connected and server.state.connect_clicks == 1
+        # Already connected, nothing is pressed again
+        assert ZebraSerialConfig(url, PASSWORD).connect() is False
+        assert server.state.connect_clicks == 1
+    finally:
+        server.shutdown()
+
+def test_active_session():
+    server, url = start_reader(active_session=True)
+    try:
+        assert ZebraSerialConfig(url, PASSWORD).connect() is True
+        assert server.state.sessions == {"s2"}
+    finally:
+        server.shutdown()
+
+def test_wrong_password():
+    server, url = start_reader()
+    try:
+        ZebraSerialConfig(url, "wrong").connect()
+        assert False, "login should fail"
+    except ZebraConfigError:
+        assert not server.state.connected
+    finally:
+        server.shutdown()
+
+def test_connect_timeout():
+    server, url = start_reader(connect_delay=1000)
+    try:
+        ZebraSerialConfig(url, PASSWORD, timeout=0.3).connect()
+        assert False, "connect should time out"
+    except ZebraConfigError:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_connect()
+    test_active_session()
+    test_wrong_password()
+    test_connect_timeout()
+    print("All tests passed")